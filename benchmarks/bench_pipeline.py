@@ -0,0 +1,164 @@
+"""End-to-end pipeline benchmark on the offline mock backends.
+
+Runs `YouTubeScriptGenerator.generate` for every video-length preset and
+section count with `LLM_BACKEND=mock` and `SEARCH_BACKEND=mock`, so results
+reflect orchestration (concurrency, caching, packing) rather than network
+noise. Reports wall time per stage, throughput and peak Python memory.
+
+    python benchmarks/bench_pipeline.py --sections 3 6 10 --json bench.json
+    python benchmarks/bench_pipeline.py --max-wall 5   # fail CI on regressions
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+VIDEO_LENGTHS = [
+    "TikTok/Shots/Reel (15-30 seconds)",
+    "10-15 min short video",
+    "20-30 min short video",
+]
+STAGES = {
+    "youtube_content_strategist": "Blueprint",
+    "research_analyst": "Research",
+    "youtube_script_architect": "Architect",
+    "youtube_script_writer": "Writer",
+    "youtube_description_writer": "Description",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, nargs="+", default=[3, 6, 10])
+    parser.add_argument("--lengths", nargs="+", default=VIDEO_LENGTHS)
+    parser.add_argument("--runs", type=int, default=1, help="repetitions per case")
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--completion-words", type=int, default=300)
+    parser.add_argument("--search-latency", type=float, default=0.1)
+    parser.add_argument("--result-chars", type=int, default=1500)
+    parser.add_argument("--json", help="write raw results to this file")
+    parser.add_argument(
+        "--max-wall", type=float, help="exit non-zero if any run exceeds this many seconds"
+    )
+    return parser.parse_args()
+
+
+def configure_environment(args, sections: int) -> None:
+    os.environ.update(
+        {
+            "LLM_BACKEND": "mock",
+            "SEARCH_BACKEND": "mock",
+            "LLM_CACHE_DISABLED": "1",
+            "SEARCH_CACHE_DISABLED": "1",
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "mock",
+            "YDC_API_KEY": os.getenv("YDC_API_KEY") or "mock",
+            "MOCK_LLM_LATENCY": str(args.llm_latency),
+            "MOCK_LLM_TOKEN_LATENCY": str(args.token_latency),
+            "MOCK_LLM_COMPLETION_WORDS": str(args.completion_words),
+            "MOCK_LLM_SECTIONS": str(sections),
+            "MOCK_SEARCH_LATENCY": str(args.search_latency),
+            "MOCK_SEARCH_RESULT_CHARS": str(args.result_chars),
+        }
+    )
+
+
+def run_case(video_length: str, sections: int, runs: int) -> dict:
+    from src import YouTubeScriptGenerator, YouTubeScriptInput
+    from src.baseLLM import LLMClientRegistry
+
+    # Mock settings are read when a client is built
+    LLMClientRegistry.close()
+
+    output = tempfile.mkdtemp(prefix="bench_")
+    generator = YouTubeScriptGenerator(path=output)
+    inputs = YouTubeScriptInput(
+        language="English",
+        tone="Educational",
+        video_length=video_length,
+        video_title="How transformers changed machine learning",
+        description=True,
+    )
+
+    walls, stage_walls = [], {stage: [] for stage in STAGES}
+    tracemalloc.start()
+    start = time.perf_counter()
+    for index in range(runs):
+        run_id = f"bench{index}"
+        generator.generate(inputs, script_uuid=run_id)
+        with open(Path(output) / run_id / "metrics.json") as file:
+            metrics = json.load(file)
+        walls.append(metrics["wall_time"])
+        for stage in STAGES:
+            stage_walls[stage].append(metrics["stages"].get(stage, {}).get("wall_time", 0.0))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "video_length": video_length,
+        "sections": sections,
+        "runs": runs,
+        "wall_time": sum(walls) / len(walls),
+        "stages": {stage: sum(v) / len(v) for stage, v in stage_walls.items()},
+        "throughput_runs_per_min": runs / elapsed * 60,
+        "peak_memory_mb": peak / 1024 / 1024,
+    }
+
+
+def print_report(results: list) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Pipeline benchmark (mock backends)")
+    table.add_column("Video length", no_wrap=True)
+    table.add_column("Sections")
+    for label in STAGES.values():
+        table.add_column(label)
+    table.add_column("Wall (s)")
+    table.add_column("Runs/min")
+    table.add_column("Peak MB")
+    for result in results:
+        table.add_row(
+            result["video_length"].split(" (")[0],
+            str(result["sections"]),
+            *(f"{result['stages'][stage]:.2f}" for stage in STAGES),
+            f"{result['wall_time']:.2f}",
+            f"{result['throughput_runs_per_min']:.1f}",
+            f"{result['peak_memory_mb']:.1f}",
+        )
+    Console().print(table)
+
+
+def main() -> int:
+    args = parse_args()
+    os.chdir(ROOT)
+    results = []
+    for video_length in args.lengths:
+        for sections in args.sections:
+            configure_environment(args, sections)
+            results.append(run_case(video_length, sections, args.runs))
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=4)
+
+    if args.max_wall is not None:
+        slow = [r for r in results if r["wall_time"] > args.max_wall]
+        if slow:
+            print(f"❌ {len(slow)} case(s) exceeded {args.max_wall}s")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
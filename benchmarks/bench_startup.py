@@ -0,0 +1,132 @@
+"""Startup (import time) benchmark for the package and its entry points.
+
+Imports each target in a fresh interpreter with `python -X importtime`,
+reports the median cumulative import time and the heaviest modules, and
+checks that none of the heavy LangChain/LangGraph dependencies are loaded
+before a pipeline stage actually needs them.
+
+    python benchmarks/bench_startup.py --runs 7 --top 10
+    python benchmarks/bench_startup.py --max-ms 300   # fail CI on regressions
+"""
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TARGETS = ["src", "src.main", "cli", "bulk"]
+# Must only be imported once a stage runs
+HEAVY_MODULES = [
+    "langgraph",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_community",
+    "openai",
+    "tiktoken",
+    "yaml",
+    "questionary",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--runs", type=int, default=5, help="interpreters per target")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list")
+    parser.add_argument("--json", help="write raw results to this file")
+    parser.add_argument(
+        "--max-ms", type=float, help="exit non-zero if any target imports slower than this"
+    )
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str) -> list:
+    """Returns (module, self_us, cumulative_us) for every `-X importtime` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(target: str, runs: int) -> dict:
+    totals, rows, loaded = [], [], []
+    script = (
+        f"import sys, json, {target}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        rows = parse_importtime(result.stderr)
+        # The target is the last top-level entry importtime reports
+        totals.append(next(c for name, _, c in reversed(rows) if name == target) / 1000)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+    heaviest = sorted(rows, key=lambda row: row[1], reverse=True)
+    return {
+        "target": target,
+        "median_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "heavy_modules_loaded": loaded,
+        "heaviest": [{"module": name, "self_ms": s / 1000} for name, s, _ in heaviest],
+    }
+
+
+def print_report(results: list, top: int) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Startup benchmark (python -X importtime)")
+    table.add_column("Target", no_wrap=True)
+    table.add_column("Median (ms)")
+    table.add_column("Min (ms)")
+    table.add_column("Heavy modules loaded")
+    table.add_column(f"Top {top} imports (self ms)")
+    for result in results:
+        table.add_row(
+            result["target"],
+            f"{result['median_ms']:.1f}",
+            f"{result['min_ms']:.1f}",
+            ", ".join(result["heavy_modules_loaded"]) or "none",
+            "\n".join(
+                f"{row['module']} {row['self_ms']:.1f}" for row in result["heaviest"][:top]
+            ),
+        )
+    Console().print(table)
+
+
+def main() -> int:
+    args = parse_args()
+    results = [measure(target, args.runs) for target in args.targets]
+    print_report(results, args.top)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=4)
+
+    failed = False
+    for result in results:
+        if result["heavy_modules_loaded"]:
+            print(f"❌ {result['target']} eagerly imports {result['heavy_modules_loaded']}")
+            failed = True
+        if args.max_ms is not None and result["median_ms"] > args.max_ms:
+            print(f"❌ {result['target']} took {result['median_ms']:.0f}ms (> {args.max_ms}ms)")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+from src import YouTubeScriptGenerator
+from src.bulk import BulkRunner
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generate many YouTube scripts from a JSONL job file."
+    )
+    parser.add_argument(
+        "jobs",
+        help="JSONL file, one object per line with language, tone, video_length, "
+        "video_title, description, optional languages (a list) and an optional job_id",
+    )
+    parser.add_argument("--output", default="scripts", help="output folder")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="pipelines running at once"
+    )
+    parser.add_argument(
+        "--manifest", help="status manifest path (default: <output>/bulk-<time>.json)"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    manifest = args.manifest or Path(args.output) / f"bulk-{time.strftime('%Y%m%d-%H%M%S')}.json"
+
+    runner = BulkRunner(
+        generator=YouTubeScriptGenerator(path=args.output),
+        manifest_path=manifest,
+        max_concurrency=args.concurrency,
+    )
+    runner.load_jobs(args.jobs)
+    summary = runner.run()
+    sys.exit(0 if not summary.get("failed") and not summary.get("invalid") else 1)
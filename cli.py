@@ -1,10 +1,22 @@
+import argparse
+import threading
 from rich.console import Console
 from rich.table import Table
-import questionary
-from src import YouTubeScriptInput, YouTubeScriptGenerator
+from src import YouTubeScriptInput, YouTubeScriptGenerator, ScriptStream
+from src.progress import (
+    ProgressBus,
+    ProgressEvent,
+    STAGE_FINISHED,
+    STAGE_SKIPPED,
+    STAGE_FAILED,
+    SECTION_FINISHED,
+)
 
 
 def get_youtube_script_input() -> YouTubeScriptInput:
+    # prompt_toolkit is slow to import and only needed for interactive runs
+    import questionary
+
     ## video title
     video_title = questionary.text("Enter video title:").ask()
 
@@ -19,8 +31,10 @@ def get_youtube_script_input() -> YouTubeScriptInput:
     ).ask()
 
     language = questionary.text(
-        "In which language would you like to generate your YouTube script (e.g., English or French)?"
+        "In which language would you like to generate your YouTube script "
+        "(e.g., English or French; separate several with commas)?"
     ).ask()
+    languages = [name.strip() for name in language.split(",") if name.strip()]
 
     tone = questionary.select(
         "Select video tone:",
@@ -43,11 +57,12 @@ def get_youtube_script_input() -> YouTubeScriptInput:
     ).ask()
 
     return YouTubeScriptInput(
-        language=language,
+        language=languages[0] if languages else language,
         tone=tone,
         video_length=video_length,
         video_title=video_title,
         description=generate_description,
+        languages=languages if len(languages) > 1 else None,
     )
 
 
@@ -56,7 +71,7 @@ def display_youtube_script_input(inputs: YouTubeScriptInput):
     table = Table(title="Video Configuration")
     table.add_column("Field", style="cyan", no_wrap=True)
     table.add_column("Value", style="magenta")
-    table.add_row("Language", inputs.language)
+    table.add_row("Language", ", ".join(inputs.target_languages()))
     table.add_row("Video Type", inputs.tone)
     table.add_row("Video Length", inputs.video_length)
     table.add_row("Video Title", inputs.video_title)
@@ -64,12 +79,97 @@ def display_youtube_script_input(inputs: YouTubeScriptInput):
     console.print(table)
 
 
-if __name__ == "__main__":
-    inputs = get_youtube_script_input()
-    display_youtube_script_input(inputs)
-    
-    yt_script_generator = YouTubeScriptGenerator()
-    yt_script_generator.generate(inputs)
+def render_script_stream(stream: ScriptStream):
+    """Prints script tokens as they are written, in section order."""
+    console = Console()
+    for chunk in stream:
+        console.print(chunk, end="", markup=False, highlight=False)
+    console.print()
 
 
+def render_progress_event(event: ProgressEvent):
+    """Prints stage results and research progress as they are published."""
+    console = Console()
+    if event.kind == STAGE_FINISHED:
+        console.print(f"[bold green]■ {event.stage} finished in {event.elapsed:.1f}s[/bold green]")
+    elif event.kind == STAGE_SKIPPED:
+        console.print(f"[bold cyan]■ {event.stage} reused from checkpoint[/bold cyan]")
+    elif event.kind == STAGE_FAILED:
+        console.print(f"[bold red]■ {event.stage} failed after {event.elapsed:.1f}s[/bold red]")
+    elif event.kind == SECTION_FINISHED and event.stage == "research_analyst":
+        console.print(
+            f"[cyan]  research section {event.index + 1}/{event.total} {event.status}[/cyan]"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a YouTube script.")
+    parser.add_argument(
+        "--output", default="scripts", help="folder holding the generated runs"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    resume = subparsers.add_parser(
+        "resume", help="continue a failed or interrupted run, skipping completed work"
+    )
+    resume.add_argument("run_id", help="ID (folder name) of the run to resume")
+    derive = subparsers.add_parser(
+        "derive", help="new run from an earlier one, re-running only stages whose inputs changed"
+    )
+    derive.add_argument("run_id", help="ID (folder name) of the source run")
+    derive.add_argument("--tone", help="new video tone")
+    derive.add_argument("--language", help="new script language")
+    derive.add_argument("--languages", nargs="+", help="new script languages")
+    return parser.parse_args()
+
+
+def run_with_stream(target, *args):
+    """Runs `target` in a thread while its progress and script are printed live.
+
+    An exception raised by the pipeline is re-raised here once the thread has
+    finished, so a failed run still exits with a non-zero status.
+    """
+    stream = ScriptStream()
+    progress = ProgressBus()
+    progress.subscribe(render_progress_event)
+    errors = []
+
+    def run():
+        try:
+            target(*args, stream=stream, progress=progress)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            # Runs that fail before streaming starts never close the stream
+            stream.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    render_script_stream(stream)
+    thread.join()
+    if errors:
+        raise errors[0]
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    yt_script_generator = YouTubeScriptGenerator(path=args.output)
 
+    if args.command == "resume":
+        run_with_stream(yt_script_generator.resume, args.run_id)
+    elif args.command == "derive":
+        changes = {
+            field: value
+            for field, value in (
+                ("tone", args.tone),
+                ("language", args.language),
+                ("languages", args.languages),
+            )
+            if value is not None
+        }
+        run_with_stream(
+            lambda **kwargs: yt_script_generator.derive(args.run_id, **kwargs, **changes)
+        )
+    else:
+        inputs = get_youtube_script_input()
+        display_youtube_script_input(inputs)
+        run_with_stream(yt_script_generator.generate, inputs)
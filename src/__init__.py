@@ -1,4 +1,21 @@
-from src.main import YouTubeScriptGenerator
-from src.datatypes import YouTubeScriptInput
+import importlib
 
-__init__ = ["YouTubeScriptGenerator", "YouTubeScriptInput"]
+# Resolved on first access (PEP 562) so `import src` does not pull in
+# LangGraph and the LangChain integrations until a generator is needed.
+_LAZY_ATTRIBUTES = {
+    "YouTubeScriptGenerator": "src.main",
+    "YouTubeScriptInput": "src.datatypes",
+    "ScriptStream": "src.writer.script_stream",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+__init__ = ["YouTubeScriptGenerator", "YouTubeScriptInput", "ScriptStream"]
@@ -1,3 +1,4 @@
 from src.agent_prompt.get_prompt import GetPrompt
+from src.agent_prompt.prompt_registry import PromptRegistry
 
-__init__ = ["GetPrompt"]
+__init__ = ["GetPrompt", "PromptRegistry"]
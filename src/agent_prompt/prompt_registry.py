@@ -0,0 +1,76 @@
+import os
+import time
+import threading
+from importlib import resources
+from typing import Optional
+import yaml
+from langchain_core.prompts import ChatPromptTemplate
+
+
+class PromptRegistry:
+    """Agent prompts from `prompt.yaml` and the chat templates compiled from them.
+
+    The YAML is read through package resources, so it is found whatever the
+    working directory. Each (agent, user message) template is compiled once
+    and shared by every agent instance and thread. The file's mtime is
+    checked at most every `PROMPT_RELOAD_INTERVAL` seconds (default 2, a
+    negative value disables reloading); when it changes the prompts are
+    re-parsed and the templates rebuilt on next use.
+    """
+
+    PACKAGE = "src.agent_prompt"
+    FILE_NAME = "prompt.yaml"
+
+    _prompts: Optional[dict] = None
+    _templates: dict = {}
+    _mtime: Optional[float] = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _reload_interval() -> float:
+        return float(os.getenv("PROMPT_RELOAD_INTERVAL", 2.0))
+
+    @classmethod
+    def _resource(cls):
+        return resources.files(cls.PACKAGE) / cls.FILE_NAME
+
+    @classmethod
+    def _refresh(cls) -> None:
+        """Caller holds the lock. Loads the YAML on first use or after it changed."""
+        interval = cls._reload_interval()
+        now = time.monotonic()
+        if cls._prompts is not None and (interval < 0 or now - cls._checked_at < interval):
+            return
+        cls._checked_at = now
+
+        resource = cls._resource()
+        # Only files on disk have an mtime; zipped packages never change
+        mtime = os.stat(resource).st_mtime if isinstance(resource, os.PathLike) else None
+        if cls._prompts is not None and mtime == cls._mtime:
+            return
+        cls._prompts = yaml.safe_load(resource.read_text(encoding="utf-8")) or {}
+        cls._mtime = mtime
+        cls._templates.clear()
+
+    @classmethod
+    def prompt(cls, agent_name: str) -> str:
+        """Returns the system prompt of `agent_name` ("" if it is not defined)."""
+        with cls._lock:
+            cls._refresh()
+            return cls._prompts.get(agent_name, {}).get("prompt", "")
+
+    @classmethod
+    def chat_template(cls, agent_name: str, user_template: str) -> ChatPromptTemplate:
+        """Returns the compiled system + user template for `agent_name`."""
+        key = (agent_name, user_template)
+        with cls._lock:
+            cls._refresh()
+            template = cls._templates.get(key)
+            if template is None:
+                system_prompt = cls._prompts.get(agent_name, {}).get("prompt", "")
+                template = ChatPromptTemplate.from_messages(
+                    [("system", system_prompt), ("user", user_template)]
+                )
+                cls._templates[key] = template
+            return template
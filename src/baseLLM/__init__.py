@@ -1,3 +1,4 @@
 from src.baseLLM.base import BaseLLM
+from src.baseLLM.client_registry import LLMClientRegistry
 
-__init__ = ["BaseLLM"]
+__init__ = ["BaseLLM", "LLMClientRegistry"]
@@ -1,32 +1,41 @@
 import os
 import logging
-from rich.logging import RichHandler
+from dataclasses import replace
+from typing import Optional
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from src.baseLLM.client_registry import LLMClientRegistry
+from src.routing import ModelRoute, ModelRouter
 
 load_dotenv()
-# Configure logging with RichHandler
-logging.basicConfig(
-    level=logging.INFO, format="%(message)s", datefmt="[%X]", handlers=[RichHandler()]
-)
-
 logger = logging.getLogger(__name__)
 
 
 class BaseLLM:
-    def __init__(self, model: str):
-        """Base class for initializing an LLM."""
-        self.llm = self._initialize_llm(model)
+    # Routing table entry (see `ModelRouter`) the agent's model settings come from
+    AGENT: Optional[str] = None
+
+    def __init__(self, model: Optional[str] = None, **overrides):
+        """Base class for initializing an LLM.
+
+        The model, temperature, max tokens and timeout come from the agent's
+        route; `model` and non-None `overrides` take precedence over it.
+        """
+        route = ModelRouter.route(self.AGENT)
+        if model:
+            route = replace(route, model=model)
+        route = replace(route, **{k: v for k, v in overrides.items() if v is not None})
+        self.route = route
+        self.llm = self._initialize_llm(route)
 
     @staticmethod
-    def _initialize_llm(model: str) -> ChatOpenAI:
-        """Initializes the ChatOpenAI model."""
+    def _initialize_llm(route: ModelRoute) -> ChatOpenAI:
+        """Returns the shared, pooled ChatOpenAI client for the route."""
         openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
+        if not openai_api_key and LLMClientRegistry.backend() != "mock":
             logger.error(
                 "[bold red]❌ OPENAI_API_KEY is not set in environment variables.[/bold red]"
             )
             raise ValueError("Missing OPENAI_API_KEY. Please set it in your .env file.")
 
-        logger.info(f"[bold green]✅ Loaded OpenAI Model:[/bold green] {model}")
-        return ChatOpenAI(model=model)
+        return LLMClientRegistry.get(route.model, **route.client_params())
@@ -0,0 +1,122 @@
+import os
+import logging
+import threading
+from typing import Any, Optional
+import httpx
+from langchain_openai import ChatOpenAI
+from src.cache import SQLiteLLMCache
+from src.metrics import MetricsCallbackHandler
+from src.rate_limit import RateLimiterRegistry
+from src.tracing import TracingCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+
+class LLMClientRegistry:
+    """Process-wide registry of chat model clients.
+
+    Agents asking for the same model and parameters share one `ChatOpenAI`
+    instance, and every instance sends its requests through a single pooled
+    `httpx.Client`, so warm keep-alive connections are reused across agents,
+    sections and runs. Pool limits come from `OPENAI_MAX_CONNECTIONS`,
+    `OPENAI_MAX_KEEPALIVE_CONNECTIONS` and `OPENAI_KEEPALIVE_EXPIRY`.
+
+    Each client goes through the `RateLimiterRegistry` limiter of its model,
+    which throttles requests that miss the LLM cache.
+
+    `LLM_BACKEND=mock` swaps every client for an offline `MockChatModel`.
+    """
+
+    _clients: dict = {}
+    _http_client: Optional[httpx.Client] = None
+    _metrics_handler = MetricsCallbackHandler()
+    _tracing_handler = TracingCallbackHandler()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(
+                os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20)
+            ),
+            keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", 30.0)),
+        )
+
+    @classmethod
+    def http_client(cls) -> httpx.Client:
+        """Returns the shared, pooled HTTP client, creating it on first use."""
+        with cls._lock:
+            return cls._shared_http_client()
+
+    @classmethod
+    def _shared_http_client(cls) -> httpx.Client:
+        """Caller holds the lock."""
+        if cls._http_client is None or cls._http_client.is_closed:
+            # Same default timeout the OpenAI SDK uses for its own client
+            cls._http_client = httpx.Client(
+                limits=cls._limits(),
+                timeout=httpx.Timeout(600.0, connect=5.0),
+                follow_redirects=True,
+                event_hooks={"response": [RateLimiterRegistry.http_response_hook]},
+            )
+        return cls._http_client
+
+    @staticmethod
+    def backend() -> str:
+        return os.getenv("LLM_BACKEND", "openai").lower()
+
+    @classmethod
+    def get(cls, model: str, **params: Any) -> ChatOpenAI:
+        """Returns the shared client for `model` and `params`."""
+        backend = cls.backend()
+        key = (backend, model, tuple(sorted(params.items())))
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is not None:
+                return client
+
+            rate_limiter = RateLimiterRegistry.get(backend, model)
+            callbacks = [cls._metrics_handler, cls._tracing_handler]
+            if rate_limiter is not None:
+                callbacks.append(rate_limiter.callback_handler())
+            if backend == "mock":
+                # Test doubles are only loaded when asked for
+                from src.mock import MockChatModel
+
+                client = MockChatModel.from_env(
+                    model,
+                    cache=SQLiteLLMCache.default(),
+                    rate_limiter=rate_limiter,
+                    callbacks=callbacks,
+                )
+                cls._clients[key] = client
+                logger.info(f"[bold yellow]Using mock LLM backend for:[/bold yellow] {model}")
+            else:
+                # A None cache falls back to langchain's (unset) global cache,
+                # i.e. no caching
+                client = ChatOpenAI(
+                    model=model,
+                    cache=SQLiteLLMCache.default(),
+                    http_client=cls._shared_http_client(),
+                    rate_limiter=rate_limiter,
+                    callbacks=callbacks,
+                    # Report token usage for streamed completions too
+                    stream_usage=True,
+                    # Deadlines and retries are applied per call type by
+                    # src.resilience; SDK retries would multiply them
+                    max_retries=0,
+                    **params,
+                )
+                cls._clients[key] = client
+                logger.info(f"[bold green]✅ Loaded OpenAI Model:[/bold green] {model}")
+            return client
+
+    @classmethod
+    def close(cls) -> None:
+        """Drops every registered client and closes the shared connection pool."""
+        with cls._lock:
+            cls._clients.clear()
+            if cls._http_client is not None:
+                cls._http_client.close()
+                cls._http_client = None
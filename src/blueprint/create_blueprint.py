@@ -1,48 +1,36 @@
 import os
 import json
 from pathlib import Path
+from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from src.blueprint.structured_output_schema import BluePrint
-from src.agent_prompt import GetPrompt
+from src.agent_prompt import PromptRegistry
 from rich.console import Console
-from rich.logging import RichHandler
 import logging
 from src.baseLLM import BaseLLM
+from src.resilience import CallPolicyRegistry
 
 # Initialize Rich Console
 console = Console()
 
-# Configure logging with Rich
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True, markup=True)],  # Enables colored logs
-)
+# Rich logging is configured once by src.logging_config
 logger = logging.getLogger("rich")
 
 
 class CreateBlueprint(BaseLLM):
-    def __init__(self, output_folder: str, model: str = "gpt-4o"):
+    USER_PROMPT = "Video Title: {video_title}\nVideo Length: {video_length}"
+
+    AGENT = "youtube_content_strategist"
+
+    def __init__(self, output_folder: str, model: Optional[str] = None):
         """Initializes the CreateBlueprint class with model and output folder settings."""
         super().__init__(model)
         self.output_folder = Path(output_folder)
 
-    @staticmethod
-    def _fetch_prompt() -> str:
-        """Fetches the structured prompt for YouTube content strategy."""
-        return GetPrompt.get_prompt("youtube_content_strategist")
-
     def _build_prompt_template(self) -> ChatPromptTemplate:
-        """Builds a structured prompt template for the LLM."""
-        return ChatPromptTemplate.from_messages(
-            [
-                ("system", self._fetch_prompt()),
-                (
-                    "user",
-                    "Video Title: {video_title}\nVideo Length: {video_length}",
-                ),
-            ]
+        """Returns the precompiled prompt template for the LLM."""
+        return PromptRegistry.chat_template(
+            "youtube_content_strategist", self.USER_PROMPT
         )
 
     def generate(self, inputs) -> dict:
@@ -58,11 +46,13 @@ class CreateBlueprint(BaseLLM):
         )
 
         try:
-            output = generate_blueprint_direct.invoke(
-                {
-                    "video_title": inputs.video_title,
-                    "video_length": inputs.video_length,
-                }
+            output = CallPolicyRegistry.get("blueprint").run(
+                lambda: generate_blueprint_direct.invoke(
+                    {
+                        "video_title": inputs.video_title,
+                        "video_length": inputs.video_length,
+                    }
+                )
             )
             console.print(
                 "[bold cyan]✔ Blueprint generated successfully![/bold cyan]"
@@ -0,0 +1,3 @@
+from src.bulk.bulk_runner import BulkJob, BulkRunner
+
+__init__ = ["BulkJob", "BulkRunner"]
@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import threading
+import traceback
+from dataclasses import MISSING, dataclass, asdict, fields
+from pathlib import Path
+from typing import List, Optional
+from rich.console import Console
+from src.datatypes import YouTubeScriptInput
+
+console = Console()
+
+_INPUT_FIELDS = [f.name for f in fields(YouTubeScriptInput)]
+# Fields without a default must be on every line; the others are optional
+_REQUIRED_FIELDS = {
+    f.name: f.type
+    for f in fields(YouTubeScriptInput)
+    if f.default is MISSING and f.default_factory is MISSING
+}
+
+
+@dataclass
+class BulkJob:
+    job_id: str
+    line: int
+    run_id: Optional[str] = None
+    status: str = "pending"
+    inputs: Optional[dict] = None
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    wall_time: Optional[float] = None
+    output: Optional[str] = None
+
+
+class BulkRunner:
+    """Runs many pipelines from a JSONL job file under a global concurrency cap.
+
+    Every line is one `YouTubeScriptInput` (plus an optional `job_id`).
+    Invalid lines and failed runs are recorded in the manifest and do not
+    stop the batch. The manifest is rewritten atomically after every status
+    change, so it can be watched while the batch runs.
+    """
+
+    def __init__(self, generator, manifest_path: str, max_concurrency: int = 4) -> None:
+        self.generator = generator
+        self.manifest_path = Path(manifest_path)
+        self.max_concurrency = max(1, max_concurrency)
+        self.jobs: List[BulkJob] = []
+        self._lock = threading.Lock()
+
+    def load_jobs(self, jobs_file: str) -> List[BulkJob]:
+        """Parses the JSONL file; malformed lines become `invalid` jobs."""
+        self.jobs = []
+        with open(jobs_file, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                job = BulkJob(job_id=f"line-{line_number}", line=line_number)
+                try:
+                    data = json.loads(line)
+                    job.job_id = str(data.pop("job_id", job.job_id))
+                    missing = [name for name in _REQUIRED_FIELDS if name not in data]
+                    if missing:
+                        raise ValueError(f"missing fields: {', '.join(missing)}")
+                    job.inputs = {name: data[name] for name in _INPUT_FIELDS if name in data}
+                    self._validate(job.inputs)
+                except Exception as e:
+                    job.status = "invalid"
+                    job.error = str(e)
+                self.jobs.append(job)
+        self._write_manifest()
+        return self.jobs
+
+    @staticmethod
+    def _validate(inputs: dict) -> None:
+        """Rejects values of the wrong type before any job starts, so a line
+        like `"languages": "French"` is reported instead of run."""
+        for name, expected in _REQUIRED_FIELDS.items():
+            if not isinstance(inputs[name], expected):
+                raise TypeError(
+                    f"{name} must be a {expected.__name__}, got {inputs[name]!r}"
+                )
+        # Runs the input's own checks (e.g. languages must be a list of strings)
+        YouTubeScriptInput(**inputs)
+
+    def _write_manifest(self) -> None:
+        """Writes the manifest through a temp file so readers never see partial JSON."""
+        with self._lock:
+            summary = {}
+            for job in self.jobs:
+                summary[job.status] = summary.get(job.status, 0) + 1
+            payload = {"summary": summary, "jobs": [asdict(job) for job in self.jobs]}
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as file:
+                json.dump(payload, file, indent=4)
+            os.replace(tmp_path, self.manifest_path)
+
+    def _run_job(self, job: BulkJob) -> None:
+        job.run_id = self.generator.new_run_id()
+        job.status = "running"
+        job.started_at = time.time()
+        job.output = str(self.generator.output_folder / job.run_id)
+        self._write_manifest()
+        try:
+            self.generator.generate(
+                YouTubeScriptInput(**job.inputs), script_uuid=job.run_id
+            )
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+            console.print(
+                f"[bold red]❌ Job {job.job_id} failed:[/bold red] {job.error}"
+            )
+            console.print(traceback.format_exc(), markup=False, highlight=False)
+        finally:
+            job.finished_at = time.time()
+            job.wall_time = job.finished_at - job.started_at
+            self._write_manifest()
+
+    def run(self) -> dict:
+        """Runs every pending job and returns the status summary."""
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+        pending = [job for job in self.jobs if job.status == "pending"]
+        console.print(
+            f"[bold cyan]🚀 Running {len(pending)} job(s) with concurrency "
+            f"{self.max_concurrency}[/bold cyan]"
+        )
+        with ContextThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(pending)) or 1
+        ) as executor:
+            for future in [executor.submit(self._run_job, job) for job in pending]:
+                future.result()
+
+        summary = {}
+        for job in self.jobs:
+            summary[job.status] = summary.get(job.status, 0) + 1
+        console.print(f"[bold green]✔ Bulk run finished:[/bold green] {summary}")
+        console.print(f"[bold green]Manifest:[/bold green] {self.manifest_path}")
+        return summary
@@ -0,0 +1,4 @@
+from src.cache.llm_cache import SQLiteLLMCache
+from src.cache.search_cache import SearchCache
+
+__init__ = ["SQLiteLLMCache", "SearchCache"]
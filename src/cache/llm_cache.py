@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import warnings
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Optional
+from langchain_core._api.beta_decorator import LangChainBetaWarning
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Per-run switch. Worker threads started through ContextThreadPoolExecutor
+# inherit the value of the run that spawned them.
+_cache_bypassed: ContextVar[bool] = ContextVar("llm_cache_bypassed", default=False)
+
+
+class SQLiteLLMCache(BaseCache):
+    """Content-addressed, on-disk cache for chat model responses.
+
+    Entries are keyed by a hash of the LLM configuration string (model,
+    sampling params and any bound structured-output schema) and the
+    serialized prompt messages. Entries older than `ttl_seconds` are ignored
+    and the least recently used rows are evicted once `max_entries` is hit.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        database_path: str = ".cache/llm_cache.sqlite",
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_entries: Optional[int] = 10_000,
+    ) -> None:
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.database_path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+            )
+
+    @classmethod
+    def default(cls) -> Optional["SQLiteLLMCache"]:
+        """Returns the process-wide cache configured from the environment.
+
+        `LLM_CACHE_DISABLED=1` turns the cache off entirely. `LLM_CACHE_PATH`,
+        `LLM_CACHE_TTL` (seconds, 0 for no expiry) and `LLM_CACHE_MAX_ENTRIES`
+        (0 for unbounded) override the defaults.
+        """
+        if os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+            return None
+        with cls._default_lock:
+            if cls._default is None:
+                ttl = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+                max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10_000))
+                cls._default = cls(
+                    database_path=os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite"),
+                    ttl_seconds=ttl or None,
+                    max_entries=max_entries or None,
+                )
+            return cls._default
+
+    @staticmethod
+    @contextmanager
+    def bypass(enabled: bool = True):
+        """Skips cache reads and writes for everything run inside the block."""
+        token = _cache_bypassed.set(enabled)
+        try:
+            yield
+        finally:
+            _cache_bypassed.reset(token)
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Returns the cached generations, or None on a miss or expired entry."""
+        if _cache_bypassed.get():
+            return None
+
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+
+        try:
+            # loads() is a beta API and warns on every call, i.e. every hit
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LangChainBetaWarning)
+                generations = [loads(generation) for generation in json.loads(row[0])]
+        except Exception as e:
+            logger.warning(f"Discarding unreadable LLM cache entry: {e}")
+            return None
+        # Lets callbacks tell a cache hit from a billed call
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is not None:
+                message.response_metadata["cache_hit"] = True
+        return generations
+
+    def contains(self, prompt: str, llm_string: str) -> bool:
+        """True if `lookup` would hit, without counting a hit or miss."""
+        if _cache_bypassed.get():
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM llm_cache WHERE key = ?",
+                (self._key(prompt, llm_string),),
+            ).fetchone()
+        return row is not None and not (
+            self.ttl_seconds and time.time() - row[0] > self.ttl_seconds
+        )
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Stores generations and evicts the least recently used overflow."""
+        if _cache_bypassed.get():
+            return
+
+        key = self._key(prompt, llm_string)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Removes every cached entry and resets the counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
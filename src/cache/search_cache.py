@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, List, Optional
+
+
+class SearchCache:
+    """TTL + LRU cache for internet search results with a SQLite backend.
+
+    Keys are the normalized query plus the number of requested results, so
+    trivially different phrasings ("What is X?" / "what is x") share an entry.
+    Identical queries issued while a request is already in flight wait for
+    that request instead of hitting the network again. `max_entries` bounds
+    the in-memory LRU and `max_disk_entries` the SQLite table; expired rows
+    and the least recently used overflow are deleted on every write.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        database_path: Optional[str] = ".cache/search_cache.sqlite",
+        ttl_seconds: Optional[float] = 24 * 3600,
+        max_entries: int = 1_000,
+        max_disk_entries: Optional[int] = 10_000,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._in_flight: dict = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if database_path:
+            Path(database_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(database_path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS search_cache (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+                # Databases written before disk eviction lack accessed_at
+                columns = {
+                    row[1] for row in self._conn.execute("PRAGMA table_info(search_cache)")
+                }
+                if "accessed_at" not in columns:
+                    self._conn.execute(
+                        "ALTER TABLE search_cache ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+                    )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS search_cache_accessed "
+                    "ON search_cache (accessed_at)"
+                )
+
+    @classmethod
+    def default(cls) -> Optional["SearchCache"]:
+        """Returns the process-wide cache configured from the environment.
+
+        `SEARCH_CACHE_DISABLED=1` turns the cache off. `SEARCH_CACHE_PATH`
+        (empty for memory only), `SEARCH_CACHE_TTL` (seconds, 0 for no expiry),
+        `SEARCH_CACHE_MAX_ENTRIES` and `SEARCH_CACHE_MAX_DISK_ENTRIES` (0 for
+        unbounded) override the defaults.
+        """
+        if os.getenv("SEARCH_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+            return None
+        with cls._default_lock:
+            if cls._default is None:
+                ttl = float(os.getenv("SEARCH_CACHE_TTL", 24 * 3600))
+                max_disk_entries = int(os.getenv("SEARCH_CACHE_MAX_DISK_ENTRIES", 10_000))
+                cls._default = cls(
+                    database_path=os.getenv(
+                        "SEARCH_CACHE_PATH", ".cache/search_cache.sqlite"
+                    ),
+                    ttl_seconds=ttl or None,
+                    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 1_000)),
+                    max_disk_entries=max_disk_entries or None,
+                )
+            return cls._default
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Lowercases, collapses whitespace and strips surrounding quotes and
+        trailing punctuation. Other symbols are kept, since they can change
+        what is searched for ("C++" vs. "C#" vs. "C")."""
+        query = " ".join(query.lower().split())
+        return re.sub(r"""^["'`\s]+|["'`\s?!.,;:]+$""", "", query)
+
+    def _key(self, query: str, num_results: int) -> str:
+        return f"{num_results}:{self.normalize(query)}"
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: List[dict], created_at: float) -> None:
+        """Inserts into the in-memory LRU, evicting the oldest entries."""
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _get(self, key: str) -> Optional[List[dict]]:
+        """Looks the key up in memory, then on disk. Caller holds the lock."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            if not self._expired(entry[1]):
+                self._memory.move_to_end(key)
+                return entry[0]
+            del self._memory[key]
+
+        if self._conn is None:
+            return None
+        row = self._conn.execute(
+            "SELECT value, created_at FROM search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self._expired(row[1]):
+            with self._conn:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            return None
+        with self._conn:
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        value = json.loads(row[0])
+        self._remember(key, value, row[1])
+        return value
+
+    def _put(self, key: str, value: List[dict]) -> None:
+        """Stores a result and evicts expired and least recently used rows."""
+        now = time.time()
+        self._remember(key, value, now)
+        if self._conn is None:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            if self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                )
+            if self.max_disk_entries:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE key IN ("
+                    "SELECT key FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+
+    def get_or_fetch(
+        self, query: str, num_results: int, fetch: Callable[[str], List[dict]]
+    ) -> List[dict]:
+        """Returns cached results or calls `fetch(query)` exactly once per key."""
+        key = self._key(query, num_results)
+        with self._lock:
+            cached = self._get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch(query)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._put(key, value)
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Drops every cached result and resets the counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM search_cache")
+            self.hits = self.misses = self.coalesced = 0
+
+    def stats(self) -> dict:
+        """Returns hit/miss/coalesced counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._memory),
+            }
@@ -0,0 +1,3 @@
+from src.checkpoint.run_checkpoint import RunCheckpoint
+
+__init__ = ["RunCheckpoint"]
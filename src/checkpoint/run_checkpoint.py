@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class RunCheckpoint:
+    """Artifact manifest (`checkpoint.json`) recording the finished work of a run.
+
+    Main-graph stages and individual research/written sections are marked
+    complete together with the files they produced and a fingerprint of the
+    inputs they consumed. A piece of work counts as done only while all of
+    its artifacts still exist and its inputs are unchanged, so deleting an
+    output file, or deriving a run with a different tone, is enough to have
+    exactly the affected work regenerated.
+    """
+
+    FILE_NAME = "checkpoint.json"
+
+    def __init__(self, base: Path, run_id: str, inputs: Optional[dict] = None) -> None:
+        self.base = Path(base)
+        self.run_id = run_id
+        self.inputs = inputs or {}
+        self.status = "running"
+        self.stages: dict = {}
+        self.sections: dict = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.base / self.FILE_NAME
+
+    @classmethod
+    def load(cls, base: Path) -> "RunCheckpoint":
+        """Reads the manifest of the run stored in `base`."""
+        with (Path(base) / cls.FILE_NAME).open("r", encoding="utf-8") as file:
+            data = json.load(file)
+        checkpoint = cls(base, data["run_id"], data["inputs"])
+        checkpoint.status = data["status"]
+        checkpoint.stages = data["stages"]
+        checkpoint.sections = data["sections"]
+        return checkpoint
+
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        """Hashes values and, for `Path` parts, file contents (directories recursively)."""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, Path):
+                files = [part]
+                if part.is_dir():
+                    files = sorted(p for p in part.rglob("*") if p.is_file())
+                for file in files:
+                    digest.update(file.name.encode("utf-8"))
+                    digest.update(file.read_bytes() if file.exists() else b"<missing>")
+            else:
+                digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _valid(
+        self, entry: Optional[dict], artifacts: Iterable[str], input_hash: Optional[str]
+    ) -> bool:
+        return (
+            entry is not None
+            and (input_hash is None or entry.get("input_hash") == input_hash)
+            and all((self.base / artifact).exists() for artifact in artifacts)
+        )
+
+    def stage_done(self, stage: str, input_hash: Optional[str] = None) -> bool:
+        with self._lock:
+            entry = self.stages.get(stage)
+        return self._valid(entry, entry["artifacts"] if entry else [], input_hash)
+
+    def section_done(self, stage: str, index: int, input_hash: Optional[str] = None) -> bool:
+        with self._lock:
+            entry = self.sections.get(stage, {}).get(str(index))
+        return self._valid(entry, [entry["artifact"]] if entry else [], input_hash)
+
+    def section_artifact(self, stage: str, index: int) -> Optional[str]:
+        with self._lock:
+            entry = self.sections.get(stage, {}).get(str(index))
+        return entry["artifact"] if entry else None
+
+    def complete_stage(
+        self, stage: str, artifacts: Iterable[str] = (), input_hash: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            self.stages[stage] = {
+                "completed_at": time.time(),
+                "artifacts": list(artifacts),
+                "input_hash": input_hash,
+            }
+            self._save()
+
+    def complete_section(
+        self, stage: str, index: int, artifact: str, input_hash: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            self.sections.setdefault(stage, {})[str(index)] = {
+                "completed_at": time.time(),
+                "artifact": artifact,
+                "input_hash": input_hash,
+            }
+            self._save()
+
+    def prune_sections(self, stage: str, total: int) -> None:
+        """Forgets the sections of `stage` from index `total` on and deletes
+        their artifacts, e.g. after a new blueprint came out shorter."""
+        with self._lock:
+            sections = self.sections.get(stage, {})
+            stale = [index for index in sections if int(index) >= total]
+            for index in stale:
+                (self.base / sections.pop(index)["artifact"]).unlink(missing_ok=True)
+            if not sections:
+                self.sections.pop(stage, None)
+            if stale:
+                self._save()
+
+    def derive(self, base: Path, run_id: str, inputs: dict) -> "RunCheckpoint":
+        """Copies this run's artifacts and records into a new run directory.
+
+        `base` must already exist. Stages of the new run whose inputs differ
+        from this run's fail their fingerprint check and are regenerated;
+        stages that produce one artifact per section drop those beyond the
+        new section count (see `prune_sections`).
+        """
+        derived = RunCheckpoint(base, run_id, inputs)
+        with self._lock:
+            entries = list(self.stages.values()) + [
+                entry for sections in self.sections.values() for entry in sections.values()
+            ]
+            artifacts = {
+                artifact
+                for entry in entries
+                for artifact in entry.get("artifacts", [entry.get("artifact")])
+            }
+            derived.stages = json.loads(json.dumps(self.stages))
+            derived.sections = json.loads(json.dumps(self.sections))
+        for artifact in sorted(artifacts):
+            source = self.base / artifact
+            if source.exists():
+                (derived.base / artifact).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, derived.base / artifact)
+        with derived._lock:
+            derived._save()
+        return derived
+
+    def set_status(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+            self._save()
+
+    def _save(self) -> None:
+        """Caller holds the lock. Written through a temp file so a crash never
+        leaves a truncated manifest behind."""
+        if not self.base.exists():
+            return
+        payload = {
+            "run_id": self.run_id,
+            "status": self.status,
+            "inputs": self.inputs,
+            "stages": self.stages,
+            "sections": self.sections,
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump(payload, file, indent=4)
+        os.replace(tmp_path, self.path)
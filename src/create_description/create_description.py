@@ -1,55 +1,51 @@
 import os
 import logging
 from pathlib import Path
+from typing import Optional
 from rich.console import Console
-from rich.logging import RichHandler
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from src.agent_prompt import GetPrompt
+from src.agent_prompt import PromptRegistry
 from src.baseLLM import BaseLLM
+from src.resilience import CallPolicyRegistry
 
 
 # Initialize Rich Console
 console = Console()
 
-# Configure logging with Rich
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
-)
+# Rich logging is configured once by src.logging_config
 logger = logging.getLogger("rich")
 
 
 class CreateDescription(BaseLLM):
-    def __init__(self, model: str = "gpt-4o") -> None:
+    AGENT = "youtube_description_writer"
+    USER_PROMPT = "Script Outline: {script_outline}\nLanguage: {language}"
+
+    def __init__(self, model: Optional[str] = None) -> None:
         """Initializes the CreateDescription class with model settings."""
         super().__init__(model)
-        self.prompt_template = self._build_prompt_template()
-
-    @staticmethod
-    def _fetch_prompt() -> str:
-        """Fetches the structured prompt for YouTube description writing."""
-        return GetPrompt.get_prompt("youtube_description_writer")
 
     def _build_prompt_template(self) -> ChatPromptTemplate:
-        """Builds a structured prompt template for the LLM."""
-        return ChatPromptTemplate.from_messages(
-            [
-                ("system", self._fetch_prompt()),
-                ("user", "Script Outline: {script_outline}"),
-            ]
-        )
-
-    def generate_conclusion(self, script_outline: list) -> str:
-        """Generates a conclusion based on the provided refined blueprint."""
+        """Returns the precompiled prompt template for the LLM."""
+        return PromptRegistry.chat_template("youtube_description_writer", self.USER_PROMPT)
+
+    def generate_conclusion(self, script_outline, language: str = "English") -> str:
+        """Generates a description in `language` from the refined blueprint outline.
+
+        `script_outline` is the outline text or a list of outline parts.
+        Failures are raised so the stage is not checkpointed as complete.
+        """
         try:
-            script_outline = "\n\n".join(script_outline)
-            writer = self.prompt_template | self.llm | StrOutputParser()
-            conclusion_output = writer.invoke({"script_outline": script_outline})
+            if not isinstance(script_outline, str):
+                script_outline = "\n\n".join(script_outline)
+            writer = self._build_prompt_template() | self.llm | StrOutputParser()
+            conclusion_output = CallPolicyRegistry.get("description").run(
+                lambda: writer.invoke({"script_outline": script_outline, "language": language})
+            )
+            if not conclusion_output.strip():
+                raise ValueError("the model returned an empty description")
             console.print("[bold cyan]✔ Conclusion generated successfully![/bold cyan]")
             return conclusion_output
         except Exception as e:
             logger.error(f"[bold red]❌ Error generating conclusion:[/bold red] {e}")
-            return ""
+            raise
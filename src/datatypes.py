@@ -1,5 +1,7 @@
+import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import List, Optional
 
 
 @dataclass
@@ -9,16 +11,47 @@ class YouTubeScriptInput:
     video_length: str
     video_title: str
     description: bool
+    # Write the script (and description) in each of these languages from a
+    # single blueprint/research pass; `language` is used when it is unset.
+    languages: Optional[List[str]] = None
+
+    def __post_init__(self) -> None:
+        # A bare string would otherwise be written one character at a time
+        if self.languages is not None and not (
+            isinstance(self.languages, list)
+            and all(isinstance(language, str) for language in self.languages)
+        ):
+            raise TypeError(f"languages must be a list of strings, got {self.languages!r}")
+
+    def target_languages(self) -> List[str]:
+        """Returns the languages to write, in the given order.
+
+        Languages sharing a file tag ("English" / "english") would write the
+        same files, so only the first of them is kept.
+        """
+        if not self.languages:
+            return [self.language]
+        by_tag = {}
+        for language in self.languages:
+            by_tag.setdefault(language_tag(language), language)
+        return list(by_tag.values())
+
+
+def language_tag(language: str) -> str:
+    """File-name-safe tag for a language, e.g. "Brazilian Portuguese" -> "brazilian-portuguese"."""
+    return re.sub(r"[^\w]+", "-", language.strip().lower()).strip("-") or "default"
 
 
 @dataclass
 class ScriptPaths:
     base: Path
     internet_search: Path
+    sections: Path
 
     @classmethod
     def from_base(cls, base_path: Path):
         return cls(
             base=base_path,
             internet_search=base_path / "internet_search",
+            sections=base_path / "sections",
         )
@@ -1,30 +1,31 @@
 import os
 import json
+import time
+import threading
 from pathlib import Path
 from typing_extensions import TypedDict
 from typing import Annotated
 from langgraph.graph.message import AnyMessage, add_messages
-from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import END, StateGraph
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 from rich.console import Console
-from rich.logging import RichHandler
 import logging
 from langchain_community.tools.you import YouSearchTool
 from langchain_community.utilities.you import YouSearchAPIWrapper
 
-from src.agent_prompt import GetPrompt
+from src.agent_prompt import PromptRegistry
 from src.baseLLM import BaseLLM
+from src.cache import SearchCache
+from src.metrics import RunMetrics
+from src.rate_limit import RateLimiterRegistry
+from src.resilience import CallPolicyRegistry
+from src.tracing import RunTrace
+from src.internet_research.structured_output_schema import ResearchQuestions
 
 
 # Setup Rich Console & Logging
 console = Console()
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
-)
 logger = logging.getLogger("rich")
 
 
@@ -40,45 +41,60 @@ class GraphState(TypedDict):
 
 
 class Researcher(BaseLLM):
+    AGENT = "research_analyst"
+    MODES = ("fast", "deep")
+    QUESTION_PROMPT = (
+        "Section Details: {section_details}\n Previously Generated Questions: {previous_questions}"
+    )
+    BATCH_PROMPT = "Section Details: {section_details}"
+    _search_tools: dict = {}
+    _search_tools_lock = threading.Lock()
+    # Research graphs are compiled once per process, one per mode. The
+    # Researcher that owns a run is passed via config["configurable"]["researcher"].
+    _apps: dict = {}
+    _apps_lock = threading.Lock()
+
     def __init__(
         self,
         output_folder: str,
-        model="gpt-4o",
-        temperature=0.3,
+        model=None,
+        temperature=None,
         no_generate_question: int = 3,
         no_internet_results: int = 2,
+        mode: str = "fast",
     ):
-        """Initialize the Researcher with LLM and output settings."""
-        super().__init__(model)
+        """Initialize the Researcher with LLM and output settings.
+
+        `mode="fast"` asks for every question in one structured call and runs
+        the searches concurrently. `mode="deep"` keeps the sequential
+        question -> search loop where each question sees the previous ones.
+        `model` and `temperature` default to the `research_analyst` route.
+        """
+        super().__init__(model, temperature=temperature)
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown research mode {mode!r}, expected one of {self.MODES}")
         self.output_folder = Path(output_folder)
         self.state = None
         self.no_generate_question = no_generate_question
         self.no_internet_results = no_internet_results
+        self.mode = mode
 
     @staticmethod
-    def _fetch_prompt() -> str:
-        """Fetches the structured prompt for YouTube content strategy."""
-        return GetPrompt.get_prompt("research_analyst")
+    def _section_details(state: GraphState) -> str:
+        return (
+            f'Section title: "{state["section_info"]["section_title"]}"\n'
+            f'Section description: "{state["section_info"]["description"]}"'
+        )
 
     def _generate_question(self, state: GraphState) -> GraphState:
         """Generates a new question based on the given state."""
         console.print("[bold cyan]🔍 Generating question...[/bold cyan]")
 
-        gen_qn_prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", self._fetch_prompt()),
-                (
-                    "user",
-                    "Section Details: {section_details}\n Previously Generated Questions: {previous_questions}",
-                ),
-            ]
+        gen_qn_prompt = PromptRegistry.chat_template(
+            "research_analyst", self.QUESTION_PROMPT
         )
-
         gen_qn_agent = gen_qn_prompt | self.llm
-        section_details = (
-            f'Section title: "{state["section_info"]["section_title"]}"\n'
-            f'Section description: "{state["section_info"]["description"]}"'
-        )
+        section_details = self._section_details(state)
 
         previous_questions_string = (
             " ".join(
@@ -89,12 +105,15 @@ class Researcher(BaseLLM):
         )
 
         try:
-            generated_output = gen_qn_agent.invoke(
-                {
-                    "section_details": section_details,
-                    "previous_questions": previous_questions_string,
-                }
-            ).content
+            with RunTrace.span("generate_question", "research"):
+                generated_output = CallPolicyRegistry.get("question").run(
+                    lambda: gen_qn_agent.invoke(
+                        {
+                            "section_details": section_details,
+                            "previous_questions": previous_questions_string,
+                        }
+                    )
+                ).content
             state["questions"].append(generated_output)
 
             console.print(
@@ -106,27 +125,137 @@ class Researcher(BaseLLM):
 
         return state
 
+    def _generate_questions(self, state: GraphState) -> GraphState:
+        """Generates all questions for the section in a single structured call."""
+        console.print("[bold cyan]🔍 Generating questions...[/bold cyan]")
+
+        gen_qn_prompt = PromptRegistry.chat_template(
+            "research_analyst_batch", self.BATCH_PROMPT
+        )
+        gen_qn_agent = gen_qn_prompt | self.llm.with_structured_output(
+            ResearchQuestions
+        )
+
+        try:
+            with RunTrace.span("generate_questions", "research"):
+                generated_output = CallPolicyRegistry.get("question").run(
+                    lambda: gen_qn_agent.invoke(
+                        {
+                            "section_details": self._section_details(state),
+                            "no_questions": self.no_generate_question,
+                        }
+                    )
+                )
+        except Exception as e:
+            logger.error(f"[bold red]❌ Error generating questions:[/bold red] {e}")
+            raise
+
+        questions = []
+        for question in generated_output.questions:
+            question = question.strip()
+            if question and question not in questions:
+                questions.append(question)
+        state["questions"].extend(questions[: self.no_generate_question])
+
+        for question in state["questions"]:
+            console.print(f"[bold green]✅ Generated Question:[/bold green] {question}")
+        return state
+
+    @classmethod
+    def _get_search_tool(cls, num_web_results: int) -> YouSearchTool:
+        """Returns a search tool shared by every Researcher.
+
+        `SEARCH_BACKEND=mock` swaps You.com for an offline `MockSearchTool`.
+        """
+        backend = os.getenv("SEARCH_BACKEND", "you").lower()
+        key = (backend, num_web_results)
+        with cls._search_tools_lock:
+            if key not in cls._search_tools:
+                if backend == "mock":
+                    # Test doubles are only loaded when asked for
+                    from src.mock import MockSearchTool
+
+                    cls._search_tools[key] = MockSearchTool.from_env(num_web_results)
+                else:
+                    api_wrapper = YouSearchAPIWrapper(num_web_results=num_web_results)
+                    cls._search_tools[key] = YouSearchTool(api_wrapper=api_wrapper)
+            return cls._search_tools[key]
+
+    def _fetch_search(self, question: str) -> list:
+        """Hits the search API and returns the formatted results."""
+        youTool = self._get_search_tool(self.no_internet_results)
+        rate_limiter = RateLimiterRegistry.get(
+            os.getenv("SEARCH_BACKEND", "you").lower(), "search"
+        )
+
+        def run_search() -> list:
+            if rate_limiter is None:
+                return youTool.run(question)
+            with rate_limiter.slot():
+                return youTool.run(question)
+
+        results = CallPolicyRegistry.get("search").run(run_search)
+
+        return [
+            {
+                "content": result.page_content,
+                "url": result.metadata["url"],
+                "title": result.metadata["title"],
+            }
+            for result in results
+        ]
+
+    def _search(self, question: str) -> list:
+        """Runs a single internet search, served from the search cache when possible."""
+        fetched = []
+
+        def fetch(query: str) -> list:
+            fetched.append(query)
+            return self._fetch_search(query)
+
+        start = time.perf_counter()
+        search_cache = SearchCache.default()
+        with RunTrace.span("search", "search", query=question) as span:
+            if search_cache is None:
+                results = fetch(question)
+            else:
+                results = search_cache.get_or_fetch(
+                    question, self.no_internet_results, fetch
+                )
+            if span is not None:
+                span.attributes["cached"] = not fetched
+        RunMetrics.record_search(time.perf_counter() - start, cached=not fetched)
+        return results
+
     def _internet_search(self, state: GraphState) -> GraphState:
         """Performs an internet search using the latest generated question."""
         console.print("[bold cyan]🌍 Performing Internet Search...[/bold cyan]")
 
         try:
-            api_wrapper = YouSearchAPIWrapper(num_web_results=self.no_internet_results)
-            youTool = YouSearchTool(api_wrapper=api_wrapper)
-            results = youTool.run(state["questions"][-1])
-
-            for index, result in enumerate(results):
-                search_data = {
-                    "content": result.page_content,
-                    "url": result.metadata["url"],
-                    "title": result.metadata["title"],
-                }
-                state["internet_search"].append(search_data)
+            state["internet_search"].extend(self._search(state["questions"][-1]))
+        except Exception as e:
+            logger.error(f"[bold red]❌ Internet search failed:[/bold red] {e}")
+            raise
+
+        return state
+
+    def _internet_search_all(self, state: GraphState) -> GraphState:
+        """Runs the searches for every generated question concurrently."""
+        console.print("[bold cyan]🌍 Performing Internet Searches...[/bold cyan]")
 
+        questions = state["questions"]
+        try:
+            with ContextThreadPoolExecutor(max_workers=len(questions) or 1) as executor:
+                results = list(executor.map(self._search, questions))
         except Exception as e:
             logger.error(f"[bold red]❌ Internet search failed:[/bold red] {e}")
             raise
 
+        # Keep hits in question order so the saved output matches deep mode
+        for hits in results:
+            state["internet_search"].extend(hits)
+
+        self._save_data(state)
         return state
 
     def _save_data(self, state: GraphState) -> None:
@@ -152,26 +281,69 @@ class Researcher(BaseLLM):
         else:
             return "continue"
 
-    def run(self, initial_state: GraphState) -> GraphState:
-        """Runs the research workflow using a state graph."""
-        console.print("[bold cyan]🚀 Starting Research Process...[/bold cyan]")
+    @staticmethod
+    def _node(name: str):
+        """Wraps a Researcher method so the graph can be compiled without binding `self`."""
+
+        def run(state: GraphState, config: RunnableConfig):
+            researcher = config["configurable"]["researcher"]
+            return getattr(researcher, name)(state)
 
+        run.__name__ = name
+        return run
+
+    @classmethod
+    def _build_deep_workflow(cls) -> StateGraph:
+        """Sequential loop: each question sees the previously generated ones."""
         workflow = StateGraph(GraphState)
-        workflow.add_node("generate_question", self._generate_question)
-        workflow.add_node("search_internet", self._internet_search)
+        workflow.add_node("generate_question", cls._node("_generate_question"))
+        workflow.add_node("search_internet", cls._node("_internet_search"))
 
         workflow.set_entry_point("generate_question")
         workflow.add_edge("generate_question", "search_internet")
         workflow.add_conditional_edges(
             "search_internet",
-            self.end_flow_decision,
+            cls._node("end_flow_decision"),
             {
                 "end": END,
                 "continue": "generate_question",
             },
         )
+        return workflow
+
+    @classmethod
+    def _build_fast_workflow(cls) -> StateGraph:
+        """One batched question call followed by concurrent searches."""
+        workflow = StateGraph(GraphState)
+        workflow.add_node("generate_questions", cls._node("_generate_questions"))
+        workflow.add_node("search_internet", cls._node("_internet_search_all"))
 
-        app = workflow.compile()
+        workflow.set_entry_point("generate_questions")
+        workflow.add_edge("generate_questions", "search_internet")
+        workflow.add_edge("search_internet", END)
+        return workflow
 
-        console.print("[bold green]🔄 Research Workflow Initialized[/bold green]")
-        return app.invoke(initial_state)
+    @classmethod
+    def compiled_app(cls, mode: str):
+        """Returns the research graph for `mode`, compiling it on first use."""
+        with cls._apps_lock:
+            if mode not in cls._apps:
+                if mode == "deep":
+                    workflow = cls._build_deep_workflow()
+                else:
+                    workflow = cls._build_fast_workflow()
+                cls._apps[mode] = workflow.compile()
+                console.print("[bold green]🔄 Research Workflow Initialized[/bold green]")
+            return cls._apps[mode]
+
+    def run(self, initial_state: GraphState) -> GraphState:
+        """Runs the research workflow using a state graph."""
+        console.print("[bold cyan]🚀 Starting Research Process...[/bold cyan]")
+
+        app = self.compiled_app(self.mode)
+        with RunTrace.span(
+            "research_section", "research", section=initial_state["iterations"], mode=self.mode
+        ):
+            return app.invoke(
+                initial_state, config={"configurable": {"researcher": self}}
+            )
@@ -0,0 +1,9 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class ResearchQuestions(BaseModel):
+    questions: List[str] = Field(
+        default_factory=list,
+        title="Distinct, non-overlapping search queries. Each query must cover a different aspect of the section.",
+    )
@@ -1,10 +1,7 @@
 import os
 import logging
 from dotenv import load_dotenv
-from rich.logging import RichHandler
 
-# Configure logging with Rich
-logging.basicConfig(level=logging.ERROR, handlers=[RichHandler()])
 logger = logging.getLogger(__name__)
 
 class APIKeyManager:
@@ -0,0 +1,16 @@
+import logging
+from rich.logging import RichHandler
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Sends log records through rich, with markup enabled for the agents' messages.
+
+    A no-op when the application configured the root logger already, so
+    embedding the generator never overrides the host's logging setup.
+    """
+    logging.basicConfig(
+        level=level,
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+    )
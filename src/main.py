@@ -1,28 +1,46 @@
 import os
+import json
+import time
+import contextlib
 import uuid
+import inspect
+import threading
+from dataclasses import asdict, replace
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing_extensions import TypedDict
 from rich.console import Console
-from src.datatypes import YouTubeScriptInput, ScriptPaths
+from rich.table import Table
+from src.datatypes import YouTubeScriptInput, ScriptPaths, language_tag
+from src.writer.script_stream import ScriptStream
+from src.key_manager import APIKeyManager
+from src.metrics import RunMetrics, MetricsStore
+from src.tracing import RunTrace, export_otlp
+from src.checkpoint import RunCheckpoint
+from src.logging_config import configure_logging
+from src.progress import (
+    ProgressBus,
+    STAGE_STARTED,
+    STAGE_FINISHED,
+    STAGE_SKIPPED,
+    STAGE_FAILED,
+    SECTION_STARTED,
+    SECTION_FINISHED,
+    RUN_FINISHED,
+)
 
+# Agents, LangGraph and the LangChain integrations are imported by the stage
+# that needs them, so importing this module (and the CLI) stays fast.
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.graph import StateGraph
+    from src.internet_research import GraphState
 
 console = Console()
-import json
-from src.blueprint import CreateBlueprint
-from src.internet_research import Researcher, GraphState
-from src.refined_blueprint import YouTubeScriptArchitect
-from src.writer import GenerateScript
-from src.create_description import CreateDescription
-from typing_extensions import TypedDict
 
-from dataclasses import dataclass
-from pathlib import Path
-import uuid
-from rich.console import Console
-from langgraph.graph.message import AnyMessage, add_messages
-from langgraph.graph import END, StateGraph
-from src.key_manager import APIKeyManager
 
-console = Console()
+class RunDirectoryExists(FileExistsError):
+    """The output directory of a new run is already taken by another run."""
 
 
 class MainGraphState(TypedDict):
@@ -34,32 +52,81 @@ class MainGraphState(TypedDict):
 
 
 class YouTubeScriptGenerator:
-    def __init__(self, path: str = "scripts") -> None:
-        self.script_uuid: str = str(uuid.uuid4())[:6]
+    # The main graph is compiled once per process and shared by every
+    # generator. Per-run data travels in MainGraphState; the generator whose
+    # settings apply is passed through config["configurable"]["generator"].
+    _app = None
+    _app_lock = threading.Lock()
+    # Files each stage leaves behind; a stage is skipped on resume only while
+    # they exist. Research and writing are checkpointed per section instead,
+    # and multi-language runs write one description per language.
+    STAGE_ARTIFACTS = {
+        "create_directory": [],
+        "youtube_content_strategist": ["blueprint.json"],
+        "youtube_script_architect": ["refined_blueprint.json"],
+        "youtube_description_writer": ["video_description.txt"],
+    }
+    # Artifact dependency graph: the input fields and upstream artifacts each
+    # stage consumes. A stage is reused only while their fingerprint matches,
+    # so a new tone or language never re-runs blueprint, research or refinement.
+    STAGE_INPUTS = {
+        "create_directory": ([], []),
+        "youtube_content_strategist": (["video_title", "video_length"], []),
+        "youtube_script_architect": (
+            ["video_title", "video_length"],
+            ["blueprint.json", "internet_search"],
+        ),
+        "youtube_description_writer": (
+            ["language", "languages"],
+            ["refined_blueprint.json"],
+        ),
+    }
+
+    def __init__(
+        self,
+        path: str = "scripts",
+        max_research_concurrency: int = 4,
+        research_mode: str = "fast",
+        max_writer_concurrency: int = 4,
+        use_llm_cache: bool = True,
+        max_research_tokens: int = 8000,
+    ) -> None:
+        self.script_uuid: str = self.new_run_id()
         self.output_folder: Path = Path(path)
+        self.max_research_concurrency: int = max(1, max_research_concurrency)
+        self.research_mode: str = research_mode
+        self.max_writer_concurrency: int = max(1, max_writer_concurrency)
+        self.use_llm_cache: bool = use_llm_cache
+        self.max_research_tokens: int = max_research_tokens
         self.paths: ScriptPaths = ScriptPaths.from_base(
             self.output_folder / self.script_uuid
         )
+        configure_logging()
+
+    @staticmethod
+    def new_run_id() -> str:
+        """Returns a collision-resistant run ID (48 random bits)."""
+        return uuid.uuid4().hex[:12]
 
     def create_directory(self, main_state: MainGraphState) -> MainGraphState:
-        """Creates a directory structure for the script."""
+        """Creates a directory structure for the script.
 
-        if main_state["paths"].base.exists():
+        The run directory is created exclusively, so two runs can never
+        share (and overwrite) one output folder.
+        """
+        main_state["paths"].base.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            main_state["paths"].base.mkdir()
+        except FileExistsError as e:
             console.print(
-                f"[bold yellow]Directory \"{main_state['paths'].base}\" already exists.[/bold yellow]"
-
+                f"[bold red]Directory \"{main_state['paths'].base}\" already exists.[/bold red]"
             )
-            
-            return
+            raise RunDirectoryExists(str(main_state["paths"].base)) from e
 
-        for directory in [
-            main_state["paths"].base,
-            main_state["paths"].internet_search,
-        ]:
-            directory.mkdir(parents=True, exist_ok=True)
-            console.print(
-                f"[bold green]Directory '{directory}' created successfully![/bold green]"
-            )
+        main_state["paths"].internet_search.mkdir(parents=True, exist_ok=True)
+        console.print(
+            f"[bold green]Directory '{main_state['paths'].base}' created successfully![/bold green]"
+        )
         return main_state
 
     def youtube_content_strategist(self, main_state: MainGraphState) -> MainGraphState:
@@ -71,52 +138,202 @@ class YouTubeScriptGenerator:
             inputs: (YouTubeScriptInput)
             output: bool
         """
+        from src.blueprint import CreateBlueprint
+
         initial_blueprint = CreateBlueprint(main_state["paths"].base)
         intial_blueprint = initial_blueprint.generate(main_state["inputs"])
         main_state["intial_blueprint"] = intial_blueprint
         return main_state
 
-    def research_analyst(self, main_state: MainGraphState) -> MainGraphState:
+    def _stage_fingerprint(self, name: str, main_state: MainGraphState) -> str:
+        fields, artifacts = self.STAGE_INPUTS[name]
+        return RunCheckpoint.fingerprint(
+            name,
+            {field: getattr(main_state["inputs"], field) for field in fields},
+            *(main_state["paths"].base / artifact for artifact in artifacts),
+        )
+
+    def _research_section(
+        self,
+        main_state: MainGraphState,
+        index: int,
+        section: dict,
+        checkpoint: Optional[RunCheckpoint] = None,
+    ) -> Optional["GraphState"]:
+        """Runs the research workflow for a single blueprint section."""
+        from src.internet_research import Researcher, GraphState
+
+        topic = main_state["intial_blueprint"]["page_title"]
+        total = len(main_state["intial_blueprint"]["sections"])
+        input_hash = RunCheckpoint.fingerprint(topic, section, self.research_mode)
+        if checkpoint is not None and checkpoint.section_done(
+            "research_analyst", index, input_hash
+        ):
+            console.print(
+                f"[bold cyan]⏭️ Reusing checkpointed research for section {index + 1}[/bold cyan]"
+            )
+            ProgressBus.emit(
+                SECTION_FINISHED, "research_analyst", index=index, total=total, status="reused"
+            )
+            return None
+
+        ProgressBus.emit(SECTION_STARTED, "research_analyst", index=index, total=total)
+
+        initial_state = GraphState(
+            topic=topic,
+            iterations=index + 1,
+            section_info=section,
+            questions=[],
+            internet_search=[],
+        )
+
+        wiki_expert_dialogue = Researcher(
+            main_state["paths"].base, mode=self.research_mode
+        )
+        result = wiki_expert_dialogue.run(initial_state=initial_state)
+        if checkpoint is not None:
+            checkpoint.complete_section(
+                "research_analyst", index, f"internet_search/{index + 1}.json", input_hash
+            )
+        ProgressBus.emit(
+            SECTION_FINISHED, "research_analyst", index=index, total=total, status="completed"
+        )
+        return result
+
+    def research_analyst(
+        self, main_state: MainGraphState, config: "RunnableConfig"
+    ) -> MainGraphState:
         """## Agent: research_analyst
            ## Task: is to do internet research
 
+        Sections are researched concurrently, bounded by
+        `max_research_concurrency`. Each section still writes its own
+        `internet_search/{n}.json` and is checkpointed on its own.
+
         Args:
-            inputs (YouTubeScriptInput): _description_
+            main_state (MainGraphState): state holding the initial blueprint
+            config (RunnableConfig): run config carrying the checkpoint
 
         Returns:
-            bool: _description_
+            MainGraphState: unchanged state
         """
-        for index, section in enumerate(main_state["intial_blueprint"]["sections"]):
-            initial_state = GraphState(
-                topic=main_state["intial_blueprint"]["page_title"],
-                iterations=index + 1,
-                section_info=section,
-                questions=[],
-                internet_search=[],
-            )
+        sections = main_state["intial_blueprint"]["sections"]
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+        max_workers = min(self.max_research_concurrency, len(sections)) or 1
+        checkpoint = config["configurable"].get("checkpoint")
 
-            wiki_expert_dialogue = Researcher(main_state["paths"].base)
-            wiki_expert_dialogue.run(initial_state=initial_state)
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._research_section, main_state, index, section, checkpoint
+                )
+                for index, section in enumerate(sections)
+            ]
+            for future in futures:
+                future.result()
+        self._prune_research(main_state["paths"], len(sections), checkpoint)
         return main_state
 
+    @staticmethod
+    def _prune_research(
+        paths: ScriptPaths, total: int, checkpoint: Optional[RunCheckpoint]
+    ) -> None:
+        """Deletes research of sections past `total`, left behind when a derived
+        or resumed run regenerated a shorter blueprint; refinement reads every
+        file in `internet_search/`."""
+        if checkpoint is not None:
+            checkpoint.prune_sections("research_analyst", total)
+        for file in paths.internet_search.glob("*.json"):
+            if file.stem.isdigit() and int(file.stem) > total:
+                file.unlink()
+
     def youtube_script_architect(self, main_state: MainGraphState) -> MainGraphState:
+        from src.refined_blueprint import YouTubeScriptArchitect
+
         YouTubeScriptArchitect(
-            main_state["paths"], main_state["script_uuid"]
+            main_state["paths"],
+            main_state["script_uuid"],
+            max_research_tokens=self.max_research_tokens,
         ).refine_blueprint_run(main_state["inputs"], main_state["intial_blueprint"])
         return main_state
 
-    def youtube_script_writer(self, main_state: MainGraphState) -> MainGraphState:
-        generatearticle_obj = GenerateScript(refine_output=main_state["paths"].base)
-        generatearticle_obj.generate(main_state["inputs"])
-        return main_state
+    @staticmethod
+    def _language_targets(
+        inputs: YouTubeScriptInput,
+    ) -> List[Tuple[YouTubeScriptInput, Optional[str]]]:
+        """Returns (inputs, language tag) per target language.
+
+        Single-language runs get no tag and keep the plain output file names.
+        """
+        if not inputs.languages:
+            return [(inputs, None)]
+        return [
+            (replace(inputs, language=language), language_tag(language))
+            for language in inputs.target_languages()
+        ]
+
+    @staticmethod
+    def _description_file(tag: Optional[str]) -> str:
+        return "video_description.txt" if tag is None else f"video_description.{tag}.txt"
+
+    def _stage_artifacts(self, name: str, main_state: MainGraphState) -> List[str]:
+        if name == "youtube_description_writer":
+            return [
+                self._description_file(tag)
+                for _, tag in self._language_targets(main_state["inputs"])
+            ]
+        return self.STAGE_ARTIFACTS[name]
+
+    def youtube_script_writer(
+        self, main_state: MainGraphState, config: "RunnableConfig"
+    ) -> None:
+        """## Agent: youtube_script_writer
+
+        Writes the script once per target language, concurrently, from the
+        shared refined blueprint and research. Only the first language is
+        pushed to the live script stream.
+        """
+        from src.writer import GenerateScript
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+        targets = self._language_targets(main_state["inputs"])
+        stream = config["configurable"].get("script_stream")
+
+        def write(position: int, inputs: YouTubeScriptInput, tag: Optional[str]) -> None:
+            GenerateScript(
+                refine_output=main_state["paths"].base,
+                max_concurrency=self.max_writer_concurrency,
+                stream=stream if position == 0 else None,
+                checkpoint=config["configurable"].get("checkpoint"),
+                language_tag=tag,
+            ).generate(inputs)
+
+        with ContextThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [
+                executor.submit(write, position, inputs, tag)
+                for position, (inputs, tag) in enumerate(targets)
+            ]
+            for future in futures:
+                future.result()
+        # Runs beside the description writer: return no state update, since
+        # parallel branches may not both write the same keys.
+        return None
 
-    def create_description(self, main_state: MainGraphState) -> MainGraphState:
+    def create_description(self, main_state: MainGraphState) -> List[str]:
+        """Routes the refined blueprint to the stages that consume it.
+
+        The description only needs the refined blueprint, not the script, so
+        it is written in a parallel branch while the script is being written.
+        """
         if main_state["inputs"].description:
-            return "continue"
-        else:
-            return "end"
+            return ["youtube_script_writer", "youtube_description_writer"]
+        return ["youtube_script_writer"]
 
     def youtube_description_writer(self, main_state: MainGraphState):
+        from src.create_description import CreateDescription
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+
         with open(f"{main_state['paths'].base}/refined_blueprint.json", "r") as file:
             refine_blueprint = json.load(file)
 
@@ -128,52 +345,329 @@ class YouTubeScriptGenerator:
                 f"Section Description: {section['description']}\n"
                 f"Time of this section: {section['time']}"
             )
-        video_description = CreateDescription().generate_conclusion(refined_blueprint)
-        print(video_description)
 
-        with open(f"{self.paths.base}/video_description.txt", "w") as file:
-            file.write(video_description)
+        def describe(inputs: YouTubeScriptInput, tag: Optional[str]) -> None:
+            video_description = CreateDescription().generate_conclusion(
+                refined_blueprint, inputs.language
+            )
+            print(video_description)
 
-    def generate(self, inputs: YouTubeScriptInput):
-        if APIKeyManager.load_and_validate_keys():
-            print("✅ API keys are validated and set.")
-        else:
-            print("❌ Some API keys are missing. Please set them as instructed above.")
-        """Generates a new script with a unique ID."""
-        main_state = MainGraphState(
-            paths=self.paths,
-            script_uuid=self.script_uuid,
-            inputs=inputs,
-            intial_blueprint=None,
-            refined_blueprint=None,
-        )
+            with open(main_state["paths"].base / self._description_file(tag), "w") as file:
+                file.write(video_description)
+
+        targets = self._language_targets(main_state["inputs"])
+        with ContextThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [executor.submit(describe, inputs, tag) for inputs, tag in targets]
+            for future in futures:
+                future.result()
+
+    @classmethod
+    def _node(cls, name: str, timed: bool = True):
+        """Wraps a generator method so the graph can be compiled without binding `self`.
+
+        Like LangGraph nodes, methods that declare a `config` parameter also
+        receive the run config. `timed` nodes are recorded as a metrics stage,
+        publish progress events and, when the run has a checkpoint, are skipped
+        if a previous attempt already completed them from the same inputs
+        (see `STAGE_INPUTS`).
+        """
+        from langchain_core.runnables import RunnableConfig
+
+        wants_config = "config" in inspect.signature(getattr(cls, name)).parameters
+
+        def run(main_state: MainGraphState, config: RunnableConfig):
+            generator = config["configurable"]["generator"]
+            method = getattr(generator, name)
+            if not timed:
+                return method(main_state)
+
+            checkpoint = config["configurable"].get("checkpoint")
+            checkpointed = checkpoint is not None and name in cls.STAGE_ARTIFACTS
+            if checkpointed:
+                input_hash = generator._stage_fingerprint(name, main_state)
+                if checkpoint.stage_done(name, input_hash):
+                    console.print(f"[bold cyan]⏭️ Skipping completed stage: {name}[/bold cyan]")
+                    ProgressBus.emit(STAGE_SKIPPED, name)
+                    return None
+            ProgressBus.emit(STAGE_STARTED, name)
+            start = time.perf_counter()
+            try:
+                with RunMetrics.stage(name), RunTrace.span(name, "stage"):
+                    if wants_config:
+                        result = method(main_state, config)
+                    else:
+                        result = method(main_state)
+            except Exception:
+                ProgressBus.emit(STAGE_FAILED, name, elapsed=time.perf_counter() - start)
+                raise
+            ProgressBus.emit(STAGE_FINISHED, name, elapsed=time.perf_counter() - start)
+            if checkpointed:
+                checkpoint.complete_stage(
+                    name, generator._stage_artifacts(name, main_state), input_hash
+                )
+            return result
+
+        run.__name__ = name
+        return run
+
+    @classmethod
+    def _build_workflow(cls) -> "StateGraph":
+        from langgraph.graph import END, StateGraph
 
         workflow = StateGraph(MainGraphState)
         ## define all nodes
-        workflow.add_node("create_directory", self.create_directory)
-        workflow.add_node("youtube_content_strategist", self.youtube_content_strategist)
-        workflow.add_node("research_analyst", self.research_analyst)
-        workflow.add_node("youtube_script_architect", self.youtube_script_architect)
-        workflow.add_node("youtube_script_writer", self.youtube_script_writer)
-        workflow.add_node("youtube_description_writer", self.youtube_description_writer)
+        for name in [
+            "create_directory",
+            "youtube_content_strategist",
+            "research_analyst",
+            "youtube_script_architect",
+            "youtube_script_writer",
+            "youtube_description_writer",
+        ]:
+            workflow.add_node(name, cls._node(name))
         ## creating edges
         workflow.add_edge("create_directory", "youtube_content_strategist")
         workflow.add_edge("youtube_content_strategist", "research_analyst")
         workflow.add_edge("research_analyst", "youtube_script_architect")
-        workflow.add_edge("youtube_script_architect", "youtube_script_writer")
+        # Script and description both depend only on the refined blueprint:
+        # they run as parallel branches and the run ends once both finished.
         workflow.add_conditional_edges(
-            "youtube_script_writer",
-            self.create_description,
-            {
-                "end": END,
-                "continue": "youtube_description_writer",
-            },
+            "youtube_script_architect",
+            cls._node("create_description", timed=False),
+            ["youtube_script_writer", "youtube_description_writer"],
         )
+        workflow.add_edge("youtube_script_writer", END)
+        workflow.add_edge("youtube_description_writer", END)
         ## set-entry point
         workflow.set_entry_point("create_directory")
-        ## complile
-        app = workflow.compile()
+        return workflow
+
+    @classmethod
+    def compiled_app(cls):
+        """Returns the main graph, compiling it on first use."""
+        with cls._app_lock:
+            if cls._app is None:
+                cls._app = cls._build_workflow().compile()
+            return cls._app
+
+    def generate(
+        self,
+        inputs: YouTubeScriptInput,
+        script_uuid: Optional[str] = None,
+        stream: Optional[ScriptStream] = None,
+        progress: Optional[ProgressBus] = None,
+    ):
+        """Generates a new script with a unique ID.
+
+        `script_uuid` defaults to the ID picked when the generator was created;
+        pass a new one to reuse the same generator for further runs. When a
+        `stream` is given, script tokens are pushed to it live and it is
+        closed once the run ends, successfully or not. Stage and section
+        progress events are published on `progress`, and checkpointed in
+        `checkpoint.json` so a failed run can be `resume`d.
+        """
+        script_uuid = script_uuid or self.script_uuid
+        main_state = MainGraphState(
+            paths=ScriptPaths.from_base(self.output_folder / script_uuid),
+            script_uuid=script_uuid,
+            inputs=inputs,
+            intial_blueprint=None,
+            refined_blueprint=None,
+        )
+        checkpoint = RunCheckpoint(main_state["paths"].base, script_uuid, asdict(inputs))
+        self._run(main_state, checkpoint, stream, progress)
+
+    def resume(
+        self,
+        script_uuid: str,
+        stream: Optional[ScriptStream] = None,
+        progress: Optional[ProgressBus] = None,
+    ):
+        """Continues an earlier run, skipping every stage and section it completed.
+
+        The inputs are read back from the run's `checkpoint.json`.
+        """
+        base = self.output_folder / script_uuid
+        try:
+            checkpoint = RunCheckpoint.load(base)
+        except FileNotFoundError:
+            console.print(f"[bold red]No checkpoint found for run {script_uuid} in {base}[/bold red]")
+            raise
+
+        main_state = MainGraphState(
+            paths=ScriptPaths.from_base(base),
+            script_uuid=script_uuid,
+            inputs=YouTubeScriptInput(**checkpoint.inputs),
+            intial_blueprint=None,
+            refined_blueprint=None,
+        )
+        console.print(f"[bold green]🔁 Resuming run {script_uuid}[/bold green]")
+        self._run(main_state, checkpoint, stream, progress)
+
+    def derive(
+        self,
+        source_uuid: str,
+        script_uuid: Optional[str] = None,
+        stream: Optional[ScriptStream] = None,
+        progress: Optional[ProgressBus] = None,
+        **changes,
+    ):
+        """Creates a new run from an earlier one with some inputs changed.
+
+        `changes` are `YouTubeScriptInput` fields, e.g. `tone="Emotional"`.
+        The source run's artifacts are copied and only the stages whose
+        inputs changed are executed again; a new tone or language re-runs the
+        writer (and description) alone.
+        """
+        source = RunCheckpoint.load(self.output_folder / source_uuid)
+        source_inputs = YouTubeScriptInput(**source.inputs)
+        if "language" in changes:
+            # A single new language replaces the source's language list
+            changes.setdefault("languages", None)
+        inputs = replace(source_inputs, **changes)
+
+        script_uuid = script_uuid or self.new_run_id()
+        paths = ScriptPaths.from_base(self.output_folder / script_uuid)
+        paths.base.mkdir(parents=True)
+        checkpoint = source.derive(paths.base, script_uuid, asdict(inputs))
+        main_state = MainGraphState(
+            paths=paths,
+            script_uuid=script_uuid,
+            inputs=inputs,
+            intial_blueprint=None,
+            refined_blueprint=None,
+        )
+        self._prune_language_layout(main_state, checkpoint, source_inputs)
+        console.print(
+            f"[bold green]🧬 Deriving run {script_uuid} from {source_uuid}[/bold green]"
+        )
+        self._run(main_state, checkpoint, stream, progress)
+        return script_uuid
+
+    def _prune_language_layout(
+        self,
+        main_state: MainGraphState,
+        checkpoint: RunCheckpoint,
+        source_inputs: YouTubeScriptInput,
+    ) -> None:
+        """Deletes copied outputs that the derived run's languages do not produce.
+
+        Descriptions outside the new layout (e.g. `video_description.txt`
+        after switching to several languages) are removed, as are written
+        sections of languages no longer targeted. Sections of a target
+        language are kept in either layout, since the writer reuses them.
+        """
+        inputs = main_state["inputs"]
+        wanted = set()
+        if inputs.description:
+            wanted = set(self._stage_artifacts("youtube_description_writer", main_state))
+        for file in main_state["paths"].base.glob("video_description*.txt"):
+            if file.name not in wanted:
+                file.unlink()
+
+        writer = "youtube_script_writer"
+        targets = {language_tag(language) for language in inputs.target_languages()}
+        for stage in list(checkpoint.sections):
+            if stage == writer:
+                tag = language_tag(source_inputs.language)
+            elif stage.startswith(f"{writer}."):
+                tag = stage[len(writer) + 1 :]
+            else:
+                continue
+            if tag not in targets:
+                checkpoint.prune_sections(stage, 0)
+
+    def _run(
+        self,
+        main_state: MainGraphState,
+        checkpoint: RunCheckpoint,
+        stream: Optional[ScriptStream] = None,
+        progress: Optional[ProgressBus] = None,
+    ) -> None:
+        if APIKeyManager.load_and_validate_keys():
+            print("✅ API keys are validated and set.")
+        else:
+            print("❌ Some API keys are missing. Please set them as instructed above.")
+
+        # A reused blueprint is not produced by the graph, so load it up front
+        blueprint_hash = self._stage_fingerprint("youtube_content_strategist", main_state)
+        if checkpoint.stage_done("youtube_content_strategist", blueprint_hash):
+            with open(main_state["paths"].base / "blueprint.json", "r") as file:
+                main_state["intial_blueprint"] = json.load(file)
+
+        from src.cache import SQLiteLLMCache
+
+        from src.routing import ModelRouter
+
+        app = self.compiled_app()
+        metrics = RunMetrics(
+            run_id=main_state["script_uuid"],
+            routing={agent: asdict(route) for agent, route in ModelRouter.routes().items()},
+        )
+        trace = RunTrace(main_state["script_uuid"]) if RunTrace.enabled() else None
         ## invoke
-        app.invoke(main_state)
+        run_directory_taken = False
+        with ProgressBus.bind(progress, main_state["script_uuid"]):
+            try:
+                with metrics.activate(), self._tracing(trace), SQLiteLLMCache.bypass(
+                    not self.use_llm_cache
+                ):
+                    app.invoke(
+                        main_state,
+                        config={
+                            "configurable": {
+                                "generator": self,
+                                "script_stream": stream,
+                                "checkpoint": checkpoint,
+                            }
+                        },
+                    )
+            except RunDirectoryExists:
+                run_directory_taken = True
+                raise
+            finally:
+                if stream is not None:
+                    stream.close()
+                # Never write into another run's directory
+                if not run_directory_taken:
+                    checkpoint.set_status(metrics.status)
+                    self._save_metrics(main_state, metrics)
+                    if trace is not None:
+                        self._save_trace(main_state, trace)
+                ProgressBus.emit(RUN_FINISHED, status=metrics.status)
 
+    @staticmethod
+    def _tracing(trace: Optional[RunTrace]):
+        return trace.activate() if trace is not None else contextlib.nullcontext()
 
+    def _save_trace(self, main_state: MainGraphState, trace: RunTrace) -> None:
+        """Writes trace.json (Chrome trace format) and, when `TRACE_OTLP_ENDPOINT`
+        is set, sends the spans to that OTLP collector."""
+        trace.save(main_state["paths"].base / "trace.json")
+        endpoint = os.getenv("TRACE_OTLP_ENDPOINT")
+        if endpoint:
+            export_otlp(trace, endpoint)
+
+    def _save_metrics(self, main_state: MainGraphState, metrics: RunMetrics) -> None:
+        """Writes metrics.json beside the outputs and aggregates it across runs."""
+        metrics.save(main_state["paths"].base / "metrics.json")
+        MetricsStore(self.output_folder / "metrics.sqlite").record(metrics)
+
+        table = Table(title=f"Run {metrics.run_id} ({metrics.status})")
+        table.add_column("Stage", no_wrap=True)
+        for column in ["Model", "Wall (s)", "LLM calls", "Tokens in/out", "Cost ($)", "Cache hits (LLM/search)", "Searches", "Retries"]:
+            table.add_column(column)
+        rows = list(metrics.stages.items()) + [("total", metrics.totals())]
+        for name, stage in rows:
+            table.add_row(
+                name,
+                metrics.routing.get(name, {}).get("model", ""),
+                f"{stage.wall_time:.2f}",
+                str(stage.llm_calls),
+                f"{stage.prompt_tokens}/{stage.completion_tokens}",
+                f"{stage.cost_usd:.4f}",
+                f"{stage.llm_cache_hits}/{stage.search_cache_hits}",
+                str(stage.search_calls),
+                str(stage.retries),
+            )
+        console.print(table)
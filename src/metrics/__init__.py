@@ -0,0 +1,13 @@
+import importlib
+from src.metrics.run_metrics import RunMetrics, StageMetrics
+from src.metrics.store import MetricsStore
+
+
+def __getattr__(name: str):
+    # The callback handler imports LangChain; load it only when it is used
+    if name == "MetricsCallbackHandler":
+        return importlib.import_module("src.metrics.callback").MetricsCallbackHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__init__ = ["RunMetrics", "StageMetrics", "MetricsCallbackHandler", "MetricsStore"]
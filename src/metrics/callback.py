@@ -0,0 +1,75 @@
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from src.metrics.run_metrics import RunMetrics
+from src.routing import ModelRouter
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Reports latency, token usage and cache hits of every chat model call.
+
+    One handler is attached to each shared client; the numbers go to the
+    run that is active in the calling context (see `RunMetrics.activate`).
+    Token usage is priced with the model's rate from the routing table.
+    """
+
+    def __init__(self) -> None:
+        self._started: Dict[UUID, Tuple[float, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name")
+        with self._lock:
+            self._started[run_id] = (time.perf_counter(), model)
+
+    def _finish(self, run_id: UUID) -> Tuple[float, Optional[str]]:
+        """Returns the latency and model of a call that just ended."""
+        with self._lock:
+            started, model = self._started.pop(run_id, (None, None))
+        latency = time.perf_counter() - started if started is not None else 0.0
+        return latency, model
+
+    @staticmethod
+    def _usage(response: LLMResult) -> tuple:
+        prompt_tokens = completion_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    prompt_tokens += usage.get("input_tokens", 0)
+                    completion_tokens += usage.get("output_tokens", 0)
+        if not prompt_tokens and not completion_tokens and response.llm_output:
+            token_usage = response.llm_output.get("token_usage") or {}
+            prompt_tokens = token_usage.get("prompt_tokens", 0)
+            completion_tokens = token_usage.get("completion_tokens", 0)
+        return prompt_tokens, completion_tokens
+
+    @staticmethod
+    def _cached(response: LLMResult) -> bool:
+        return any(
+            getattr(generation, "message", None) is not None
+            and generation.message.response_metadata.get("cache_hit", False)
+            for generations in response.generations
+            for generation in generations
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        latency, model = self._finish(run_id)
+        prompt_tokens, completion_tokens = self._usage(response)
+        RunMetrics.record_llm_call(
+            latency,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached=self._cached(response),
+            cost=ModelRouter.cost(model, prompt_tokens, completion_tokens),
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        RunMetrics.record_llm_call(self._finish(run_id)[0], error=True)
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        RunMetrics.record_retry()
@@ -0,0 +1,164 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, Optional
+
+# Both values are inherited by threads started through ContextThreadPoolExecutor
+# and by LangGraph's node executor, so calls made deep inside an agent are
+# attributed to the run and stage that triggered them.
+_current_run: ContextVar[Optional["RunMetrics"]] = ContextVar(
+    "current_run_metrics", default=None
+)
+_current_stage: ContextVar[str] = ContextVar("current_stage", default="unknown")
+
+
+@dataclass
+class StageMetrics:
+    wall_time: float = 0.0
+    llm_calls: int = 0
+    llm_latency: float = 0.0
+    llm_errors: int = 0
+    llm_cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    search_calls: int = 0
+    search_latency: float = 0.0
+    search_cache_hits: int = 0
+    cost_usd: float = 0.0
+
+
+@dataclass
+class RunMetrics:
+    """Wall time, token, retry and cache counters for one pipeline run."""
+
+    run_id: str
+    started_at: float = field(default_factory=time.time)
+    wall_time: float = 0.0
+    status: str = "running"
+    stages: Dict[str, StageMetrics] = field(default_factory=dict)
+    # Model settings each agent ran with (see src.routing)
+    routing: Dict[str, dict] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current() -> Optional["RunMetrics"]:
+        return _current_run.get()
+
+    @contextmanager
+    def activate(self):
+        """Collects every metric recorded inside the block into this run."""
+        token = _current_run.set(self)
+        start = time.perf_counter()
+        try:
+            yield self
+            self.status = "completed"
+        except BaseException:
+            self.status = "failed"
+            raise
+        finally:
+            self.wall_time = time.perf_counter() - start
+            _current_run.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str):
+        """Attributes the block's wall time and nested calls to stage `name`."""
+        token = _current_stage.set(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            run = _current_run.get()
+            if run is not None:
+                with run._lock:
+                    run._stage(name).wall_time += time.perf_counter() - start
+            _current_stage.reset(token)
+
+    def _stage(self, name: str) -> StageMetrics:
+        if name not in self.stages:
+            self.stages[name] = StageMetrics()
+        return self.stages[name]
+
+    def _record(self, **increments) -> None:
+        with self._lock:
+            stage = self._stage(_current_stage.get())
+            for key, value in increments.items():
+                setattr(stage, key, getattr(stage, key) + value)
+
+    @classmethod
+    def record_llm_call(
+        cls,
+        latency: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached: bool = False,
+        error: bool = False,
+        cost: float = 0.0,
+    ) -> None:
+        run = cls.current()
+        if run is None:
+            return
+        if cached:
+            run._record(llm_cache_hits=1)
+            return
+        run._record(
+            llm_calls=1,
+            llm_latency=latency,
+            llm_errors=int(error),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=cost,
+        )
+
+    @classmethod
+    def record_search(cls, latency: float, cached: bool = False) -> None:
+        run = cls.current()
+        if run is None:
+            return
+        if cached:
+            run._record(search_cache_hits=1)
+        else:
+            run._record(search_calls=1, search_latency=latency)
+
+    @classmethod
+    def record_retry(cls) -> None:
+        run = cls.current()
+        if run is not None:
+            run._record(retries=1)
+
+    def totals(self) -> StageMetrics:
+        """Sums the counters of every stage (wall time is the run's own)."""
+        total = StageMetrics()
+        with self._lock:
+            for stage in self.stages.values():
+                for key, value in asdict(stage).items():
+                    setattr(total, key, getattr(total, key) + value)
+        total.wall_time = self.wall_time
+        return total
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stages = {name: asdict(stage) for name, stage in self.stages.items()}
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "wall_time": self.wall_time,
+            "status": self.status,
+            "routing": self.routing,
+            "totals": asdict(self.totals()),
+            "stages": stages,
+        }
+
+    def save(self, path: Path) -> None:
+        """Writes the metrics as JSON to `path`."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
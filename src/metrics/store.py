@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+from pathlib import Path
+from src.metrics.run_metrics import RunMetrics, StageMetrics
+
+_COLUMNS = list(StageMetrics.__dataclass_fields__)
+
+
+class MetricsStore:
+    """Aggregates run metrics across runs in a SQLite database.
+
+    `runs` holds one row of totals per run and `stages` one row per
+    (run, stage), so questions like "which stage dominates latency" are a
+    single query:
+
+        SELECT stage, AVG(wall_time) FROM stages GROUP BY stage ORDER BY 2 DESC;
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, database_path: str) -> None:
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        columns = ", ".join(f"{name} REAL NOT NULL DEFAULT 0" for name in _COLUMNS)
+        with self._lock, sqlite3.connect(str(self.database_path)) as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS runs ("
+                f"run_id TEXT PRIMARY KEY, started_at REAL, status TEXT, {columns})"
+            )
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS stages ("
+                f"run_id TEXT, stage TEXT, {columns}, PRIMARY KEY (run_id, stage))"
+            )
+            # Databases created before a counter was added get its column
+            for table in ("runs", "stages"):
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for name in _COLUMNS:
+                    if name not in existing:
+                        conn.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {name} REAL NOT NULL DEFAULT 0"
+                        )
+
+    def record(self, run: RunMetrics) -> None:
+        """Inserts (or replaces) the rows of one run."""
+        data = run.to_dict()
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        names = ", ".join(_COLUMNS)
+        with self._lock, sqlite3.connect(str(self.database_path)) as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO runs (run_id, started_at, status, {names}) "
+                f"VALUES (?, ?, ?, {placeholders})",
+                (
+                    data["run_id"],
+                    data["started_at"],
+                    data["status"],
+                    *(data["totals"][name] for name in _COLUMNS),
+                ),
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO stages (run_id, stage, {names}) "
+                f"VALUES (?, ?, {placeholders})",
+                [
+                    (data["run_id"], stage, *(values[name] for name in _COLUMNS))
+                    for stage, values in data["stages"].items()
+                ],
+            )
@@ -0,0 +1,4 @@
+from src.mock.mock_chat_model import MockChatModel
+from src.mock.mock_search import MockSearchTool
+
+__init__ = ["MockChatModel", "MockSearchTool"]
@@ -0,0 +1,155 @@
+import os
+import time
+import uuid
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+class MockChatModel(BaseChatModel):
+    """Offline stand-in for ChatOpenAI.
+
+    Plain calls return `completion_words` of filler text; structured-output
+    calls return a tool call whose arguments are synthesized from the bound
+    JSON schema, so `BluePrint`, `RefinedBluePrint` and friends parse as
+    usual. `latency` is paid once per call and `token_latency` per streamed
+    word, which keeps orchestration overhead measurable without a network.
+    """
+
+    model_name: str = "mock"
+    latency: float = 0.5
+    token_latency: float = 0.0
+    completion_words: int = 300
+    sections: int = 5
+    list_items: int = 3
+
+    @classmethod
+    def from_env(cls, model_name: str, **kwargs: Any) -> "MockChatModel":
+        """Builds a mock configured by the `MOCK_LLM_*` environment variables."""
+        return cls(
+            model_name=model_name,
+            latency=float(os.getenv("MOCK_LLM_LATENCY", 0.5)),
+            token_latency=float(os.getenv("MOCK_LLM_TOKEN_LATENCY", 0.0)),
+            completion_words=int(os.getenv("MOCK_LLM_COMPLETION_WORDS", 300)),
+            sections=int(os.getenv("MOCK_LLM_SECTIONS", 5)),
+            **kwargs,
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    @staticmethod
+    def _count_tokens(messages: List[BaseMessage]) -> int:
+        return sum(len(str(message.content)) for message in messages) // 4
+
+    def _fake_value(
+        self, schema: Dict, defs: Dict, name: str, index: int, seed: str
+    ) -> Any:
+        """Builds a value that validates against a JSON schema fragment.
+
+        Strings carry `seed` (a digest of the prompt) so different prompts
+        yield different questions, search queries and titles.
+        """
+        if "$ref" in schema:
+            schema = defs[schema["$ref"].split("/")[-1]]
+        if "anyOf" in schema:
+            schema = next(s for s in schema["anyOf"] if s.get("type") != "null")
+        kind = schema.get("type", "string")
+        if kind == "object":
+            return {
+                key: self._fake_value(value, defs, key, index, seed)
+                for key, value in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            count = self.sections if name == "sections" else self.list_items
+            return [
+                self._fake_value(schema.get("items", {}), defs, name, i, seed)
+                for i in range(count)
+            ]
+        if kind in ("integer", "number"):
+            return index
+        if kind == "boolean":
+            return True
+        if name == "time":
+            return f"[{index}-{index + 1} min]"
+        return f"Synthetic {name.replace('_', ' ')} {index + 1} ({seed})"
+
+    def _tool_call(self, tool: Dict, messages: List[BaseMessage]) -> Dict:
+        function = tool["function"]
+        parameters = function.get("parameters", {})
+        seed = hashlib.sha1(str(messages[-1].content).encode("utf-8")).hexdigest()[:6]
+        return {
+            "name": function["name"],
+            "args": self._fake_value(
+                parameters, parameters.get("$defs", {}), "", 0, seed
+            ),
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+        }
+
+    def _text(self, max_tokens: Optional[int] = None) -> List[str]:
+        """Filler words, cut at `max_tokens` (one token per word) like a real completion."""
+        words = self.completion_words if max_tokens is None else min(self.completion_words, max_tokens)
+        return [f"word{i}" for i in range(words)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        tools = kwargs.get("tools")
+        words = self._text(kwargs.get("max_tokens"))
+        usage = {
+            "input_tokens": self._count_tokens(messages),
+            "output_tokens": len(words),
+            "total_tokens": self._count_tokens(messages) + len(words),
+        }
+        if tools:
+            message = AIMessage(
+                content="", tool_calls=[self._tool_call(tools[0], messages)], usage_metadata=usage
+            )
+        else:
+            message = AIMessage(content=" ".join(words), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        words = self._text(kwargs.get("max_tokens"))
+        for i, word in enumerate(words):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            content = word if i == 0 else f" {word}"
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=content))
+            if run_manager:
+                run_manager.on_llm_new_token(content, chunk=chunk)
+            yield chunk
+        input_tokens = self._count_tokens(messages)
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                usage_metadata={
+                    "input_tokens": input_tokens,
+                    "output_tokens": len(words),
+                    "total_tokens": input_tokens + len(words),
+                },
+            )
+        )
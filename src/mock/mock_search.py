@@ -0,0 +1,47 @@
+import os
+import time
+import hashlib
+from typing import List
+from langchain_core.documents import Document
+
+
+class MockSearchTool:
+    """Offline stand-in for `YouSearchTool` returning synthetic web hits.
+
+    Results are deterministic per query so the search cache and the research
+    packer behave as they would with real data.
+    """
+
+    def __init__(
+        self, num_web_results: int = 2, latency: float = 0.3, result_chars: int = 1500
+    ) -> None:
+        self.num_web_results = num_web_results
+        self.latency = latency
+        self.result_chars = result_chars
+
+    @classmethod
+    def from_env(cls, num_web_results: int) -> "MockSearchTool":
+        """Builds a mock configured by the `MOCK_SEARCH_*` environment variables."""
+        return cls(
+            num_web_results=num_web_results,
+            latency=float(os.getenv("MOCK_SEARCH_LATENCY", 0.3)),
+            result_chars=int(os.getenv("MOCK_SEARCH_RESULT_CHARS", 1500)),
+        )
+
+    def run(self, query: str) -> List[Document]:
+        time.sleep(self.latency)
+        digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+        results = []
+        for i in range(self.num_web_results):
+            sentence = f"Result {i + 1} for {query} ({digest}) covers one aspect in detail. "
+            content = (sentence * (self.result_chars // len(sentence) + 1))[: self.result_chars]
+            results.append(
+                Document(
+                    page_content=content,
+                    metadata={
+                        "url": f"https://example.com/{digest}/{i + 1}",
+                        "title": f"{query} - result {i + 1}",
+                    },
+                )
+            )
+        return results
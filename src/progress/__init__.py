@@ -0,0 +1,27 @@
+from src.progress.progress_bus import (
+    ProgressBus,
+    ProgressEvent,
+    ProgressSubscription,
+    STAGE_STARTED,
+    STAGE_FINISHED,
+    STAGE_SKIPPED,
+    STAGE_FAILED,
+    SECTION_STARTED,
+    SECTION_FINISHED,
+    TOKENS,
+    RUN_FINISHED,
+)
+
+__init__ = [
+    "ProgressBus",
+    "ProgressEvent",
+    "ProgressSubscription",
+    "STAGE_STARTED",
+    "STAGE_FINISHED",
+    "STAGE_SKIPPED",
+    "STAGE_FAILED",
+    "SECTION_STARTED",
+    "SECTION_FINISHED",
+    "TOKENS",
+    "RUN_FINISHED",
+]
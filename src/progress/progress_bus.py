@@ -0,0 +1,123 @@
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bus and run ID of the pipeline run executing in this context; inherited by
+# ContextThreadPoolExecutor workers like the run metrics.
+_current_bus: ContextVar[Optional[tuple]] = ContextVar("current_progress_bus", default=None)
+
+STAGE_STARTED = "stage_started"
+STAGE_FINISHED = "stage_finished"
+STAGE_SKIPPED = "stage_skipped"
+STAGE_FAILED = "stage_failed"
+SECTION_STARTED = "section_started"
+SECTION_FINISHED = "section_finished"
+TOKENS = "tokens"
+RUN_FINISHED = "run_finished"
+
+
+@dataclass
+class ProgressEvent:
+    kind: str
+    run_id: str
+    stage: Optional[str] = None
+    index: Optional[int] = None
+    total: Optional[int] = None
+    # Chunks streamed so far by a `tokens` event (about one token each, but
+    # providers may batch several)
+    chunks: int = 0
+    status: Optional[str] = None
+    elapsed: Optional[float] = None
+    # Target language tag of writer events in multi-language runs
+    language: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+class ProgressSubscription:
+    """Blocking iterator over the events published after it was created.
+
+    Iteration ends after the `run_finished` event, or when `close` is called.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, bus: "ProgressBus") -> None:
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._unsubscribe = bus.subscribe(self._queue.put)
+
+    def close(self) -> None:
+        self._unsubscribe()
+        self._queue.put(self._CLOSED)
+
+    def __iter__(self) -> Iterator[ProgressEvent]:
+        while True:
+            event = self._queue.get()
+            if event is self._CLOSED:
+                return
+            yield event
+            if event.kind == RUN_FINISHED:
+                self._unsubscribe()
+                return
+
+
+class ProgressBus:
+    """In-process publish/subscribe channel for pipeline progress events.
+
+    Subscribers are called synchronously on the publishing thread, so they
+    must be quick; `subscription()` hands events to another thread through a
+    queue instead. A failing subscriber is logged and never breaks the run.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: List[Callable[[ProgressEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[ProgressEvent], None]) -> Callable[[], None]:
+        """Registers `callback` and returns a function that unregisters it."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def subscription(self) -> ProgressSubscription:
+        return ProgressSubscription(self)
+
+    def publish(self, event: ProgressEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"[bold red]❌ Progress subscriber failed:[/bold red] {e}")
+
+    @staticmethod
+    @contextmanager
+    def bind(bus: Optional["ProgressBus"], run_id: str):
+        """Routes `emit` calls made inside the block to `bus` (no-op for None)."""
+        token = _current_bus.set((bus, run_id) if bus is not None else None)
+        try:
+            yield bus
+        finally:
+            _current_bus.reset(token)
+
+    @staticmethod
+    def emit(kind: str, stage: Optional[str] = None, **fields) -> None:
+        """Publishes an event on the bus bound to the current run, if any."""
+        current = _current_bus.get()
+        if current is None:
+            return
+        bus, run_id = current
+        bus.publish(ProgressEvent(kind=kind, run_id=run_id, stage=stage, **fields))
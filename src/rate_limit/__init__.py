@@ -0,0 +1,17 @@
+from src.rate_limit.token_bucket import TokenBucket
+from src.rate_limit.limiter import (
+    AdaptiveRateLimiter,
+    RateLimiterCallbackHandler,
+    RateLimiterRegistry,
+    is_throttled,
+    retry_after,
+)
+
+__init__ = [
+    "TokenBucket",
+    "AdaptiveRateLimiter",
+    "RateLimiterCallbackHandler",
+    "RateLimiterRegistry",
+    "is_throttled",
+    "retry_after",
+]
@@ -0,0 +1,301 @@
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+from src.metrics import MetricsCallbackHandler
+from src.rate_limit.token_bucket import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+THROTTLED_STATUS = 429
+
+
+def is_throttled(error: BaseException) -> bool:
+    """True when `error` is a provider 429, whichever HTTP library raised it."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status == THROTTLED_STATUS
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked to wait before retrying, if it said so."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter(BaseRateLimiter):
+    """Requests/tokens per minute buckets plus an AIMD concurrency window.
+
+    Every call waits for a free slot in the window, one request from the RPM
+    bucket and an estimated number of tokens from the TPM bucket. Once the
+    call finishes the estimate is reconciled with the real usage. Each
+    successful call grows the window by roughly one slot per window's worth
+    of calls; a 429 halves it and pauses the buckets, and latencies far above
+    the running baseline shrink it slightly, so throughput settles just under
+    the provider's quota.
+
+    Acquired slots are tracked per thread, which matches how langchain calls
+    `acquire` and the callbacks of a request from the same thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        headroom: float = 0.9,
+        tokens_per_request: float = 1_000,
+        latency_factor: float = 3.0,
+        throttle_pause: float = 1.0,
+    ) -> None:
+        self.name = name
+        self.headroom = headroom
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_factor = latency_factor
+        self.throttle_pause = throttle_pause
+        self.requests = TokenBucket(requests_per_minute * headroom)
+        self.tokens = TokenBucket(tokens_per_minute * headroom)
+        # Quotas learned from response headers never override explicit ones
+        self._configured = (bool(requests_per_minute), bool(tokens_per_minute))
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+        self._tokens_per_request = tokens_per_request
+        self._latency_baseline: Optional[float] = None
+        self._latency_samples = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    def _held(self) -> list:
+        if not hasattr(self._local, "held"):
+            self._local.held = []
+        return self._local.held
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                if not blocking:
+                    return False
+                self._condition.wait()
+            self.in_flight += 1
+
+        estimate = self._tokens_per_request
+        if not (
+            self.requests.acquire(1, blocking=blocking)
+            and self.tokens.acquire(estimate, blocking=blocking)
+        ):
+            self._release_slot()
+            return False
+        self._held().append((time.perf_counter(), estimate))
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.acquire(blocking=blocking))
+
+    def _release_slot(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def release(
+        self,
+        tokens: Optional[int] = None,
+        output_tokens: int = 0,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Ends the call this thread acquired; a no-op if it holds none (e.g. cache hits)."""
+        held = self._held()
+        if not held:
+            return
+        started, estimate = held.pop()
+        latency = time.perf_counter() - started
+        self._release_slot()
+
+        if tokens:
+            self.tokens.debit(tokens - estimate)
+            self._tokens_per_request = 0.8 * self._tokens_per_request + 0.2 * tokens
+        if error is not None:
+            if is_throttled(error):
+                self.on_throttled(retry_after(error))
+            return
+        self._on_success(latency / max(output_tokens, 1))
+
+    def _on_success(self, latency: float) -> None:
+        with self._condition:
+            if self._latency_baseline is None:
+                self._latency_baseline = latency
+            slow = (
+                self._latency_samples >= 5
+                and latency > self.latency_factor * self._latency_baseline
+            )
+            self._latency_baseline = 0.9 * self._latency_baseline + 0.1 * latency
+            self._latency_samples += 1
+            if slow:
+                self._decrease(0.9)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def _decrease(self, factor: float) -> None:
+        """Caller holds the condition. At most one decrease per pause window."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.throttle_pause:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_concurrency, self.limit * factor)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease after a 429, pausing new requests briefly."""
+        with self._condition:
+            self.throttled += 1
+            self._decrease(0.5)
+        pause = retry_after if retry_after is not None else self.throttle_pause
+        self.requests.pause(pause)
+        self.tokens.pause(pause)
+        logger.warning(
+            f"[bold yellow]⚠️ {self.name} rate limited, concurrency now {int(self.limit)}[/bold yellow]"
+        )
+
+    def update_quota(
+        self, requests_per_minute: Optional[float], tokens_per_minute: Optional[float]
+    ) -> None:
+        """Adopts quotas reported by the provider unless they were configured."""
+        for bucket, quota, configured in (
+            (self.requests, requests_per_minute, self._configured[0]),
+            (self.tokens, tokens_per_minute, self._configured[1]),
+        ):
+            target = (quota or 0) * self.headroom
+            if quota and not configured and bucket.per_minute != target:
+                bucket.set_rate(target)
+
+    @contextmanager
+    def slot(self):
+        """Wraps a call that does not report through langchain callbacks."""
+        self.acquire()
+        try:
+            yield
+        except BaseException as error:
+            self.release(error=error)
+            raise
+        else:
+            self.release()
+
+    def callback_handler(self) -> "RateLimiterCallbackHandler":
+        return RateLimiterCallbackHandler(self)
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "requests_per_minute": self.requests.per_minute,
+            "tokens_per_minute": self.tokens.per_minute,
+        }
+
+
+class RateLimiterCallbackHandler(BaseCallbackHandler):
+    """Releases the limiter slot of a chat model call and reports its usage."""
+
+    def __init__(self, limiter: AdaptiveRateLimiter) -> None:
+        self.limiter = limiter
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens = MetricsCallbackHandler._usage(response)
+        self.limiter.release(
+            tokens=prompt_tokens + completion_tokens, output_tokens=completion_tokens
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self.limiter.release(error=error)
+
+
+class RateLimiterRegistry:
+    """Process-wide limiters, one per provider and model.
+
+    Quotas come from `<PROVIDER>_<MODEL>_RPM` / `_TPM` / `_MAX_CONCURRENCY`,
+    falling back to `<PROVIDER>_RPM` / `_TPM` / `_MAX_CONCURRENCY` (e.g.
+    `OPENAI_GPT_4O_TPM`, `OPENAI_RPM`, `YOU_RPM`). OpenAI quotas that are not
+    configured are learned from the `x-ratelimit-limit-*` response headers.
+    `RATE_LIMIT_HEADROOM` sets the fraction of the quota to aim for and
+    `RATE_LIMIT_DISABLED=1` turns limiting off.
+    """
+
+    _limiters: dict = {}
+    _lock = threading.Lock()
+    DEFAULT_MAX_CONCURRENCY = {"openai": 32, "you": 8}
+
+    @staticmethod
+    def _env(provider: str, model: str, setting: str) -> Optional[str]:
+        model_key = re.sub(r"[^A-Z0-9]+", "_", model.upper()).strip("_")
+        return os.getenv(f"{provider.upper()}_{model_key}_{setting}") or os.getenv(
+            f"{provider.upper()}_{setting}"
+        )
+
+    @classmethod
+    def get(cls, provider: str, model: str) -> Optional[AdaptiveRateLimiter]:
+        if os.getenv("RATE_LIMIT_DISABLED", "").lower() in ("1", "true", "yes"):
+            return None
+        key = (provider, model)
+        with cls._lock:
+            if key not in cls._limiters:
+                cls._limiters[key] = AdaptiveRateLimiter(
+                    f"{provider}/{model}",
+                    requests_per_minute=float(cls._env(provider, model, "RPM") or 0),
+                    tokens_per_minute=float(cls._env(provider, model, "TPM") or 0),
+                    max_concurrency=int(
+                        cls._env(provider, model, "MAX_CONCURRENCY")
+                        or cls.DEFAULT_MAX_CONCURRENCY.get(provider, 16)
+                    ),
+                    headroom=float(os.getenv("RATE_LIMIT_HEADROOM", 0.9)),
+                )
+            return cls._limiters[key]
+
+    @staticmethod
+    def _header(response, name: str) -> Optional[float]:
+        try:
+            return float(response.headers[name])
+        except (KeyError, ValueError):
+            return None
+
+    @classmethod
+    def http_response_hook(cls, response) -> None:
+        """httpx hook for the OpenAI client: learns quotas from response headers.
+
+        429s are not handled here: retries are left to `src.resilience`, so
+        they reach the limiter through the callback handler's `on_llm_error`.
+        """
+        limit_requests = cls._header(response, "x-ratelimit-limit-requests")
+        limit_tokens = cls._header(response, "x-ratelimit-limit-tokens")
+        if not (limit_requests or limit_tokens):
+            return
+        try:
+            model = json.loads(response.request.content)["model"]
+        except (ValueError, KeyError, TypeError):
+            return
+        limiter = cls.get("openai", model)
+        if limiter is None:
+            return
+        limiter.update_quota(limit_requests, limit_tokens)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._limiters.clear()
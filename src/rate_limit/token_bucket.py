@@ -0,0 +1,71 @@
+import time
+import threading
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `per_minute / 60` per second.
+
+    A rate of 0 means unlimited. The level may go negative: requests larger
+    than the bucket are let through once it is full, and `debit` records
+    usage discovered after the fact (e.g. real token counts), so callers
+    that come next wait the debt off.
+    """
+
+    def __init__(self, per_minute: float = 0, burst_seconds: float = 10.0) -> None:
+        self.burst_seconds = burst_seconds
+        self._lock = threading.Lock()
+        self._configure(per_minute)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    def _configure(self, per_minute: float) -> None:
+        self.per_minute = max(per_minute, 0)
+        self.rate = self.per_minute / 60.0
+        self.capacity = max(self.rate * self.burst_seconds, 1.0)
+
+    def set_rate(self, per_minute: float) -> None:
+        with self._lock:
+            was_unlimited = self.unlimited
+            self._refill()
+            self._configure(per_minute)
+            self._level = self.capacity if was_unlimited else min(self._level, self.capacity)
+
+    def _refill(self) -> None:
+        """Caller holds the lock."""
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1, blocking: bool = True) -> bool:
+        """Takes `amount` tokens, waiting for the bucket to refill if needed."""
+        while True:
+            with self._lock:
+                if self.unlimited:
+                    return True
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self._level >= needed:
+                    self._level -= amount
+                    return True
+                wait = (needed - self._level) / self.rate
+            if not blocking:
+                return False
+            time.sleep(min(wait, 1.0))
+
+    def debit(self, amount: float) -> None:
+        """Adjusts the level by usage measured after the request (negative refunds)."""
+        with self._lock:
+            if not self.unlimited:
+                self._refill()
+                self._level = min(self.capacity, self._level - amount)
+
+    def pause(self, seconds: float) -> None:
+        """Empties the bucket so nothing is let through for `seconds`."""
+        with self._lock:
+            if not self.unlimited:
+                self._refill()
+                self._level = min(self._level, -self.rate * seconds)
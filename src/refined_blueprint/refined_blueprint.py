@@ -5,38 +5,34 @@ from typing import List, Dict
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import chain
 from src.refined_blueprint.structured_output_schema import RefinedBluePrint
-from src.agent_prompt import GetPrompt
+from src.refined_blueprint.research_packer import ResearchPacker
+from src.agent_prompt import PromptRegistry
 from rich.console import Console
 from src.baseLLM import BaseLLM
+from src.resilience import CallPolicyRegistry
 
 # Initialize Rich Console
 console = Console()
 
 
 class YouTubeScriptArchitect(BaseLLM):
+    AGENT = "youtube_script_architect"
+
     def __init__(
         self,
         base_path: str,
         uuid: str,
-        model="gpt-4o",
+        model=None,
+        max_research_tokens: int = 8000,
     ):
         super().__init__(model)
         self.path = base_path
         self.uuid = uuid
+        self.research_packer = ResearchPacker(
+            token_budget=max_research_tokens, model=self.route.model
+        )
 
-    @staticmethod
-    def _fetch_prompt() -> str:
-        """Fetches the structured prompt for YouTube content strategy."""
-        return GetPrompt.get_prompt("youtube_script_architect")
-
-    def _get_prompt(self) -> ChatPromptTemplate:
-        """Creates a ChatPromptTemplate for refining the YouTube script blueprint."""
-        messages = [
-            ("system", self._fetch_prompt()),
-            (
-                "user",
-                (
-                    """
+    USER_PROMPT = """
                     Create and refine the YouTube script blueprint based on the following details:
                     
                     Video Title: {video_title}
@@ -47,36 +43,29 @@ class YouTubeScriptArchitect(BaseLLM):
                     
                     Generate the refined YouTube script blueprint.
                     """
-                ),
-            ),
-        ]
-        return ChatPromptTemplate.from_messages(messages)
+
+    def _get_prompt(self) -> ChatPromptTemplate:
+        """Returns the precompiled template for refining the YouTube script blueprint."""
+        return PromptRegistry.chat_template("youtube_script_architect", self.USER_PROMPT)
 
     def _get_internet_research(self, folder_path: str) -> str:
-        """Reads all JSON files in a folder and extracts internet search content."""
+        """Reads every section's search results and packs them into the token budget."""
         try:
-            json_files = [f for f in os.listdir(folder_path) if f.endswith(".json")]
-            internet_search_content = ""
-
+            # Numeric order: 1.json, 2.json, ..., 10.json
+            json_files = sorted(
+                (f for f in os.listdir(folder_path) if f.endswith(".json")),
+                key=lambda f: (len(f), f),
+            )
+            sections = []
             for file in json_files:
                 file_path = os.path.join(folder_path, file)
                 with open(file_path, "r") as f:
-                    data = json.load(f)
-                    section_title = data.get("section_info", {}).get(
-                        "section_title", "Unknown Section"
-                    )
-                    internet_search_text = "\n".join(
-                        [x["content"] for x in data.get("internet_search", [])]
-                    )
+                    sections.append(json.load(f))
 
-                    internet_search_content += (
-                        f"Section Title: {section_title}\n{internet_search_text}\n\n"
-                    )
-
-            return internet_search_content
+            return self.research_packer.pack(sections)
         except Exception as e:
             logging.error(f"Error reading JSON files from {folder_path}: {str(e)}")
-            return ""
+            raise
 
     def _get_intial_blueprint(self, initial_blueprint: Dict) -> str:
         """Formats the initial blueprint as a string."""
@@ -104,13 +93,15 @@ class YouTubeScriptArchitect(BaseLLM):
                 | self.llm.with_structured_output(RefinedBluePrint)
             )
 
-            refined_blueprint = refine_blueprint_chain.invoke(
-                {
-                    "video_title": inputs.video_title,
-                    "video_length": inputs.video_length,
-                    "initial_blueprint": initial_blueprint_str,
-                    "internet_research": internet_research,
-                }
+            refined_blueprint = CallPolicyRegistry.get("refine").run(
+                lambda: refine_blueprint_chain.invoke(
+                    {
+                        "video_title": inputs.video_title,
+                        "video_length": inputs.video_length,
+                        "initial_blueprint": initial_blueprint_str,
+                        "internet_research": internet_research,
+                    }
+                )
             )
 
             output_file = os.path.join(self.path.base, "refined_blueprint.json")
@@ -122,4 +113,4 @@ class YouTubeScriptArchitect(BaseLLM):
             return {"refined_output": refined_blueprint.dict()}
         except Exception as e:
             logging.error(f"Failed to refine blueprint: {str(e)}")
-            return {"refined_output": None}
+            raise
@@ -0,0 +1,207 @@
+import re
+import math
+import logging
+from collections import Counter
+from typing import Dict, List, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with langchain_openai
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+class ResearchPacker:
+    """Packs internet research into a fixed token budget for the architect.
+
+    Search hits are split into passages, exact and near-duplicate passages
+    are dropped across all sections, the remaining passages of each section
+    are ranked with BM25 against the section title and description, and the
+    budget is shared fairly between sections (water-filling: budget a section
+    cannot use is handed to the sections that still have passages left).
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 8000,
+        model: str = "gpt-4o",
+        max_passage_tokens: int = 300,
+        similarity_threshold: float = 0.8,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.token_budget = token_budget
+        self.max_passage_tokens = max_passage_tokens
+        self.similarity_threshold = similarity_threshold
+        self.k1 = k1
+        self.b = b
+        self.model = model
+        self._encoding = None
+        self._encoding_loaded = False
+
+    def _get_encoding(self):
+        """Loads the tiktoken encoding on first use, or None if unavailable."""
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            if tiktoken is not None:
+                try:
+                    try:
+                        self._encoding = tiktoken.encoding_for_model(self.model)
+                    except KeyError:
+                        self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    # tiktoken downloads its BPE files on first use
+                    logger.warning(f"tiktoken unavailable, estimating tokens: {e}")
+        return self._encoding
+
+    def count_tokens(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is None:
+            return max(1, len(text) // 4)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        return _WORD.findall(text.lower())
+
+    def _split_passages(self, content: str) -> List[str]:
+        """Splits a search hit into paragraph-sized passages."""
+        passages, current = [], []
+        current_tokens = 0
+        for paragraph in re.split(r"\n\s*\n|\n", content):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            tokens = self.count_tokens(paragraph)
+            if current and current_tokens + tokens > self.max_passage_tokens:
+                passages.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(paragraph)
+            current_tokens += tokens
+        if current:
+            passages.append(" ".join(current))
+        return passages
+
+    @staticmethod
+    def _shingles(words: List[str], size: int = 5) -> set:
+        if len(words) < size:
+            return {" ".join(words)}
+        return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+    def _is_duplicate(self, shingles: set, seen: List[set]) -> bool:
+        for other in seen:
+            union = len(shingles | other)
+            if union and len(shingles & other) / union >= self.similarity_threshold:
+                return True
+        return False
+
+    def _bm25_rank(self, query: str, passages: List[str]) -> List[int]:
+        """Returns passage indices ordered by BM25 relevance to `query`."""
+        documents = [self._words(passage) for passage in passages]
+        if not documents:
+            return []
+        average_length = sum(len(doc) for doc in documents) / len(documents) or 1
+        document_frequency = Counter(
+            word for doc in documents for word in set(doc)
+        )
+        query_words = set(self._words(query))
+
+        scores = []
+        for doc in documents:
+            frequencies = Counter(doc)
+            score = 0.0
+            for word in query_words:
+                if word not in frequencies:
+                    continue
+                n = document_frequency[word]
+                idf = math.log(1 + (len(documents) - n + 0.5) / (n + 0.5))
+                tf = frequencies[word]
+                score += idf * tf * (self.k1 + 1) / (
+                    tf + self.k1 * (1 - self.b + self.b * len(doc) / average_length)
+                )
+            scores.append(score)
+        # Ties keep the original search order
+        return sorted(range(len(documents)), key=lambda i: -scores[i])
+
+    def _allocate(self, ranked: List[List[tuple]]) -> Tuple[List[List[str]], int]:
+        """Fills the budget fairly across sections, in rank order.
+
+        Returns the selected passages per section and the tokens used.
+        """
+        selected = [[] for _ in ranked]
+        positions = [0] * len(ranked)
+        remaining = self.token_budget
+
+        while remaining > 0:
+            active = [i for i, passages in enumerate(ranked) if positions[i] < len(passages)]
+            if not active:
+                break
+            share = remaining // len(active)
+            progress = False
+            for i in active:
+                allowance = share
+                while positions[i] < len(ranked[i]):
+                    passage, tokens = ranked[i][positions[i]]
+                    if tokens > allowance or tokens > remaining:
+                        break
+                    selected[i].append(passage)
+                    allowance -= tokens
+                    remaining -= tokens
+                    positions[i] += 1
+                    progress = True
+            if not progress:
+                # No section can fit its next passage in an equal share: give
+                # the best single remaining passage that fits the total budget.
+                fits = [
+                    i for i in active if ranked[i][positions[i]][1] <= remaining
+                ]
+                if not fits:
+                    break
+                i = min(fits, key=lambda i: len(selected[i]))
+                passage, tokens = ranked[i][positions[i]]
+                selected[i].append(passage)
+                remaining -= tokens
+                positions[i] += 1
+        return selected, self.token_budget - remaining
+
+    def pack(self, sections: List[Dict]) -> str:
+        """Returns the packed research text for a list of `internet_search/*.json` payloads."""
+        seen: List[set] = []
+        ranked: List[List[tuple]] = []
+        total_tokens = 0
+
+        for data in sections:
+            info = data.get("section_info", {})
+            passages = []
+            for hit in data.get("internet_search", []):
+                for passage in self._split_passages(hit.get("content", "")):
+                    total_tokens += self.count_tokens(passage)
+                    shingles = self._shingles(self._words(passage))
+                    if self._is_duplicate(shingles, seen):
+                        continue
+                    seen.append(shingles)
+                    passages.append(passage)
+
+            query = f"{info.get('section_title', '')} {info.get('description', '')}"
+            order = self._bm25_rank(query, passages)
+            ranked.append(
+                [(passages[i], self.count_tokens(passages[i])) for i in order]
+            )
+
+        selected, used_tokens = self._allocate(ranked)
+
+        packed = ""
+        for data, passages in zip(sections, selected):
+            section_title = data.get("section_info", {}).get(
+                "section_title", "Unknown Section"
+            )
+            packed += f"Section Title: {section_title}\n" + "\n".join(passages) + "\n\n"
+
+        logger.info(
+            f"Packed internet research from {total_tokens} to "
+            f"{used_tokens} tokens (budget {self.token_budget})"
+        )
+        return packed
@@ -0,0 +1,15 @@
+from src.resilience.latency_tracker import LatencyTracker
+from src.resilience.policy import (
+    CallPolicy,
+    CallPolicyRegistry,
+    DeadlineExceeded,
+    is_retryable,
+)
+
+__init__ = [
+    "LatencyTracker",
+    "CallPolicy",
+    "CallPolicyRegistry",
+    "DeadlineExceeded",
+    "is_retryable",
+]
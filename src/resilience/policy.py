@@ -0,0 +1,366 @@
+import os
+import time
+import queue
+import random
+import logging
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+from src.metrics import RunMetrics
+from src.rate_limit import retry_after
+from src.resilience.latency_tracker import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Marks the end of a pumped stream
+_END = object()
+
+# Status codes worth another attempt
+RETRYABLE_STATUS = {408, 409, 429}
+# Transport failures of the OpenAI SDK, httpx and requests, matched by class
+# name so this module does not have to import the SDKs
+RETRYABLE_ERRORS = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "TimeoutException",
+    "TransportError",
+    "ConnectionError",
+    "Timeout",
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """An attempt did not finish within its call policy's deadline."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for timeouts, connection failures, 408/409/429 and 5xx responses."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+class CallPolicy:
+    """Deadline, retry and hedging policy for one type of LLM or search call.
+
+    Every attempt must finish within `timeout` seconds. Attempts failing
+    with a retryable error are repeated up to `max_attempts` times after a
+    full-jitter exponential backoff (at least the provider's `retry-after`).
+    With `hedge`, a duplicate request is sent once an attempt has run longer
+    than the `hedge_quantile` of recent latencies, and the first response
+    wins. Streams must deliver their first chunk within `timeout` and every
+    further chunk within `idle_timeout`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: Optional[float] = None,
+        max_attempts: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 10,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.idle_timeout = idle_timeout if idle_timeout and idle_timeout > 0 else None
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyTracker()
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return max(random.uniform(0, ceiling), retry_after(error) or 0.0)
+
+    def _retry_or_raise(self, attempt: int, error: BaseException) -> None:
+        """Sleeps before the next attempt, or re-raises when none is left."""
+        if attempt >= self.max_attempts or not is_retryable(error):
+            raise error
+        delay = self._backoff(attempt, error)
+        self._count("retries")
+        RunMetrics.record_retry()
+        logger.warning(
+            f"[bold yellow]⚠️ {self.name} call failed ({error!r}), "
+            f"retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s[/bold yellow]"
+        )
+        time.sleep(delay)
+
+    def run(self, fn: Callable[[], T]) -> T:
+        """Calls `fn` under this policy and returns the first successful result."""
+        attempt = 1
+        while True:
+            try:
+                return self._attempt(fn)
+            except Exception as e:
+                self._retry_or_raise(attempt, e)
+            attempt += 1
+
+    def stream(self, fn: Callable[[], Iterable[T]]) -> Iterator[T]:
+        """Yields the chunks of the iterable returned by `fn`.
+
+        The first chunk must arrive within `timeout` and each later one within
+        `idle_timeout` of the previous, otherwise `DeadlineExceeded` is
+        raised. Chunks already handed out cannot be taken back, so an attempt
+        is only retried while it has produced nothing. Streams are not hedged.
+        """
+        attempt = 1
+        while True:
+            chunks: queue.Queue = queue.Queue()
+            stop = threading.Event()
+            start = time.perf_counter()
+            self._pump(fn, chunks, stop)
+            received = False
+            try:
+                while True:
+                    try:
+                        if received:
+                            chunk = self._next_chunk(
+                                chunks, self.idle_timeout, "stalled for more than"
+                            )
+                        else:
+                            chunk = self._next_chunk(
+                                chunks, self.timeout, "sent nothing within"
+                            )
+                    except Exception as e:
+                        if received:
+                            raise
+                        self._retry_or_raise(attempt, e)
+                        break
+                    if chunk is _END:
+                        return
+                    if not received:
+                        received = True
+                        self.latency.record(time.perf_counter() - start)
+                    yield chunk
+            finally:
+                # Abandons the attempt on errors, deadlines and early exits
+                stop.set()
+            attempt += 1
+
+    @staticmethod
+    def _pump(fn: Callable[[], Iterable[T]], chunks: queue.Queue, stop: threading.Event) -> None:
+        """Moves the chunks of `fn()` into `chunks` on a daemon thread sharing
+        the caller's context. Once `stop` is set, the iterator is closed after
+        its next chunk, which ends the HTTP response and, through langchain's
+        error callbacks, frees its rate-limiter slot."""
+        context = contextvars.copy_context()
+
+        def target() -> None:
+            iterator = None
+            try:
+                iterator = iter(fn())
+                for chunk in iterator:
+                    if stop.is_set():
+                        break
+                    chunks.put((chunk, None))
+                chunks.put((_END, None))
+            except BaseException as e:
+                chunks.put((None, e))
+            finally:
+                close = getattr(iterator, "close", None)
+                if stop.is_set() and close is not None:
+                    close()
+
+        threading.Thread(target=lambda: context.run(target), daemon=True).start()
+
+    def _next_chunk(self, chunks: queue.Queue, timeout: Optional[float], reason: str):
+        try:
+            chunk, error = chunks.get(timeout=timeout)
+        except queue.Empty:
+            self._count("timeouts")
+            raise DeadlineExceeded(f"{self.name} stream {reason} {timeout:g}s") from None
+        if error is not None:
+            raise error
+        return chunk
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.quantile(self.hedge_quantile)
+
+    @staticmethod
+    def _submit(fn: Callable[[], T]) -> Future:
+        """Runs `fn` on a daemon thread sharing the caller's context (metrics,
+        progress bus, cache bypass)."""
+        future: Future = Future()
+        context = contextvars.copy_context()
+
+        def target() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = context.run(fn)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=target, daemon=True).start()
+        return future
+
+    def _attempt(self, fn: Callable[[], T]) -> T:
+        """Runs one attempt (plus its hedge) within the deadline.
+
+        Python threads cannot be cancelled, so an attempt that misses the
+        deadline, or loses to its hedge, is abandoned: its thread finishes in
+        the background, keeping its connection and rate-limiter slot until
+        then, and its result is discarded. LLM clients get their route's
+        timeout as HTTP timeout (`src.routing`), which bounds that to about
+        one more deadline.
+        """
+        hedge_delay = self._hedge_delay()
+        if self.timeout is None and hedge_delay is None:
+            start = time.perf_counter()
+            result = fn()
+            self.latency.record(time.perf_counter() - start)
+            return result
+
+        start = time.perf_counter()
+        deadline = start + self.timeout if self.timeout is not None else None
+        primary = self._submit(fn)
+        started = {primary: start}
+        if hedge_delay is not None:
+            if deadline is not None:
+                hedge_delay = min(hedge_delay, deadline - start)
+            done, _ = wait([primary], timeout=hedge_delay)
+            if not done:
+                hedge = self._submit(fn)
+                started[hedge] = time.perf_counter()
+                self._count("hedges")
+
+        pending = set(started)
+        error: Optional[BaseException] = None
+        while pending:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.latency.record(time.perf_counter() - started[future])
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        if not pending and error is not None:
+            raise error
+        self._count("timeouts")
+        raise DeadlineExceeded(f"{self.name} call exceeded its {self.timeout:g}s deadline")
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p95_latency": self.latency.quantile(0.95),
+        }
+
+
+class CallPolicyRegistry:
+    """Process-wide call policies, one per call type.
+
+    The deadline of an LLM call type is the `timeout` its agent is routed
+    with (`src/routing/model_routing.yaml`, `<AGENT>_TIMEOUT`), the same
+    value its client uses as HTTP timeout. Other settings below are
+    overridden with `RESILIENCE_<TYPE>_MAX_ATTEMPTS`, `_HEDGE`,
+    `_IDLE_TIMEOUT` and, for call types without an agent, `_TIMEOUT` (e.g.
+    `RESILIENCE_SEARCH_TIMEOUT=30`, `RESILIENCE_SEARCH_HEDGE=1`).
+    `RESILIENCE_DISABLED=1` makes every call a single attempt without
+    deadline or hedging.
+    """
+
+    # LLM call types and the agent whose routed timeout is their deadline
+    AGENTS = {
+        "question": "research_analyst",
+        "blueprint": "youtube_content_strategist",
+        "refine": "youtube_script_architect",
+        "section": "youtube_script_writer",
+        "description": "youtube_description_writer",
+    }
+    # (timeout seconds of non-LLM calls, max attempts, hedge)
+    DEFAULTS = {
+        "question": (None, 3, True),
+        "search": (20.0, 3, False),
+        "blueprint": (None, 3, False),
+        "refine": (None, 3, False),
+        "section": (None, 3, False),
+        "description": (None, 3, False),
+    }
+    # Longest pause allowed between two chunks of a stream
+    IDLE_TIMEOUT = 60.0
+
+    _policies: dict = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _flag(value: str) -> bool:
+        return value.lower() in ("1", "true", "yes")
+
+    @classmethod
+    def _timeout(cls, call_type: str, default: Optional[float]) -> Optional[float]:
+        if call_type in cls.AGENTS:
+            # Loads the routing table (and yaml) only once a call is made
+            from src.routing import ModelRouter
+
+            return ModelRouter.route(cls.AGENTS[call_type]).timeout
+        timeout = os.getenv(f"RESILIENCE_{call_type.upper()}_TIMEOUT")
+        return float(timeout) if timeout is not None else (default or 60.0)
+
+    @classmethod
+    def get(cls, call_type: str) -> CallPolicy:
+        with cls._lock:
+            if call_type not in cls._policies:
+                timeout, max_attempts, hedge = cls.DEFAULTS.get(call_type, (None, 3, False))
+                idle_timeout = cls.IDLE_TIMEOUT
+                prefix = f"RESILIENCE_{call_type.upper()}"
+                if cls._flag(os.getenv("RESILIENCE_DISABLED", "")):
+                    timeout, idle_timeout, max_attempts, hedge = None, None, 1, False
+                else:
+                    timeout = cls._timeout(call_type, timeout)
+                    idle_timeout = float(os.getenv(f"{prefix}_IDLE_TIMEOUT", idle_timeout))
+                    max_attempts = int(os.getenv(f"{prefix}_MAX_ATTEMPTS", max_attempts))
+                    hedge = cls._flag(os.getenv(f"{prefix}_HEDGE", str(hedge)))
+                cls._policies[call_type] = CallPolicy(
+                    call_type,
+                    timeout=timeout,
+                    max_attempts=max_attempts,
+                    hedge=hedge,
+                    idle_timeout=idle_timeout,
+                )
+            return cls._policies[call_type]
+
+    @classmethod
+    def stats(cls) -> list:
+        with cls._lock:
+            return [policy.stats() for policy in cls._policies.values()]
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._policies.clear()
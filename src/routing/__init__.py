@@ -0,0 +1,3 @@
+from src.routing.model_router import ModelRoute, ModelRouter
+
+__init__ = ["ModelRoute", "ModelRouter"]
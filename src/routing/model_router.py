@@ -0,0 +1,94 @@
+import os
+import threading
+from dataclasses import dataclass, fields, replace
+from importlib import resources
+from typing import Optional
+import yaml
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    model: str = "gpt-4o"
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    timeout: Optional[float] = None
+
+    def client_params(self) -> dict:
+        """Chat model parameters the route sets (provider defaults for the rest)."""
+        return {
+            name: getattr(self, name)
+            for name in ("temperature", "max_tokens", "timeout")
+            if getattr(self, name) is not None
+        }
+
+
+class ModelRouter:
+    """Routing table mapping each agent to its model, sampling and timeout.
+
+    Defaults come from the packaged `model_routing.yaml`. A file named by
+    `MODEL_ROUTING_PATH` is merged over it per agent, and single settings
+    are overridden by `<AGENT>_MODEL`, `<AGENT>_TEMPERATURE`,
+    `<AGENT>_MAX_TOKENS` and `<AGENT>_TIMEOUT` (e.g.
+    `RESEARCH_ANALYST_MODEL=gpt-4o`). The same file holds the per-token
+    prices used to report the cost of a run.
+    """
+
+    PACKAGE = "src.routing"
+    FILE_NAME = "model_routing.yaml"
+    _CASTS = {"model": str, "temperature": float, "max_tokens": int, "timeout": float}
+
+    _config: Optional[dict] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _load(cls) -> dict:
+        with cls._lock:
+            if cls._config is None:
+                resource = resources.files(cls.PACKAGE) / cls.FILE_NAME
+                config = yaml.safe_load(resource.read_text(encoding="utf-8")) or {}
+                path = os.getenv("MODEL_ROUTING_PATH")
+                if path:
+                    with open(path, "r", encoding="utf-8") as file:
+                        custom = yaml.safe_load(file) or {}
+                    for section in ("agents", "pricing"):
+                        merged = config.setdefault(section, {})
+                        for name, settings in (custom.get(section) or {}).items():
+                            merged[name] = {**merged.get(name, {}), **(settings or {})}
+                cls._config = config
+            return cls._config
+
+    @classmethod
+    def route(cls, agent: Optional[str]) -> ModelRoute:
+        """Returns the route of `agent` (the default route for unknown agents)."""
+        settings = dict((cls._load().get("agents") or {}).get(agent) or {})
+        if agent:
+            for name, cast in cls._CASTS.items():
+                value = os.getenv(f"{agent.upper()}_{name.upper()}")
+                if value:
+                    settings[name] = cast(value)
+        known = {f.name for f in fields(ModelRoute)}
+        return replace(ModelRoute(), **{k: v for k, v in settings.items() if k in known})
+
+    @classmethod
+    def routes(cls) -> dict:
+        """Returns the route of every agent in the routing table."""
+        return {agent: cls.route(agent) for agent in cls._load().get("agents") or {}}
+
+    @classmethod
+    def cost(cls, model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+        """USD cost of a call, 0.0 for models without a price."""
+        pricing = cls._load().get("pricing") or {}
+        matches = [name for name in pricing if model and model.startswith(name)]
+        if not matches:
+            return 0.0
+        price = pricing[max(matches, key=len)]
+        return (
+            prompt_tokens * price.get("input", 0.0)
+            + completion_tokens * price.get("output", 0.0)
+        ) / 1_000_000
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forgets the loaded table so the next lookup re-reads the files."""
+        with cls._lock:
+            cls._config = None
@@ -0,0 +1,13 @@
+import importlib
+from src.tracing.run_trace import RunTrace, Span
+from src.tracing.otlp_exporter import export_otlp
+
+
+def __getattr__(name: str):
+    # The callback handler imports LangChain; load it only when it is used
+    if name == "TracingCallbackHandler":
+        return importlib.import_module("src.tracing.callback").TracingCallbackHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__init__ = ["RunTrace", "Span", "TracingCallbackHandler", "export_otlp"]
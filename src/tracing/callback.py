@@ -0,0 +1,40 @@
+import threading
+from typing import Any, Dict
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from src.metrics import MetricsCallbackHandler
+from src.tracing.run_trace import RunTrace, Span
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """Records every chat model call as an `llm_call` span of the current run."""
+
+    def __init__(self) -> None:
+        self._spans: Dict[UUID, Span] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        params = kwargs.get("invocation_params") or {}
+        span = RunTrace.start_span(
+            "llm_call", "llm", model=params.get("model") or params.get("model_name")
+        )
+        if span is not None:
+            with self._lock:
+                self._spans[run_id] = span
+
+    def _pop(self, run_id: UUID):
+        with self._lock:
+            return self._spans.pop(run_id, None)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens = MetricsCallbackHandler._usage(response)
+        RunTrace.finish(
+            self._pop(run_id),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached=MetricsCallbackHandler._cached(response),
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        RunTrace.finish(self._pop(run_id), error)
@@ -0,0 +1,63 @@
+import logging
+from src.tracing.run_trace import RunTrace
+
+logger = logging.getLogger(__name__)
+
+
+def export_otlp(trace: RunTrace, endpoint: str) -> bool:
+    """Replays a finished trace to an OTLP/HTTP collector (e.g.
+    `http://localhost:4318/v1/traces`).
+
+    Needs the optional `opentelemetry-sdk` and
+    `opentelemetry-exporter-otlp-proto-http` packages; returns False when
+    they are missing or the export fails.
+    """
+    try:
+        from opentelemetry import trace as otel_trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        logger.warning(
+            "[bold yellow]⚠️ OTLP export needs opentelemetry-sdk and "
+            "opentelemetry-exporter-otlp-proto-http[/bold yellow]"
+        )
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "youtube-script-writer", "run.id": trace.run_id})
+    )
+    provider.add_span_processor(SimpleSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+    tracer = provider.get_tracer("src.tracing")
+
+    def nanos(t: float) -> int:
+        return int((trace.origin_wall + (t - trace.origin)) * 1e9)
+
+    # Spans are recorded in start order, so parents are replayed first
+    exported = {}
+    try:
+        for span in sorted(trace.spans, key=lambda s: s.start):
+            parent = exported.get(span.parent_id)
+            context = otel_trace.set_span_in_context(parent) if parent is not None else None
+            otel_span = tracer.start_span(
+                span.name,
+                context=context,
+                start_time=nanos(span.start),
+                attributes={
+                    "category": span.category,
+                    "thread.name": span.thread_name,
+                    **{key: str(value) for key, value in span.attributes.items()},
+                },
+            )
+            if span.status == "error":
+                otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+            exported[span.span_id] = otel_span
+        # End children before parents, as a live tracer would
+        for span in sorted(trace.spans, key=lambda s: s.start, reverse=True):
+            exported[span.span_id].end(end_time=nanos(span.start + span.duration))
+        provider.shutdown()
+    except Exception as e:
+        logger.error(f"[bold red]❌ OTLP export failed:[/bold red] {e}")
+        return False
+    return True
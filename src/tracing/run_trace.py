@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+# Trace of the run executing in this context and the innermost open span;
+# inherited by ContextThreadPoolExecutor workers like the run metrics.
+_current_trace: ContextVar[Optional["RunTrace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    span_id: int
+    parent_id: Optional[int]
+    start: float
+    thread_id: int
+    thread_name: str
+    end: Optional[float] = None
+    status: str = "ok"
+    attributes: dict = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class RunTrace:
+    """Spans of one pipeline run, with parent/child links across threads.
+
+    `activate` opens the root `run` span; code running inside it (including
+    worker threads that copy the context) opens children with `span`. The
+    trace is exported as Chrome trace JSON, viewable in Perfetto or
+    chrome://tracing, and optionally sent to an OTLP collector.
+    """
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # perf_counter is used for spans; the wall clock anchors it for export
+        self.origin = time.perf_counter()
+        self.origin_wall = time.time()
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.getenv("TRACE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+    @staticmethod
+    def current() -> Optional["RunTrace"]:
+        return _current_trace.get()
+
+    def _open(self, name: str, category: str, attributes: dict) -> Span:
+        parent = _current_span.get()
+        thread = threading.current_thread()
+        with self._lock:
+            span = Span(
+                name=name,
+                category=category,
+                span_id=next(self._ids),
+                parent_id=parent.span_id if parent is not None else None,
+                start=time.perf_counter(),
+                thread_id=thread.ident,
+                thread_name=thread.name,
+                attributes=attributes,
+            )
+            self.spans.append(span)
+        return span
+
+    @staticmethod
+    def finish(span: Optional[Span], error: Optional[BaseException] = None, **attributes) -> None:
+        """Closes a span opened with `start_span`."""
+        if span is None:
+            return
+        span.attributes.update(attributes)
+        if error is not None:
+            span.status = "error"
+            span.attributes["error"] = repr(error)
+        span.end = time.perf_counter()
+
+    @classmethod
+    def start_span(cls, name: str, category: str = "pipeline", **attributes) -> Optional[Span]:
+        """Opens a child of the current span without making it current (for
+        callbacks, whose start and end arrive separately). None when untraced."""
+        trace = cls.current()
+        if trace is None:
+            return None
+        return trace._open(name, category, attributes)
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, category: str = "pipeline", **attributes) -> Iterator[Optional[Span]]:
+        """Records the block as a child of the current span (no-op when untraced)."""
+        span = cls.start_span(name, category, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            cls.finish(span, e)
+            raise
+        finally:
+            _current_span.reset(token)
+            if span.end is None:
+                cls.finish(span)
+
+    @contextmanager
+    def activate(self):
+        """Traces everything run inside the block under a root `run` span."""
+        token = _current_trace.set(self)
+        try:
+            with self.span("run", "run", run_id=self.run_id):
+                yield self
+        finally:
+            _current_trace.reset(token)
+
+    def to_chrome_trace(self) -> dict:
+        """Chrome trace event format: one complete event per span, plus flow
+        arrows from a parent to children that ran on another thread."""
+        with self._lock:
+            spans = list(self.spans)
+        by_id = {span.span_id: span for span in spans}
+        # Small, stable thread numbers read better than OS thread idents
+        threads = {}
+        for span in spans:
+            threads.setdefault(span.thread_id, (len(threads) + 1, span.thread_name))
+
+        def micros(t: float) -> float:
+            return round((t - self.origin) * 1e6, 1)
+
+        events = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"run {self.run_id}"}}
+        ]
+        for tid, thread_name in threads.values():
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": thread_name}}
+            )
+        for span in spans:
+            tid = threads[span.thread_id][0]
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": micros(span.start),
+                    "dur": round(span.duration * 1e6, 1),
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {
+                        "span_id": span.span_id,
+                        "parent_id": span.parent_id,
+                        "status": span.status,
+                        **span.attributes,
+                    },
+                }
+            )
+            parent = by_id.get(span.parent_id)
+            if parent is not None and parent.thread_id != span.thread_id:
+                flow = {"name": "spawn", "cat": "flow", "id": span.span_id, "pid": 1}
+                events.append(
+                    {**flow, "ph": "s", "ts": micros(span.start), "tid": threads[parent.thread_id][0]}
+                )
+                events.append({**flow, "ph": "f", "bp": "e", "ts": micros(span.start), "tid": tid})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path: Path) -> None:
+        """Writes the Chrome trace JSON to `path`."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file, default=str)
@@ -1,3 +1,13 @@
-from src.writer.writer import GenerateScript
+import importlib
+from src.writer.script_file import ScriptFile
+from src.writer.script_stream import ScriptStream
 
-__init__ = ["GenerateScript"]
+
+def __getattr__(name: str):
+    # The writer agent imports LangChain; load it only when it is used
+    if name in ("GenerateScript", "SectionsFailed"):
+        return getattr(importlib.import_module("src.writer.writer"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__init__ = ["GenerateScript", "SectionsFailed", "ScriptFile", "ScriptStream"]
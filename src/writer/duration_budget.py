@@ -0,0 +1,148 @@
+import re
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class SpeakingRate:
+    # Spoken units per minute at a natural narration pace, and the average
+    # number of model tokens per unit. Languages written without spaces are
+    # counted in characters instead of words.
+    units_per_minute: float
+    tokens_per_unit: float
+    unit: str = "words"
+
+
+# Approximate narration rates; the token ratios are for gpt-4o's tokenizer
+SPEAKING_RATES = {
+    "english": SpeakingRate(150, 1.3),
+    "spanish": SpeakingRate(160, 1.5),
+    "french": SpeakingRate(150, 1.5),
+    "italian": SpeakingRate(150, 1.5),
+    "portuguese": SpeakingRate(150, 1.5),
+    "german": SpeakingRate(130, 1.7),
+    "dutch": SpeakingRate(140, 1.6),
+    "russian": SpeakingRate(120, 2.2),
+    "hindi": SpeakingRate(130, 2.5),
+    "arabic": SpeakingRate(120, 2.2),
+    "chinese": SpeakingRate(250, 1.0, "characters"),
+    "japanese": SpeakingRate(300, 1.0, "characters"),
+}
+# Unknown languages get a conservative token ratio so output is not cut short
+DEFAULT_SPEAKING_RATE = SpeakingRate(140, 2.0)
+
+_STAMP = r"(\d+):(\d{2})(?::(\d{2}))?"
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_UNIT = r"(hours?|hrs?|h|minutes?|mins?|m|seconds?|secs?|s)\b"
+_DASH = r"\s*(?:-|–|—|to)\s*"
+# "0:30 - 1:15", "1-3 min", "30 sec to 1 min", "1 min 30 sec"
+_STAMP_RANGE = re.compile(_STAMP + _DASH + _STAMP)
+_TIMESTAMP = re.compile(_STAMP)
+_RANGE = re.compile(rf"{_NUMBER}\s*(?:{_UNIT})?{_DASH}{_NUMBER}\s*(?:{_UNIT})?")
+_QUANTITY = re.compile(rf"{_NUMBER}\s*{_UNIT}")
+_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+
+
+def speaking_rate(language: str) -> SpeakingRate:
+    """Rate for `language`, matched by name (e.g. "Brazilian Portuguese")."""
+    language = (language or "").lower()
+    for name, rate in SPEAKING_RATES.items():
+        if name in language:
+            return rate
+    return DEFAULT_SPEAKING_RATE
+
+
+def _stamp_seconds(a: str, b: str, c: str) -> int:
+    return int(a) * 3600 + int(b) * 60 + int(c) if c else int(a) * 60 + int(b)
+
+
+def parse_time_range(text: str) -> Optional[float]:
+    """Seconds covered by a blueprint `time`; None when it cannot be read.
+
+    A range ("[2-5 min]", "[0:30 - 1:15]", "[15 sec to 1 min]") is a start
+    and an end mark; its start takes the end's unit when it has none, and
+    minutes are assumed when neither has one. Without a range, a single
+    timestamp ("[1:30]") or the sum of the quantities with a unit
+    ("[1 min 30 sec]") is the duration. Other numbers, such as a section
+    number, are ignored.
+    """
+    text = (text or "").lower()
+    match = _STAMP_RANGE.search(text)
+    if match:
+        groups = match.groups()
+        start, end = _stamp_seconds(*groups[:3]), _stamp_seconds(*groups[3:])
+    else:
+        match = _RANGE.search(text)
+        if match:
+            start, start_unit, end, end_unit = match.groups()
+            end_unit = end_unit or start_unit or "m"
+            start_unit = start_unit or end_unit
+            start = float(start) * _UNIT_SECONDS[start_unit[0]]
+            end = float(end) * _UNIT_SECONDS[end_unit[0]]
+        else:
+            match = _TIMESTAMP.search(text)
+            if match:
+                return _stamp_seconds(*match.groups()) or None
+            total = sum(
+                float(number) * _UNIT_SECONDS[unit[0]]
+                for number, unit in _QUANTITY.findall(text)
+            )
+            return total or None
+    duration = end - start
+    return duration if duration > 0 else None
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(round(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+@dataclass
+class SectionBudget:
+    """Length target of one section, derived from its allocated time."""
+
+    rate: SpeakingRate
+    allocated_seconds: Optional[float] = None
+    target_units: Optional[int] = None
+    max_tokens: Optional[int] = None
+
+    # Room above the target so the model can finish its sentence, plus the
+    # tokens of the section's formatting
+    SLACK = 1.5
+    OVERHEAD_TOKENS = 50
+
+    @classmethod
+    def for_section(
+        cls, time: str, language: str, max_tokens: Optional[int] = None
+    ) -> "SectionBudget":
+        """Budget for a section's `time`; `max_tokens` caps the result (e.g.
+        the writer route's own limit)."""
+        rate = speaking_rate(language)
+        seconds = parse_time_range(time)
+        if seconds is None:
+            return cls(rate, max_tokens=max_tokens)
+        target_units = max(1, round(seconds / 60 * rate.units_per_minute))
+        budget = math.ceil(target_units * rate.tokens_per_unit * cls.SLACK) + cls.OVERHEAD_TOKENS
+        if max_tokens:
+            budget = min(budget, max_tokens)
+        return cls(rate, seconds, target_units, budget)
+
+    def guidance(self) -> str:
+        """Length instruction for the writer prompt."""
+        if self.target_units is None:
+            return "Fill the allocated time"
+        return (
+            f"About {self.target_units} {self.rate.unit} "
+            f"({format_seconds(self.allocated_seconds)} of narration)"
+        )
+
+    def estimate_seconds(self, text: str) -> float:
+        """Narration time of `text` at this budget's speaking rate."""
+        if self.rate.unit == "characters":
+            units = len(re.sub(r"\s", "", text))
+        else:
+            units = len(text.split())
+        return units / self.rate.units_per_minute * 60
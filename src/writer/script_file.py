@@ -0,0 +1,93 @@
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class ScriptFile:
+    """Script output file that grows section by section, always in order.
+
+    Sections may complete in any order; each one is appended (and fsynced)
+    as soon as every section before it is on disk. An index file next to the
+    script (`script_output.index.json` for `script_output.txt`) is replaced
+    atomically after each append and lists the final sections with their
+    byte ranges, so readers can consume a partial script while it is being
+    written and never see a torn section, even after a crash.
+    """
+
+    def __init__(self, path: str, total: int) -> None:
+        self.path = Path(path)
+        self.index_path = self.index_path_for(self.path)
+        self.total = total
+        self._pending: Dict[int, Tuple[str, str]] = {}
+        self._next = 0
+        self._sections = []
+        self._size = 0
+        self._lock = threading.Lock()
+        # Start from an empty script and index
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8"):
+            pass
+        self._write_index()
+
+    @staticmethod
+    def index_path_for(path: Path) -> Path:
+        return Path(path).with_suffix(".index.json")
+
+    def commit(self, index: int, text: str, status: str = "completed") -> None:
+        """Records the final text of section `index`, appending every section
+        that is now next in order."""
+        with self._lock:
+            self._pending[index] = (text, status)
+            if self._next not in self._pending:
+                return
+            with self.path.open("a", encoding="utf-8") as file:
+                while self._next in self._pending:
+                    text, status = self._pending.pop(self._next)
+                    data = text.encode("utf-8")
+                    file.write(text)
+                    self._sections.append(
+                        {
+                            "index": self._next,
+                            "status": status,
+                            "offset": self._size,
+                            "length": len(data),
+                        }
+                    )
+                    self._size += len(data)
+                    self._next += 1
+                file.flush()
+                os.fsync(file.fileno())
+            self._write_index()
+
+    def _write_index(self) -> None:
+        """Caller holds the lock (or is the constructor)."""
+        payload = {
+            "total": self.total,
+            "complete": self._next >= self.total,
+            "bytes": self._size,
+            "sections": self._sections,
+        }
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump(payload, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    @classmethod
+    def read_final(cls, path: str) -> Tuple[str, Optional[dict]]:
+        """Returns the final part of a (possibly unfinished) script and its index.
+
+        Bytes past the indexed length, e.g. a section torn by a crash, are
+        ignored. Without an index the whole file is returned.
+        """
+        path = Path(path)
+        try:
+            with cls.index_path_for(path).open("r", encoding="utf-8") as file:
+                index = json.load(file)
+        except FileNotFoundError:
+            return path.read_text(encoding="utf-8"), None
+        with path.open("rb") as file:
+            return file.read(index["bytes"]).decode("utf-8"), index
@@ -0,0 +1,67 @@
+import threading
+from typing import Dict, Iterator, List, Set
+
+
+class ScriptStream:
+    """Thread-safe token stream that replays the script in section order.
+
+    The writer pushes tokens for many sections at once; iterating the stream
+    yields the text of section 0 as it arrives, then section 1, and so on,
+    buffering sections that finish early. Iteration ends once the stream is
+    closed and everything buffered has been yielded.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._buffers: Dict[int, List[str]] = {}
+        self._finished: Set[int] = set()
+        self._current = 0
+        self._closed = False
+        self.started = False
+
+    def push(self, index: int, token: str) -> None:
+        """Appends a token to the section at `index`."""
+        with self._cond:
+            self._buffers.setdefault(index, []).append(token)
+            self.started = True
+            self._cond.notify_all()
+
+    def end_section(self, index: int) -> None:
+        """Marks the section at `index` as complete."""
+        with self._cond:
+            self._finished.add(index)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Signals that no more tokens will be pushed."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _next_chunk(self):
+        """Blocks until text for the current section is ready. Returns None at the end."""
+        with self._cond:
+            while True:
+                buffer = self._buffers.get(self._current)
+                if buffer:
+                    chunk = "".join(buffer)
+                    buffer.clear()
+                    return chunk
+                if self._current in self._finished:
+                    self._current += 1
+                    continue
+                if self._closed:
+                    # Drain whatever is left from sections that never finished
+                    remaining = sorted(i for i in self._buffers if i > self._current)
+                    if not remaining:
+                        return None
+                    self._current = remaining[0]
+                    continue
+                self._cond.wait()
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return
+            yield chunk
@@ -1,28 +1,73 @@
 import os
 import json
+from pathlib import Path
 from rich.console import Console
+from rich.table import Table
 from rich.text import Text
-from rich.logging import RichHandler
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from src.agent_prompt import GetPrompt
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+from src.agent_prompt import PromptRegistry
 from src.baseLLM import BaseLLM
+from src.cache import SQLiteLLMCache
+from src.checkpoint import RunCheckpoint
+from src.datatypes import language_tag
+from src.resilience import CallPolicyRegistry
+from src.tracing import RunTrace
+from src.progress import ProgressBus, SECTION_STARTED, SECTION_FINISHED, TOKENS
+from src.writer.duration_budget import SectionBudget, format_seconds
+from src.writer.script_file import ScriptFile
+from src.writer.script_stream import ScriptStream
 
 
 # Initialize Rich console
 console = Console()
 
 
+class SectionsFailed(RuntimeError):
+    """Raised after the script was saved with placeholders for failed sections."""
+
+    def __init__(self, failed_sections: List[int], output_file: str) -> None:
+        self.failed_sections = sorted(failed_sections)
+        self.output_file = output_file
+        super().__init__(
+            f"{len(self.failed_sections)} section(s) failed: "
+            f"{[index + 1 for index in self.failed_sections]} (partial script in {output_file})"
+        )
+
+
 class GenerateScript(BaseLLM):
+    # Pipeline stage name used for section checkpoints and progress events
+    STAGE = "youtube_script_writer"
+    AGENT = STAGE
+
     def __init__(
         self,
         refine_output: str,
-        model="gpt-4o",
+        model=None,
+        max_concurrency: int = 4,
+        stream: Optional[ScriptStream] = None,
+        checkpoint: Optional[RunCheckpoint] = None,
+        language_tag: Optional[str] = None,
     ) -> None:
         super().__init__(model)
         self.output_folders = refine_output
         self.k = 2
+        self.max_concurrency = max(1, max_concurrency)
+        self.stream = stream
+        self.checkpoint = checkpoint
+        # Set when the run targets several languages: outputs and section
+        # checkpoints are then kept apart per language.
+        self.language_tag = language_tag
+        self.checkpoint_stage = (
+            self.STAGE if language_tag is None else f"{self.STAGE}.{language_tag}"
+        )
+        self.failed_sections: List[int] = []
+        self.duration_report: Dict[int, dict] = {}
 
         blueprint_path = os.path.join(refine_output, "refined_blueprint.json")
         try:
@@ -40,37 +85,37 @@ class GenerateScript(BaseLLM):
             )
             raise
 
-    @staticmethod
-    def _fetch_prompt() -> str:
-        """Fetches the structured prompt for YouTube content strategy."""
-        return GetPrompt.get_prompt("youtube_script_writer")
-
-    def _get_section_prompt(self):
-        """Generate the prompt for section writing."""
-        writer_prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", self._fetch_prompt()),
-                (
-                    "user",
-                    """
+    USER_PROMPT = """
                     Video Title: {video_title}\n
                     Full Video Length: {video_length}\n
                     Tone: {tone}\n
                     Section Name: {section_name}\n
                     Allocated Time: {allocated_Time}\n
+                    Target Length: {target_length}\n
                     Internet Search: {internet_search}\n
                     Language: {language}\n
                     Guidance: {guidance}
-                    """,
-                ),
-            ]
-        )
-        return writer_prompt
+                    """
+
+    def _get_section_prompt(self) -> ChatPromptTemplate:
+        """Returns the precompiled prompt for section writing."""
+        return PromptRegistry.chat_template("youtube_script_writer", self.USER_PROMPT)
+
+    def _section_cache_key(
+        self, writer_prompt: ChatPromptTemplate, payload: dict, budget: SectionBudget
+    ) -> Optional[Tuple[str, str]]:
+        """Prompt and LLM string a non-streamed call caches this section under
+        (as langchain computes them); None when the client has no LLM cache."""
+        if not isinstance(self.llm.cache, SQLiteLLMCache):
+            return None
+        kwargs = {} if budget.max_tokens is None else {"max_tokens": budget.max_tokens}
+        messages = writer_prompt.invoke(payload).to_messages()
+        return dumps(messages), self.llm._get_llm_string(**kwargs)
 
     def _generate_section(
-        self, index: int, section: Dict, data: List[str], inputs
+        self, index: int, section: Dict, data: List[str], inputs, budget: SectionBudget
     ) -> str:
-        """Generates content for a section."""
+        """Generates content for a section, bounded by its duration budget."""
         section_name = section["section_title"]
         section_description = section["description"]
         section_time = section["time"]
@@ -83,53 +128,302 @@ class GenerateScript(BaseLLM):
         )
 
         writer_prompt = self._get_section_prompt()
-        writer = writer_prompt | self.llm | StrOutputParser()
-
-        complete_output = writer.invoke(
-            {
-                "video_title": inputs.video_title,
-                "video_length": inputs.video_length,
-                "tone": inputs.tone,
-                "section_name": f"Title: {section_name}\nDescription: {section_description}",
-                "allocated_Time": section_time,
-                "internet_search": "\n".join(data),
-                "language": inputs.language,
-                "guidance": section_guidance,
-            }
+        llm = self.llm
+        if budget.max_tokens is not None:
+            llm = llm.bind(max_tokens=budget.max_tokens)
+        writer = writer_prompt | llm | StrOutputParser()
+
+        payload = {
+            "video_title": inputs.video_title,
+            "video_length": inputs.video_length,
+            "tone": inputs.tone,
+            "section_name": f"Title: {section_name}\nDescription: {section_description}",
+            "allocated_Time": section_time,
+            "target_length": budget.guidance(),
+            "internet_search": "\n".join(data),
+            "language": inputs.language,
+            "guidance": section_guidance,
+        }
+
+        policy = CallPolicyRegistry.get("section")
+        if self.stream is None:
+            return policy.run(lambda: writer.invoke(payload))
+
+        # langchain's stream() neither reads nor writes the LLM cache. A cached
+        # section is served through invoke (counted as a cache hit) as a
+        # single chunk, and streamed sections are stored under invoke's key.
+        cache_key = self._section_cache_key(writer_prompt, payload, budget)
+        if cache_key is not None and self.llm.cache.contains(*cache_key):
+            output = policy.run(lambda: writer.invoke(payload))
+            self.stream.push(index, output)
+            ProgressBus.emit(
+                TOKENS, self.STAGE, index=index, chunks=1, language=self.language_tag
+            )
+            return output
+
+        chunks = []
+        for chunk in policy.stream(lambda: writer.stream(payload)):
+            chunks.append(chunk)
+            self.stream.push(index, chunk)
+            ProgressBus.emit(
+                TOKENS,
+                self.STAGE,
+                index=index,
+                chunks=len(chunks),
+                language=self.language_tag,
+            )
+        output = "".join(chunks)
+        if cache_key is not None:
+            self.llm.cache.update(
+                *cache_key, [ChatGeneration(message=AIMessage(content=output))]
+            )
+        return output
+
+    @staticmethod
+    def _section_header(section: Dict) -> str:
+        return f"\n#### Section: {section['section_title']}\n[{section['time']}]: "
+
+    def _load_internet_search(self, index: int) -> List[str]:
+        """Loads the research collected for the section at `index`."""
+        internet_search_path = os.path.join(
+            self.output_folders, "internet_search", f"{index+1}.json"
         )
+        try:
+            with open(internet_search_path, "r") as file:
+                data = json.load(file)
+            return [x["content"] for x in data["internet_search"]]
+        except Exception as e:
+            console.print(
+                Text(
+                    f"⚠️ Failed to load internet search data: {str(e)}",
+                    style="bold red",
+                )
+            )
+            return []
 
-        return complete_output
+    def _section_file(self, index: int) -> str:
+        if self.language_tag is None:
+            return os.path.join("sections", f"{index+1}.txt")
+        return os.path.join("sections", self.language_tag, f"{index+1}.txt")
 
-    def generate(self, inputs):
-        """Main function to generate the entire script."""
-        sections = self.refine_blueprint["sections"]
-        complete_output = ""
-        console.print(Text("🔄 Research Workflow Initialized", style="bold green"))
-        for index, section in enumerate(sections):
-            internet_search_path = os.path.join(
-                self.output_folders, "internet_search", f"{index+1}.json"
+    @property
+    def output_file(self) -> str:
+        name = "script_output.txt"
+        if self.language_tag is not None:
+            name = f"script_output.{self.language_tag}.txt"
+        return os.path.join(self.output_folders, name)
+
+    def _report_file(self) -> str:
+        name = "duration_report.json"
+        if self.language_tag is not None:
+            name = f"duration_report.{self.language_tag}.json"
+        return os.path.join(self.output_folders, name)
+
+    def _record_duration(
+        self,
+        index: int,
+        section: Dict,
+        budget: SectionBudget,
+        output: Optional[str],
+        status: str,
+    ) -> None:
+        """Notes a section's allocated time against the narration time of its text."""
+        self.duration_report[index] = {
+            "section": index + 1,
+            "section_title": section["section_title"],
+            "time": section["time"],
+            "allocated_seconds": budget.allocated_seconds,
+            "target_length": budget.target_units,
+            "unit": budget.rate.unit,
+            "max_tokens": budget.max_tokens,
+            "estimated_seconds": budget.estimate_seconds(output) if output else None,
+            "status": status,
+        }
+
+    def _save_duration_report(self) -> None:
+        """Writes duration_report.json and prints estimated vs. allocated time."""
+        rows = [self.duration_report[index] for index in sorted(self.duration_report)]
+        with open(self._report_file(), "w") as file:
+            json.dump(rows, file, indent=4)
+
+        table = Table(title="Section duration (estimated vs. allocated)")
+        for column in ["Section", "Time", "Allocated", "Estimated", "Target", "Max tokens"]:
+            table.add_column(column)
+        for row in rows:
+            table.add_row(
+                f"{row['section']}. {row['section_title']}",
+                row["time"],
+                format_seconds(row["allocated_seconds"]),
+                format_seconds(row["estimated_seconds"]),
+                f"{row['target_length']} {row['unit']}" if row["target_length"] else "-",
+                str(row["max_tokens"] or "-"),
+            )
+        console.print(table)
+
+    def _checkpointed_section(
+        self, index: int, input_hash: str, language: str
+    ) -> Optional[str]:
+        """Text of the section if an earlier attempt wrote it from the same inputs.
+
+        Single-language runs checkpoint sections under `STAGE` and
+        multi-language runs under `STAGE.<tag>`; both are checked, so deriving
+        a run with more (or fewer) languages reuses the sections already
+        written. The fingerprint covers the language, so only sections of
+        this language match. Sections found under the other stage are copied
+        to this writer's own file and stage.
+        """
+        stages = dict.fromkeys(
+            [self.checkpoint_stage, self.STAGE, f"{self.STAGE}.{language_tag(language)}"]
+        )
+        for stage in stages:
+            if not self.checkpoint.section_done(stage, index, input_hash):
+                continue
+            artifact = self.checkpoint.section_artifact(stage, index)
+            with open(os.path.join(self.output_folders, artifact), "r") as file:
+                output = file.read()
+            if stage != self.checkpoint_stage:
+                self._save_section(index, output, input_hash)
+            return output
+        return None
+
+    def _section_fingerprint(self, index: int, section: Dict, inputs) -> str:
+        """Hashes everything a section's text depends on."""
+        return RunCheckpoint.fingerprint(
+            inputs.video_title,
+            inputs.video_length,
+            inputs.tone,
+            inputs.language,
+            section,
+            Path(self.output_folders) / "internet_search" / f"{index+1}.json",
+        )
+
+    def _save_section(self, index: int, output: str, input_hash: str) -> None:
+        """Persists a written section and checkpoints it."""
+        section_file = self._section_file(index)
+        path = os.path.join(self.output_folders, section_file)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w") as file:
+            file.write(output)
+        os.replace(f"{path}.tmp", path)
+        self.checkpoint.complete_section(
+            self.checkpoint_stage, index, section_file, input_hash
+        )
+
+    def _write_section(self, index: int, section: Dict, inputs) -> str:
+        """Loads a section's research and writes it, isolating failures.
+
+        Sections already checkpointed by an earlier attempt are read back
+        instead of being generated again.
+        """
+        with RunTrace.span(
+            "write_section", "writer", section=index + 1, language=inputs.language
+        ) as span:
+            total = len(self.refine_blueprint["sections"])
+            ProgressBus.emit(
+                SECTION_STARTED, self.STAGE, index=index, total=total, language=self.language_tag
+            )
+            if self.stream is not None:
+                self.stream.push(index, self._section_header(section))
+            input_hash = self._section_fingerprint(index, section, inputs)
+            budget = SectionBudget.for_section(
+                section["time"], inputs.language, self.route.max_tokens
             )
+            status = "failed"
+            output = None
             try:
-                with open(internet_search_path, "r") as file:
-                    data = json.load(file)
-                content = [x["content"] for x in data["internet_search"]]
+                if self.checkpoint is not None:
+                    output = self._checkpointed_section(index, input_hash, inputs.language)
+                if output is not None:
+                    console.print(
+                        Text(
+                            f"⏭️ Reusing checkpointed section: {section['section_title']}",
+                            style="bold cyan",
+                        )
+                    )
+                    if self.stream is not None:
+                        self.stream.push(index, output)
+                    status = "reused"
+                    return output
+
+                content = self._load_internet_search(index)
+                output = self._generate_section(index, section, content, inputs, budget)
+                if self.checkpoint is not None:
+                    self._save_section(index, output, input_hash)
+                status = "completed"
+                return output
             except Exception as e:
                 console.print(
                     Text(
-                        f"⚠️ Failed to load internet search data: {str(e)}",
+                        f"❌ Failed to generate section {section['section_title']}: {str(e)}",
                         style="bold red",
                     )
                 )
-                content = []
+                self.failed_sections.append(index)
+                placeholder = f"[Section generation failed: {str(e)}]"
+                if self.stream is not None:
+                    self.stream.push(index, placeholder)
+                return placeholder
+            finally:
+                self._record_duration(index, section, budget, output, status)
+                if span is not None:
+                    span.attributes["status"] = status
+                if self.stream is not None:
+                    self.stream.push(index, "\n")
+                    self.stream.end_section(index)
+                ProgressBus.emit(
+                    SECTION_FINISHED,
+                    self.STAGE,
+                    index=index,
+                    total=total,
+                    status=status,
+                    language=self.language_tag,
+                )
+
+    def generate(self, inputs):
+        """Main function to generate the entire script.
+
+        Sections are written concurrently (bounded by `max_concurrency`) and
+        appended to the output file in blueprint order as they become final
+        (see `ScriptFile`). A failed section is replaced by a placeholder so
+        the remaining sections are still saved, and `SectionsFailed` is raised
+        once the partial script is on disk, failing the stage so the run can
+        be resumed. When a `ScriptStream` is attached, tokens are pushed to it
+        as they arrive.
+        """
+        sections = self.refine_blueprint["sections"]
+        self.failed_sections = []
+        self.duration_report = {}
+        console.print(Text("🔄 Research Workflow Initialized", style="bold green"))
 
-            section_output = self._generate_section(index, section, content, inputs)
-            complete_output += f"\n#### Section: {section['section_title']}\n[{section['time']}]: {section_output}\n"
+        output_file = self.output_file
+        script_file = ScriptFile(output_file, len(sections))
 
+        def write(index: int, section: Dict) -> str:
+            text = self._write_section(index, section, inputs)
+            output = f"{self._section_header(section)}{text}\n"
+            status = "failed" if index in self.failed_sections else "completed"
+            script_file.commit(index, output, status)
+            return output
 
-        output_file = os.path.join(self.output_folders, "script_output.txt")
-        with open(output_file, "w") as file:
-            file.write(complete_output)
+        max_workers = min(self.max_concurrency, len(sections)) or 1
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(write, index, section)
+                for index, section in enumerate(sections)
+            ]
+            complete_output = "".join(future.result() for future in futures)
+        self._save_duration_report()
 
+        if self.failed_sections:
+            console.print(
+                Text(
+                    f"⚠️ {len(self.failed_sections)} section(s) failed: "
+                    f"{sorted(i + 1 for i in self.failed_sections)}",
+                    style="bold red",
+                )
+            )
+            raise SectionsFailed(self.failed_sections, output_file)
         console.print(
             Text(f"✅ Script generated and saved to {output_file}", style="bold green")
         )
+        return complete_output
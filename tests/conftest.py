@@ -0,0 +1,25 @@
+import pytest
+
+# Offline backends without latency, caches or tracing, so whole runs take seconds
+MOCK_ENVIRONMENT = {
+    "LLM_BACKEND": "mock",
+    "SEARCH_BACKEND": "mock",
+    "MOCK_LLM_LATENCY": "0",
+    "MOCK_SEARCH_LATENCY": "0",
+    "LLM_CACHE_DISABLED": "1",
+    "SEARCH_CACHE_DISABLED": "1",
+    "TRACE_DISABLED": "1",
+    "OPENAI_API_KEY": "test",
+    "YDC_API_KEY": "test",
+}
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """A YouTubeScriptGenerator on the mock backends, writing runs below `tmp_path`."""
+    for name, value in MOCK_ENVIRONMENT.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.chdir(tmp_path)
+    from src import YouTubeScriptGenerator
+
+    return YouTubeScriptGenerator(path=str(tmp_path / "scripts"))
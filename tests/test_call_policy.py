@@ -0,0 +1,239 @@
+import threading
+import pytest
+from src.resilience.policy import (
+    CallPolicy,
+    CallPolicyRegistry,
+    DeadlineExceeded,
+    is_retryable,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APIConnectionError(Exception):
+    """Named like the OpenAI SDK's transport error."""
+
+
+class Calls:
+    """Callable returning (or raising) the next of `outcomes` on each call."""
+
+    def __init__(self, *outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            outcome = self.outcomes[min(self.count, len(self.outcomes) - 1)]
+            self.count += 1
+        if callable(outcome):
+            outcome = outcome()
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def policy(**kwargs) -> CallPolicy:
+    kwargs.setdefault("backoff", 0.001)
+    return CallPolicy("test", **kwargs)
+
+
+@pytest.mark.parametrize(
+    "error, retryable",
+    [
+        (TimeoutError(), True),
+        (DeadlineExceeded(), True),
+        (ConnectionError(), True),
+        (APIConnectionError(), True),
+        (StatusError(408), True),
+        (StatusError(429), True),
+        (StatusError(503), True),
+        (StatusError(400), False),
+        (StatusError(401), False),
+        (ValueError("bad output"), False),
+    ],
+)
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def test_retries_retryable_errors():
+    call_policy = policy(max_attempts=3)
+    fn = Calls(StatusError(503), StatusError(429), "ok")
+
+    assert call_policy.run(fn) == "ok"
+    assert fn.count == 3
+    assert call_policy.stats()["retries"] == 2
+
+
+def test_gives_up_after_max_attempts():
+    call_policy = policy(max_attempts=2)
+    fn = Calls(StatusError(503))
+
+    with pytest.raises(StatusError):
+        call_policy.run(fn)
+    assert fn.count == 2
+
+
+def test_does_not_retry_client_errors():
+    call_policy = policy(max_attempts=3)
+    fn = Calls(StatusError(400), "ok")
+
+    with pytest.raises(StatusError):
+        call_policy.run(fn)
+    assert fn.count == 1
+    assert call_policy.stats()["retries"] == 0
+
+
+def test_deadline():
+    release = threading.Event()
+    call_policy = policy(timeout=0.05, max_attempts=1)
+
+    with pytest.raises(DeadlineExceeded, match="0.05s deadline"):
+        call_policy.run(Calls(lambda: release.wait(5)))
+    release.set()
+    assert call_policy.stats()["timeouts"] == 1
+
+
+def test_attempt_past_deadline_is_retried():
+    release = threading.Event()
+    call_policy = policy(timeout=0.05, max_attempts=2)
+    fn = Calls(lambda: release.wait(5), "ok")
+
+    assert call_policy.run(fn) == "ok"
+    release.set()
+    assert call_policy.stats()["timeouts"] == 1
+    assert call_policy.stats()["retries"] == 1
+
+
+def test_hedge_wins_against_straggler():
+    release = threading.Event()
+    call_policy = policy(timeout=5, hedge=True, hedge_min_samples=3)
+    for _ in range(3):
+        call_policy.latency.record(0.01)
+    fn = Calls(lambda: release.wait(5) and "straggler", "hedge")
+
+    assert call_policy.run(fn) == "hedge"
+    release.set()
+    assert fn.count == 2
+    assert call_policy.stats()["hedges"] == 1
+    assert call_policy.stats()["hedge_wins"] == 1
+
+
+def test_no_hedge_before_enough_samples():
+    call_policy = policy(timeout=5, hedge=True, hedge_min_samples=3)
+    fn = Calls("ok")
+
+    assert call_policy.run(fn) == "ok"
+    assert call_policy.stats()["hedges"] == 0
+    assert len(call_policy.latency) == 1
+
+
+def test_stream_retries_before_first_chunk():
+    call_policy = policy(max_attempts=2)
+    fn = Calls(StatusError(503), [1, 2, 3])
+
+    assert list(call_policy.stream(fn)) == [1, 2, 3]
+    assert fn.count == 2
+
+
+def test_stream_is_not_retried_after_first_chunk():
+    def chunks():
+        yield 1
+        raise StatusError(503)
+
+    call_policy = policy(max_attempts=3)
+    fn = Calls(chunks)
+    received = []
+
+    with pytest.raises(StatusError):
+        for chunk in call_policy.stream(fn):
+            received.append(chunk)
+    assert received == [1]
+    assert fn.count == 1
+
+
+def test_stream_first_chunk_deadline():
+    release = threading.Event()
+
+    def chunks():
+        release.wait(5)
+        yield 1
+
+    call_policy = policy(timeout=0.05, max_attempts=1)
+
+    with pytest.raises(DeadlineExceeded, match="sent nothing within 0.05s"):
+        list(call_policy.stream(chunks))
+    release.set()
+
+
+def test_stream_idle_timeout():
+    release = threading.Event()
+
+    def chunks():
+        yield 1
+        release.wait(5)
+        yield 2
+
+    call_policy = policy(timeout=5, idle_timeout=0.05, max_attempts=3)
+    received = []
+
+    with pytest.raises(DeadlineExceeded, match="stalled for more than 0.05s"):
+        for chunk in call_policy.stream(chunks):
+            received.append(chunk)
+    release.set()
+    assert received == [1]
+    assert call_policy.stats()["retries"] == 0
+
+
+def test_abandoned_stream_is_closed():
+    closed = threading.Event()
+
+    def chunks():
+        try:
+            while True:
+                yield "chunk"
+        finally:
+            closed.set()
+
+    stream = policy().stream(chunks)
+    assert next(stream) == "chunk"
+    stream.close()
+
+    assert closed.wait(5)
+
+
+@pytest.fixture
+def registry():
+    CallPolicyRegistry.clear()
+    yield CallPolicyRegistry
+    CallPolicyRegistry.clear()
+
+
+def test_registry_reads_environment(registry, monkeypatch):
+    monkeypatch.setenv("RESILIENCE_SEARCH_TIMEOUT", "7.5")
+    monkeypatch.setenv("RESILIENCE_SEARCH_MAX_ATTEMPTS", "5")
+    monkeypatch.setenv("RESILIENCE_SEARCH_HEDGE", "1")
+
+    search = registry.get("search")
+
+    assert registry.get("search") is search
+    assert (search.timeout, search.max_attempts, search.hedge) == (7.5, 5, True)
+    assert search.idle_timeout == registry.IDLE_TIMEOUT
+
+
+def test_registry_disabled(registry, monkeypatch):
+    monkeypatch.setenv("RESILIENCE_DISABLED", "1")
+
+    search = registry.get("search")
+
+    assert (search.timeout, search.idle_timeout, search.max_attempts, search.hedge) == (
+        None,
+        None,
+        1,
+        False,
+    )
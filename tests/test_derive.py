@@ -0,0 +1,151 @@
+import json
+from pathlib import Path
+from typing import Optional
+from src.checkpoint.run_checkpoint import RunCheckpoint
+from src.datatypes import YouTubeScriptInput
+
+WRITER = "youtube_script_writer"
+UPSTREAM = ["youtube_content_strategist", "research_analyst", "youtube_script_architect"]
+
+
+def inputs(**changes) -> YouTubeScriptInput:
+    fields = dict(
+        language="English",
+        tone="Fun",
+        video_length="5 min",
+        video_title="Bees",
+        description=True,
+    )
+    fields.update(changes)
+    return YouTubeScriptInput(**fields)
+
+
+def llm_calls(base: Path) -> dict:
+    with (base / "metrics.json").open("r", encoding="utf-8") as file:
+        stages = json.load(file)["stages"]
+    return {name: stage["llm_calls"] for name, stage in stages.items()}
+
+
+def outputs(base: Path) -> list:
+    return sorted(
+        str(path.relative_to(base))
+        for path in base.rglob("*")
+        if path.is_file() and path.suffix == ".txt"
+    )
+
+
+def sections(count: int, tag: Optional[str] = None) -> list:
+    folder = "sections" if tag is None else f"sections/{tag}"
+    return [f"{folder}/{i}.txt" for i in range(1, count + 1)]
+
+
+def test_prune_sections(tmp_path):
+    checkpoint = RunCheckpoint(tmp_path, "run")
+    (tmp_path / "sections").mkdir()
+    for index in range(4):
+        (tmp_path / "sections" / f"{index + 1}.txt").write_text("text", encoding="utf-8")
+        checkpoint.complete_section(WRITER, index, f"sections/{index + 1}.txt")
+
+    checkpoint.prune_sections(WRITER, 2)
+
+    assert sorted(checkpoint.sections[WRITER]) == ["0", "1"]
+    assert sorted(path.name for path in (tmp_path / "sections").iterdir()) == ["1.txt", "2.txt"]
+    assert RunCheckpoint.load(tmp_path).sections == checkpoint.sections
+
+    checkpoint.prune_sections(WRITER, 0)
+    assert WRITER not in checkpoint.sections
+    assert not list((tmp_path / "sections").iterdir())
+
+
+def test_checkpoint_derive_copies_artifacts_and_records(tmp_path):
+    source = RunCheckpoint(tmp_path / "source", "source", {"tone": "Fun"})
+    (tmp_path / "source" / "sections").mkdir(parents=True)
+    (tmp_path / "source" / "blueprint.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "source" / "sections" / "1.txt").write_text("text", encoding="utf-8")
+    source.complete_stage("youtube_content_strategist", ["blueprint.json"], "hash")
+    source.complete_section(WRITER, 0, "sections/1.txt", "hash")
+    (tmp_path / "derived").mkdir()
+
+    derived = source.derive(tmp_path / "derived", "derived", {"tone": "Emotional"})
+
+    assert (tmp_path / "derived" / "blueprint.json").read_text(encoding="utf-8") == "{}"
+    assert (tmp_path / "derived" / "sections" / "1.txt").read_text(encoding="utf-8") == "text"
+    assert derived.stage_done("youtube_content_strategist", "hash")
+    assert derived.section_done(WRITER, 0, "hash")
+    loaded = RunCheckpoint.load(tmp_path / "derived")
+    assert (loaded.run_id, loaded.inputs, loaded.status) == (
+        "derived",
+        {"tone": "Emotional"},
+        "running",
+    )
+    # The source run is left alone
+    assert RunCheckpoint.load(tmp_path / "source").inputs == {"tone": "Fun"}
+
+
+def test_derive_with_new_tone_reuses_research_and_architect(generator):
+    generator.generate(inputs(), script_uuid="source")
+
+    run = generator.derive("source", tone="Emotional")
+
+    base = generator.output_folder / run
+    calls = llm_calls(base)
+    assert all(calls.get(stage, 0) == 0 for stage in UPSTREAM)
+    assert calls.get("youtube_description_writer", 0) == 0
+    assert calls[WRITER] == 5
+    assert RunCheckpoint.load(base).inputs["tone"] == "Emotional"
+    assert RunCheckpoint.load(base).status == "completed"
+
+
+def test_derive_with_same_inputs_makes_no_calls(generator):
+    generator.generate(inputs(), script_uuid="source")
+
+    run = generator.derive("source")
+
+    base = generator.output_folder / run
+    assert sum(llm_calls(base).values()) == 0
+    assert outputs(base) == outputs(generator.output_folder / "source")
+
+
+def test_derive_with_new_title_regenerates_everything(generator):
+    generator.generate(inputs(), script_uuid="source")
+
+    run = generator.derive("source", video_title="Wasps")
+
+    calls = llm_calls(generator.output_folder / run)
+    assert all(calls[stage] > 0 for stage in UPSTREAM + [WRITER, "youtube_description_writer"])
+
+
+def test_derive_switches_language_layout(generator):
+    generator.generate(inputs(), script_uuid="source")
+
+    multi = generator.derive("source", languages=["English", "French"])
+
+    base = generator.output_folder / multi
+    calls = llm_calls(base)
+    assert all(calls.get(stage, 0) == 0 for stage in UPSTREAM)
+    # English sections are reused from the single-language run
+    assert calls[WRITER] == 5
+    assert calls["youtube_description_writer"] > 0
+    # The single-language English sections stay for a derive back to English
+    assert outputs(base) == sorted(
+        sections(5)
+        + sections(5, "english")
+        + sections(5, "french")
+        + [
+            "script_output.english.txt",
+            "script_output.french.txt",
+            "video_description.english.txt",
+            "video_description.french.txt",
+        ]
+    )
+
+    single = generator.derive(multi, language="French")
+
+    base = generator.output_folder / single
+    calls = llm_calls(base)
+    # French sections are reused from the multi-language run, English ones dropped
+    assert calls.get(WRITER, 0) == 0
+    assert outputs(base) == sorted(
+        sections(5) + sections(5, "french") + ["script_output.txt", "video_description.txt"]
+    )
+    assert not any(stage.endswith("english") for stage in RunCheckpoint.load(base).sections)
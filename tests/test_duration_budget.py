@@ -0,0 +1,83 @@
+import pytest
+from src.writer.duration_budget import (
+    DEFAULT_SPEAKING_RATE,
+    SPEAKING_RATES,
+    SectionBudget,
+    format_seconds,
+    parse_time_range,
+    speaking_rate,
+)
+
+
+@pytest.mark.parametrize(
+    "text, seconds",
+    [
+        # Ranges as the blueprint and refine prompts ask for them
+        ("[0-2 min]", 120),
+        ("[2-5 min]", 180),
+        ("0-5 sec", 5),
+        ("15-25 sec", 10),
+        ("[15-30 seconds]", 15),
+        ("[1.5-3 minutes]", 90),
+        ("[2 – 4 mins]", 120),
+        ("[30 sec - 1 min]", 30),
+        ("[15 sec to 1 min]", 45),
+        ("[0:30 - 1:15]", 45),
+        ("[1:00:00-1:02:30]", 150),
+        ("[0-1]", 60),
+        # A section number is not a start mark
+        ("[Section 2: 1-3 min]", 120),
+        # Durations
+        ("[1 min 30 sec]", 90),
+        ("[2 minutes]", 120),
+        ("[45s]", 45),
+        ("[1h 5m]", 3900),
+        ("[1:30]", 90),
+    ],
+)
+def test_parse_time_range(text, seconds):
+    assert parse_time_range(text) == pytest.approx(seconds)
+
+
+@pytest.mark.parametrize("text", ["", None, "[Intro]", "[5-2 min]", "[0 min]", "[Section 3]"])
+def test_parse_time_range_unreadable(text):
+    assert parse_time_range(text) is None
+
+
+def test_speaking_rate_matches_language_names():
+    assert speaking_rate("Brazilian Portuguese") is SPEAKING_RATES["portuguese"]
+    assert speaking_rate("ENGLISH") is SPEAKING_RATES["english"]
+    assert speaking_rate("Klingon") is DEFAULT_SPEAKING_RATE
+
+
+def test_format_seconds():
+    assert format_seconds(None) == "-"
+    assert format_seconds(89.6) == "1:30"
+    assert format_seconds(5) == "0:05"
+
+
+def test_section_budget_targets_allocated_time():
+    budget = SectionBudget.for_section("[1-3 min]", "English")
+    assert budget.allocated_seconds == 120
+    assert budget.target_units == 300
+    # 300 words * 1.3 tokens * 1.5 slack + 50 tokens of formatting
+    assert budget.max_tokens == 635
+    assert "300 words" in budget.guidance()
+    assert budget.estimate_seconds("word " * 300) == pytest.approx(120)
+
+
+def test_section_budget_capped_by_route():
+    assert SectionBudget.for_section("[0-10 min]", "English", max_tokens=500).max_tokens == 500
+
+
+def test_section_budget_counts_characters_for_chinese():
+    budget = SectionBudget.for_section("[0-1 min]", "Chinese")
+    assert budget.rate.unit == "characters"
+    assert budget.estimate_seconds("你好 世界" * 50) == pytest.approx(200 / 250 * 60)
+
+
+def test_section_budget_without_time_is_unbounded():
+    budget = SectionBudget.for_section("[Intro]", "English", max_tokens=800)
+    assert budget.target_units is None
+    assert budget.max_tokens == 800
+    assert budget.guidance() == "Fill the allocated time"
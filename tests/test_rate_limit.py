@@ -0,0 +1,226 @@
+import types
+import pytest
+from src.rate_limit import token_bucket
+from src.rate_limit.limiter import AdaptiveRateLimiter, is_throttled, retry_after
+from src.rate_limit.token_bucket import TokenBucket
+
+
+class FakeClock:
+    """Stands in for the `time` module: sleeping advances the clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(token_bucket, "time", clock)
+    return clock
+
+
+class ThrottledError(Exception):
+    def __init__(self, retry_after=None) -> None:
+        super().__init__("HTTP 429")
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = types.SimpleNamespace(status_code=429, headers=headers)
+
+
+def test_bucket_starts_full_and_refills(clock):
+    # 600 per minute is 10 per second, 100 after the default 10s burst
+    bucket = TokenBucket(per_minute=600)
+
+    assert bucket.acquire(100, blocking=False)
+    assert not bucket.acquire(1, blocking=False)
+    clock.now += 0.5
+    assert bucket.acquire(5, blocking=False)
+    assert not bucket.acquire(1, blocking=False)
+    # Never refills past its capacity
+    clock.now += 3600
+    assert bucket.acquire(100, blocking=False)
+    assert not bucket.acquire(1, blocking=False)
+
+
+def test_bucket_blocks_until_refilled(clock):
+    bucket = TokenBucket(per_minute=60, burst_seconds=1)
+
+    assert bucket.acquire(1)
+    assert bucket.acquire(1)
+    assert sum(clock.sleeps) == pytest.approx(1.0)
+
+
+def test_bucket_lets_oversized_requests_through_once_full(clock):
+    bucket = TokenBucket(per_minute=600)
+
+    assert bucket.acquire(250, blocking=False)
+    # The debt is waited off before anything else goes through
+    assert not bucket.acquire(1, blocking=False)
+    clock.now += 15
+    assert not bucket.acquire(1, blocking=False)
+    clock.now += 0.5
+    assert bucket.acquire(1, blocking=False)
+
+
+def test_bucket_debit_and_pause(clock):
+    bucket = TokenBucket(per_minute=600)
+
+    bucket.debit(-50)
+    bucket.debit(100)
+    assert not bucket.acquire(1, blocking=False)
+    clock.now += 10
+    assert bucket.acquire(100, blocking=False)
+
+    clock.now += 10
+    bucket.pause(2)
+    clock.now += 1.5
+    assert not bucket.acquire(1, blocking=False)
+    clock.now += 1
+    assert bucket.acquire(1, blocking=False)
+
+
+def test_unlimited_bucket(clock):
+    bucket = TokenBucket(per_minute=0)
+
+    assert bucket.unlimited
+    assert all(bucket.acquire(1_000_000, blocking=False) for _ in range(10))
+    bucket.pause(60)
+    assert bucket.acquire(1, blocking=False)
+
+
+def test_bucket_set_rate(clock):
+    bucket = TokenBucket(per_minute=0)
+
+    bucket.set_rate(600)
+    # An unlimited bucket starts full at its new rate
+    assert bucket.acquire(100, blocking=False)
+    assert not bucket.acquire(1, blocking=False)
+
+    bucket.set_rate(60)
+    assert bucket.capacity == 10
+    assert not bucket.acquire(1, blocking=False)
+
+
+def test_is_throttled_and_retry_after():
+    assert is_throttled(ThrottledError())
+    assert not is_throttled(ValueError())
+    assert retry_after(ThrottledError("2.5")) == 2.5
+    assert retry_after(ThrottledError()) is None
+    assert retry_after(ThrottledError("soon")) is None
+
+
+def test_window_bounds_in_flight_calls():
+    limiter = AdaptiveRateLimiter("test", max_concurrency=2)
+
+    assert limiter.acquire(blocking=False)
+    assert limiter.acquire(blocking=False)
+    assert not limiter.acquire(blocking=False)
+    assert limiter.in_flight == 2
+
+    limiter.release()
+    assert limiter.in_flight == 1
+    assert limiter.acquire(blocking=False)
+
+
+def test_release_without_slot_is_ignored():
+    limiter = AdaptiveRateLimiter("test")
+
+    limiter.release(tokens=100)
+
+    assert limiter.in_flight == 0
+    assert limiter.limit == limiter.max_concurrency
+
+
+def test_throttle_halves_window_once_per_pause():
+    limiter = AdaptiveRateLimiter("test", max_concurrency=16, throttle_pause=60)
+
+    limiter.on_throttled()
+    assert limiter.limit == 8
+    # Requests already in flight when the provider pushed back
+    limiter.on_throttled()
+    assert limiter.limit == 8
+    assert limiter.throttled == 2
+
+
+def test_throttle_respects_min_concurrency():
+    limiter = AdaptiveRateLimiter(
+        "test", max_concurrency=16, min_concurrency=3, throttle_pause=0
+    )
+
+    for _ in range(5):
+        limiter.on_throttled()
+
+    assert limiter.limit == 3
+
+
+def test_successes_grow_window_additively():
+    # Latency jitter of these instant calls must not count as slow responses
+    limiter = AdaptiveRateLimiter("test", max_concurrency=16, latency_factor=float("inf"))
+    limiter.on_throttled()
+
+    # About one slot per window's worth of successful calls
+    for _ in range(8):
+        assert limiter.acquire()
+        limiter.release(output_tokens=10)
+
+    assert 8.9 < limiter.limit < 9
+    for _ in range(200):
+        assert limiter.acquire()
+        limiter.release(output_tokens=10)
+    assert limiter.limit == 16
+
+
+def test_throttled_call_shrinks_window():
+    limiter = AdaptiveRateLimiter("test", max_concurrency=16)
+
+    limiter.acquire()
+    limiter.release(error=ThrottledError())
+    assert limiter.limit == 8
+    assert limiter.in_flight == 0
+
+    # Other failures leave the window alone
+    limiter.acquire()
+    limiter.release(error=ValueError())
+    assert limiter.limit == 8
+
+
+def test_token_estimate_is_reconciled(clock):
+    limiter = AdaptiveRateLimiter(
+        "test", tokens_per_minute=60_000, headroom=1.0, tokens_per_request=1_000
+    )
+
+    limiter.acquire()
+    limiter.release(tokens=5_000, output_tokens=100)
+
+    # 10,000 token burst, minus the 1,000 estimate, minus the 4,000 more used
+    assert not limiter.tokens.acquire(5_001, blocking=False)
+    assert limiter.tokens.acquire(5_000, blocking=False)
+    assert limiter._tokens_per_request == pytest.approx(1_800)
+
+
+def test_slot_releases_on_error():
+    limiter = AdaptiveRateLimiter("test", max_concurrency=16)
+
+    with pytest.raises(ThrottledError):
+        with limiter.slot():
+            assert limiter.in_flight == 1
+            raise ThrottledError()
+
+    assert limiter.in_flight == 0
+    assert limiter.limit == 8
+
+
+def test_update_quota_never_overrides_configuration():
+    limiter = AdaptiveRateLimiter("test", requests_per_minute=100, headroom=0.5)
+
+    limiter.update_quota(requests_per_minute=1_000, tokens_per_minute=200_000)
+
+    assert limiter.requests.per_minute == 50
+    assert limiter.tokens.per_minute == 100_000
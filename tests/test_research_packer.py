@@ -0,0 +1,122 @@
+import pytest
+from src.refined_blueprint import research_packer
+from src.refined_blueprint.research_packer import ResearchPacker
+
+
+@pytest.fixture
+def packer(monkeypatch):
+    # Token counts from the length estimate, without downloading BPE files
+    monkeypatch.setattr(research_packer, "tiktoken", None)
+    return ResearchPacker(token_budget=100)
+
+
+def passages(name, *tokens):
+    return [(f"{name}{i}", count) for i, count in enumerate(tokens)]
+
+
+def test_allocate_shares_budget_equally(packer):
+    ranked = [passages("a", *[10] * 10), passages("b", *[10] * 10)]
+
+    selected, used = packer._allocate(ranked)
+
+    assert selected == [["a0", "a1", "a2", "a3", "a4"], ["b0", "b1", "b2", "b3", "b4"]]
+    assert used == 100
+
+
+def test_allocate_hands_unused_share_to_other_sections(packer):
+    ranked = [passages("a", 10), passages("b", *[10] * 20), []]
+
+    selected, used = packer._allocate(ranked)
+
+    assert selected[0] == ["a0"]
+    assert len(selected[1]) == 9
+    assert selected[2] == []
+    assert used == 100
+
+
+def test_allocate_keeps_rank_order(packer):
+    # A passage that does not fit is not skipped for a lower-ranked one
+    ranked = [passages("a", 60, 5), passages("b", *[10] * 6)]
+
+    selected, used = packer._allocate(ranked)
+
+    assert selected == [[], ["b0", "b1", "b2", "b3", "b4", "b5"]]
+    assert used == 60
+
+
+def test_allocate_gives_oversized_passage_to_emptiest_section(packer):
+    # Neither passage fits an equal share, but one fits the whole budget
+    ranked = [passages("a", 70), passages("b", 70)]
+
+    selected, used = packer._allocate(ranked)
+
+    assert selected == [["a0"], []]
+    assert used == 70
+
+
+@pytest.mark.parametrize("budget", [0, 1, 37, 100, 1_000])
+def test_allocate_never_exceeds_budget(packer, budget):
+    packer.token_budget = budget
+    ranked = [passages("a", 3, 50, 7), passages("b", *range(1, 30)), passages("c", 99)]
+
+    selected, used = packer._allocate(ranked)
+
+    tokens = {passage: count for section in ranked for passage, count in section}
+    assert used == sum(tokens[passage] for section in selected for passage in section)
+    assert used <= budget
+
+
+def test_bm25_ranks_relevant_passages_first(packer):
+    ranked = packer._bm25_rank(
+        "solar panels",
+        [
+            "Wind turbines turn moving air into power.",
+            "Solar panels turn sunlight into power.",
+            "Hydro dams store water.",
+        ],
+    )
+
+    assert ranked[0] == 1
+
+
+def test_pack_drops_duplicates_across_sections(packer):
+    packer.token_budget = 1_000
+    shared = "Solar panels convert sunlight into electricity using photovoltaic cells."
+    sections = [
+        {
+            "section_info": {"section_title": "Solar", "description": "How solar works"},
+            "internet_search": [{"content": shared}],
+        },
+        {
+            "section_info": {"section_title": "Costs", "description": "What it costs"},
+            "internet_search": [
+                {"content": shared},
+                {"content": "Panel prices fell by ninety percent over a decade."},
+            ],
+        },
+    ]
+
+    packed = packer.pack(sections)
+
+    assert packed.count(shared) == 1
+    assert "Section Title: Solar\n" + shared in packed
+    assert "Section Title: Costs\nPanel prices fell" in packed
+
+
+def test_pack_respects_budget(packer):
+    packer.token_budget = 50
+    sections = [
+        {
+            "section_info": {"section_title": f"Section {i}"},
+            "internet_search": [
+                {"content": f"Distinct passage {i}.{j} " + "word " * 20} for j in range(10)
+            ],
+        }
+        for i in range(3)
+    ]
+
+    packed = packer.pack(sections)
+
+    passages_kept = [line for line in packed.splitlines() if line.startswith("Distinct")]
+    assert sum(packer.count_tokens(line) for line in passages_kept) <= 50
+    assert all(f"Section Title: Section {i}" in packed for i in range(3))
@@ -0,0 +1,159 @@
+import json
+from pathlib import Path
+import pytest
+from src.checkpoint.run_checkpoint import RunCheckpoint
+from src.datatypes import YouTubeScriptInput
+from src.writer.writer import GenerateScript, SectionsFailed
+
+WRITER = "youtube_script_writer"
+
+
+def inputs(**changes) -> YouTubeScriptInput:
+    fields = dict(
+        language="English",
+        tone="Fun",
+        video_length="5 min",
+        video_title="Bees",
+        description=True,
+    )
+    fields.update(changes)
+    return YouTubeScriptInput(**fields)
+
+
+def llm_calls(base: Path) -> dict:
+    with (base / "metrics.json").open("r", encoding="utf-8") as file:
+        stages = json.load(file)["stages"]
+    return {name: stage["llm_calls"] for name, stage in stages.items()}
+
+
+def section_texts(base: Path) -> dict:
+    return {path.name: path.read_text(encoding="utf-8") for path in (base / "sections").iterdir()}
+
+
+def test_fingerprint_covers_values_and_file_contents(tmp_path):
+    artifact = tmp_path / "blueprint.json"
+    artifact.write_text("one", encoding="utf-8")
+    first = RunCheckpoint.fingerprint("Bees", artifact)
+
+    assert RunCheckpoint.fingerprint("Bees", artifact) == first
+    assert RunCheckpoint.fingerprint("Wasps", artifact) != first
+    artifact.write_text("two", encoding="utf-8")
+    assert RunCheckpoint.fingerprint("Bees", artifact) != first
+    artifact.unlink()
+    assert RunCheckpoint.fingerprint("Bees", artifact) != first
+
+
+def test_fingerprint_reads_directories_recursively(tmp_path):
+    research = tmp_path / "internet_search"
+    (research / "nested").mkdir(parents=True)
+    (research / "1.json").write_text("{}", encoding="utf-8")
+    first = RunCheckpoint.fingerprint(research)
+
+    (research / "nested" / "2.json").write_text("{}", encoding="utf-8")
+
+    assert RunCheckpoint.fingerprint(research) != first
+
+
+def test_stage_done_requires_artifacts_and_matching_inputs(tmp_path):
+    checkpoint = RunCheckpoint(tmp_path, "run")
+    (tmp_path / "blueprint.json").write_text("{}", encoding="utf-8")
+
+    assert not checkpoint.stage_done("youtube_content_strategist")
+    checkpoint.complete_stage("youtube_content_strategist", ["blueprint.json"], "hash")
+
+    assert checkpoint.stage_done("youtube_content_strategist")
+    assert checkpoint.stage_done("youtube_content_strategist", "hash")
+    assert not checkpoint.stage_done("youtube_content_strategist", "other hash")
+    (tmp_path / "blueprint.json").unlink()
+    assert not checkpoint.stage_done("youtube_content_strategist", "hash")
+
+
+def test_section_done_requires_its_artifact(tmp_path):
+    checkpoint = RunCheckpoint(tmp_path, "run")
+    (tmp_path / "sections").mkdir()
+    (tmp_path / "sections" / "1.txt").write_text("text", encoding="utf-8")
+
+    checkpoint.complete_section(WRITER, 0, "sections/1.txt", "hash")
+
+    assert checkpoint.section_done(WRITER, 0, "hash")
+    assert not checkpoint.section_done(WRITER, 1, "hash")
+    assert not checkpoint.section_done(WRITER, 0, "other hash")
+    assert checkpoint.section_artifact(WRITER, 0) == "sections/1.txt"
+    assert checkpoint.section_artifact(WRITER, 1) is None
+    (tmp_path / "sections" / "1.txt").unlink()
+    assert not checkpoint.section_done(WRITER, 0, "hash")
+
+
+def test_load_round_trip(tmp_path):
+    checkpoint = RunCheckpoint(tmp_path, "run", {"tone": "Fun"})
+    checkpoint.complete_stage("create_directory")
+    checkpoint.complete_section(WRITER, 3, "sections/4.txt")
+    checkpoint.set_status("failed")
+
+    loaded = RunCheckpoint.load(tmp_path)
+
+    assert (loaded.run_id, loaded.inputs, loaded.status) == ("run", {"tone": "Fun"}, "failed")
+    assert loaded.stages == checkpoint.stages
+    assert loaded.sections == {WRITER: {"3": checkpoint.sections[WRITER]["3"]}}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_nothing_is_written_before_the_run_directory_exists(tmp_path):
+    checkpoint = RunCheckpoint(tmp_path / "run", "run")
+
+    checkpoint.complete_stage("create_directory")
+
+    assert not (tmp_path / "run").exists()
+
+
+def test_resume_rewrites_only_deleted_section(generator):
+    generator.generate(inputs(), script_uuid="run")
+    base = generator.output_folder / "run"
+    artifact = base / RunCheckpoint.load(base).section_artifact(WRITER, 1)
+    artifact.unlink()
+    # Sections that are reused keep their text, even an edited one
+    kept = {}
+    for path in (base / "sections").iterdir():
+        kept[path.name] = f"kept {path.stem}\n"
+        path.write_text(kept[path.name], encoding="utf-8")
+
+    generator.resume("run")
+
+    calls = llm_calls(base)
+    assert calls[WRITER] == 1
+    assert calls.get("research_analyst", 0) == 0
+    assert calls.get("youtube_content_strategist", 0) == 0
+    assert calls.get("youtube_script_architect", 0) == 0
+    texts = section_texts(base)
+    assert {name: texts[name] for name in kept} == kept
+    assert artifact.name in texts
+    script = (base / "script_output.txt").read_text(encoding="utf-8")
+    positions = [
+        script.index(text) for text in (kept["1.txt"], texts[artifact.name], kept["3.txt"])
+    ]
+    assert positions == sorted(positions)
+    assert RunCheckpoint.load(base).status == "completed"
+
+
+def test_resume_after_failed_section(generator, monkeypatch):
+    generate_section = GenerateScript._generate_section
+
+    def failing(self, index, *args):
+        if index == 2:
+            raise RuntimeError("401 unauthorized")
+        return generate_section(self, index, *args)
+
+    monkeypatch.setattr(GenerateScript, "_generate_section", failing)
+    with pytest.raises(SectionsFailed):
+        generator.generate(inputs(), script_uuid="run")
+    base = generator.output_folder / "run"
+    checkpoint = RunCheckpoint.load(base)
+    assert checkpoint.status == "failed"
+    assert not checkpoint.section_done(WRITER, 2)
+    assert checkpoint.section_done(WRITER, 1)
+
+    monkeypatch.setattr(GenerateScript, "_generate_section", generate_section)
+    generator.resume("run")
+
+    assert llm_calls(base)[WRITER] == 1
+    assert RunCheckpoint.load(base).status == "completed"
@@ -0,0 +1,89 @@
+import json
+import threading
+from src.writer.script_file import ScriptFile
+
+
+def read_index(script):
+    with ScriptFile.index_path_for(script).open("r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_starts_empty(tmp_path):
+    script = tmp_path / "script_output.txt"
+    script.write_text("left over from an earlier run", encoding="utf-8")
+
+    ScriptFile(script, total=2)
+
+    assert script.read_text(encoding="utf-8") == ""
+    assert read_index(script) == {"total": 2, "complete": False, "bytes": 0, "sections": []}
+
+
+def test_out_of_order_commits_are_written_in_order(tmp_path):
+    script = tmp_path / "script_output.txt"
+    output = ScriptFile(script, total=3)
+
+    output.commit(2, "three\n")
+    output.commit(1, "two\n")
+    # Nothing is appended until the first section is in
+    assert script.read_text(encoding="utf-8") == ""
+    assert read_index(script)["sections"] == []
+
+    output.commit(0, "one\n")
+    assert script.read_text(encoding="utf-8") == "one\ntwo\nthree\n"
+    index = read_index(script)
+    assert index["complete"] is True
+    assert [section["index"] for section in index["sections"]] == [0, 1, 2]
+
+
+def test_index_records_byte_ranges_and_status(tmp_path):
+    script = tmp_path / "script_output.txt"
+    output = ScriptFile(script, total=3)
+
+    output.commit(0, "Grüße\n")
+    output.commit(1, "[Section 2 failed]\n", status="failed")
+
+    index = read_index(script)
+    assert index["complete"] is False
+    data = script.read_bytes()
+    assert index["bytes"] == len(data)
+    first, second = index["sections"]
+    assert second["status"] == "failed"
+    assert data[first["offset"] : first["offset"] + first["length"]].decode("utf-8") == "Grüße\n"
+    assert second["offset"] == first["length"]
+
+
+def test_concurrent_commits(tmp_path):
+    script = tmp_path / "script_output.txt"
+    output = ScriptFile(script, total=20)
+
+    threads = [
+        threading.Thread(target=output.commit, args=(i, f"section {i}\n"))
+        for i in reversed(range(20))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert script.read_text(encoding="utf-8") == "".join(f"section {i}\n" for i in range(20))
+
+
+def test_read_final_ignores_torn_tail(tmp_path):
+    script = tmp_path / "script_output.txt"
+    output = ScriptFile(script, total=2)
+    output.commit(0, "one\n")
+    # A crash in the middle of appending the next section
+    with script.open("a", encoding="utf-8") as file:
+        file.write("tw")
+
+    text, index = ScriptFile.read_final(script)
+
+    assert text == "one\n"
+    assert index["bytes"] == 4
+
+
+def test_read_final_without_index(tmp_path):
+    script = tmp_path / "script_output.txt"
+    script.write_text("written before indexes existed", encoding="utf-8")
+
+    assert ScriptFile.read_final(script) == ("written before indexes existed", None)
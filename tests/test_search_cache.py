@@ -0,0 +1,179 @@
+import time
+import threading
+import pytest
+from src.cache.search_cache import SearchCache
+
+
+def results(query):
+    return [{"title": query, "content": f"about {query}"}]
+
+
+class CountingFetch:
+    """Search stand-in that counts its calls and can be held back."""
+
+    def __init__(self, release: threading.Event = None) -> None:
+        self.calls = []
+        self.release = release
+        self._lock = threading.Lock()
+
+    def __call__(self, query):
+        with self._lock:
+            self.calls.append(query)
+        if self.release is not None:
+            self.release.wait(5)
+        return results(query)
+
+
+@pytest.mark.parametrize(
+    "query, normalized",
+    [
+        ("What is X?", "what is x"),
+        ("  what   is\tX  ", "what is x"),
+        ('"quoted query"', "quoted query"),
+        ("ends with punctuation!?.", "ends with punctuation"),
+    ],
+)
+def test_normalize(query, normalized):
+    assert SearchCache.normalize(query) == normalized
+
+
+def test_normalize_keeps_symbols():
+    normalized = {SearchCache.normalize(query) for query in ("C++ tutorial", "C# tutorial", "C tutorial")}
+    assert len(normalized) == 3
+
+
+def test_equivalent_queries_share_an_entry():
+    cache = SearchCache(database_path=None)
+    fetch = CountingFetch()
+
+    cache.get_or_fetch("What is X?", 5, fetch)
+    assert cache.get_or_fetch("what is x", 5, fetch) == results("What is X?")
+    # The number of results is part of the key
+    cache.get_or_fetch("what is x", 10, fetch)
+
+    assert fetch.calls == ["What is X?", "what is x"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_concurrent_identical_queries_fetch_once():
+    cache = SearchCache(database_path=None)
+    release = threading.Event()
+    fetch = CountingFetch(release)
+    returned = []
+
+    threads = [
+        threading.Thread(target=lambda: returned.append(cache.get_or_fetch("query", 5, fetch)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    # Let every thread reach the cache before the search returns
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == ["query"]
+    assert returned == [results("query")] * 8
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_failed_fetch_reaches_waiters_and_is_not_cached():
+    cache = SearchCache(database_path=None)
+    release = threading.Event()
+    errors = []
+
+    def failing(query):
+        release.wait(5)
+        raise ConnectionError("search is down")
+
+    def search():
+        try:
+            cache.get_or_fetch("query", 5, failing)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    fetch = CountingFetch()
+    cache.get_or_fetch("query", 5, fetch)
+    assert fetch.calls == ["query"]
+
+
+def test_entries_expire(tmp_path, monkeypatch):
+    cache = SearchCache(database_path=str(tmp_path / "search.sqlite"), ttl_seconds=60)
+    fetch = CountingFetch()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.get_or_fetch("query", 5, fetch)
+
+    monkeypatch.setattr(time, "time", lambda: now + 30)
+    cache.get_or_fetch("query", 5, fetch)
+    assert len(fetch.calls) == 1
+
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    cache.get_or_fetch("query", 5, fetch)
+    assert len(fetch.calls) == 2
+
+
+def test_results_survive_a_restart(tmp_path):
+    database_path = str(tmp_path / "search.sqlite")
+    SearchCache(database_path=database_path).get_or_fetch("query", 5, CountingFetch())
+
+    fetch = CountingFetch()
+    assert SearchCache(database_path=database_path).get_or_fetch("query", 5, fetch) == results("query")
+    assert fetch.calls == []
+
+
+def test_memory_lru_is_bounded():
+    cache = SearchCache(database_path=None, max_entries=2)
+    fetch = CountingFetch()
+
+    for query in ("a", "b", "a", "c"):
+        cache.get_or_fetch(query, 5, fetch)
+
+    assert cache.stats()["entries"] == 2
+    # "b" was the least recently used entry
+    cache.get_or_fetch("a", 5, fetch)
+    cache.get_or_fetch("b", 5, fetch)
+    assert fetch.calls == ["a", "b", "c", "b"]
+
+
+def test_disk_rows_are_bounded(tmp_path, monkeypatch):
+    cache = SearchCache(
+        database_path=str(tmp_path / "search.sqlite"), max_entries=10, max_disk_entries=2
+    )
+    fetch = CountingFetch()
+    clock = iter(range(1_000_000, 1_000_100))
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+
+    for query in ("a", "b", "c"):
+        cache.get_or_fetch(query, 5, fetch)
+
+    keys = {row[0] for row in cache._conn.execute("SELECT key FROM search_cache")}
+    assert keys == {"5:b", "5:c"}
+
+
+def test_clear():
+    cache = SearchCache(database_path=None)
+    fetch = CountingFetch()
+    cache.get_or_fetch("query", 5, fetch)
+
+    cache.clear()
+    cache.get_or_fetch("query", 5, fetch)
+
+    assert len(fetch.calls) == 2
+    assert cache.stats() == {"hits": 0, "misses": 1, "coalesced": 0, "entries": 1}
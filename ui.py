@@ -1,8 +1,17 @@
 import streamlit as st
-import time
 import os
 import threading
-from src import YouTubeScriptInput, YouTubeScriptGenerator
+from src import YouTubeScriptInput, YouTubeScriptGenerator, ScriptStream
+from src.progress import (
+    ProgressBus,
+    STAGE_STARTED,
+    STAGE_FINISHED,
+    STAGE_SKIPPED,
+    STAGE_FAILED,
+    SECTION_STARTED,
+    SECTION_FINISHED,
+    TOKENS,
+)
 
 st.set_page_config(
     page_title="YouTube Script Generator", page_icon="🎬", layout="centered"
@@ -10,47 +19,84 @@ st.set_page_config(
 
 
 class YouTubeScriptApp:
+    STAGE_LABELS = {
+        "youtube_content_strategist": "📜 Blueprint Done ✅",
+        "research_analyst": "🔍 Internet Search Done ✅",
+        "youtube_script_architect": "📜 Refined Outline Done ✅",
+    }
+
     def __init__(self):
         self.script_generated = False
         self.yt_script_generator = YouTubeScriptGenerator()
+        self.script_stream = ScriptStream()
+        self.progress = ProgressBus()
+        self.progress.subscribe(self.track_run)
+        self.error = None
+        self.failed_stages = []
+        # Writer progress, updated from the pipeline threads
+        self.sections_total = 0
+        self.sections_written = 0
+        self.chunks = {}
 
     def run_generation(self, youtube_inputs):
         """Background function to run script generation."""
-        self.yt_script_generator.generate(youtube_inputs)
-        self.script_generated = True  # Mark process as completed
-
-    def check_script_status(self):
-        """Continuously check for each processing step in the background."""
-        path = self.yt_script_generator.paths.base
-        blueprint_done = search_done = refined_done = False
-
-        while not self.script_generated:
-            time.sleep(1)
-
-            if not blueprint_done and os.path.exists(
-                os.path.join(path, "blueprint.json")
-            ):
-                st.success("📜 Blueprint Done ✅")
-                blueprint_done = True
-
-            if not search_done and os.path.exists(
-                os.path.join(path, "internet_search")
-            ):
-                if any(
-                    f.endswith(".json")
-                    for f in os.listdir(os.path.join(path, "internet_search"))
-                ):
-                    st.info("🔍 Internet Search Done ✅")
-                    search_done = True
-
-            if not refined_done and os.path.exists(
-                os.path.join(path, "refined_blueprint.json")
-            ):
-                st.success("📜 Refined Outline Done ✅")
-                refined_done = True
-
-            if self.script_generated:
-                break
+        try:
+            self.yt_script_generator.generate(
+                youtube_inputs, stream=self.script_stream, progress=self.progress
+            )
+        except Exception as e:
+            self.error = e
+        finally:
+            self.script_generated = True  # Mark process as completed
+
+    def track_run(self, event):
+        """Bus callback recording failures and the writer's progress."""
+        if event.kind == STAGE_FAILED:
+            self.failed_stages.append(event.stage)
+        if event.stage != "youtube_script_writer":
+            return
+        if event.kind == SECTION_STARTED:
+            self.sections_total = event.total
+        elif event.kind == SECTION_FINISHED:
+            self.sections_written += 1
+        elif event.kind == TOKENS:
+            self.chunks[(event.language, event.index)] = event.chunks
+
+    def writer_status(self) -> str:
+        return (
+            f"✍️ {self.sections_written}/{self.sections_total} sections written · "
+            f"{sum(self.chunks.values())} chunks streamed"
+        )
+
+    def stream_with_status(self, status):
+        """Yields the script while refreshing the writer status line.
+
+        Streamlit elements may only be updated from the script thread, so the
+        status is redrawn here between chunks rather than from the bus callback.
+        """
+        for chunk in self.script_stream:
+            yield chunk
+            status.caption(self.writer_status())
+        status.caption(self.writer_status())
+
+    def show_progress(self, subscription):
+        """Renders progress events until the writer starts streaming the script."""
+        research_bar = None
+        researched = 0
+        for event in subscription:
+            done = event.kind in (STAGE_FINISHED, STAGE_SKIPPED)
+            if done and event.stage in self.STAGE_LABELS:
+                st.success(self.STAGE_LABELS[event.stage])
+            elif event.kind == STAGE_FAILED:
+                st.error(f"❌ {event.stage} failed")
+            elif event.kind == SECTION_FINISHED and event.stage == "research_analyst":
+                researched += 1
+                text = f"🔍 Researched {researched}/{event.total} sections"
+                if research_bar is None:
+                    research_bar = st.progress(0.0, text=text)
+                research_bar.progress(researched / event.total, text=text)
+            elif event.kind == STAGE_STARTED and event.stage == "youtube_script_writer":
+                return
 
     def read_file(self, filename):
         """Utility function to read the content of a file."""
@@ -107,24 +153,31 @@ class YouTubeScriptApp:
                 description=description,
             )
             with st.spinner("generating ..."):
+                # Subscribe before starting so no event is missed
+                subscription = self.progress.subscription()
                 thread = threading.Thread(
                     target=self.run_generation, args=(youtube_inputs,)
                 )
                 thread.start()
 
-                self.check_script_status()
-                thread.join()
+                self.show_progress(subscription)
+                subscription.close()
 
-            script = self.read_file("script_output.txt")
             st.markdown("### 📝 Generated Script")
-            st.markdown(script)
+            status = st.empty()
+            st.write_stream(self.stream_with_status(status))
+            thread.join()
 
-            if description:
+            if description and "youtube_description_writer" not in self.failed_stages:
                 desc = self.read_file("video_description.txt")
                 st.markdown("### 📝 Video Description")
                 st.markdown(desc)
 
-            st.success("✨ Script generation complete!")
+            if self.error is not None or self.failed_stages:
+                reason = self.error or ", ".join(self.failed_stages)
+                st.error(f"❌ Script generation failed: {reason}")
+            else:
+                st.success("✨ Script generation complete!")
 
 
 if __name__ == "__main__":